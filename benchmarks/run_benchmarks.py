@@ -0,0 +1,357 @@
+"""
+Offline benchmark suite for the RRPF hot paths.
+
+Covers request validation, canonicalize + encode + digest, hashing
+throughput of every registered digest algorithm, response encode/decode in
+each canonical encoding, run_fulfillment against
+InMemoryEngine and SQLiteEngine, and store/load on the memory and
+filesystem payload stores, swept over section count, rows per section and
+row payload size.
+
+Usage:
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --baseline results.json --threshold 0.15
+
+With --baseline, the run exits with status 1 if any benchmark's median is
+more than `threshold` slower than the baseline median for the same name.
+"""
+
+import argparse
+import json
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass, replace
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, cast
+
+from rrpf import (
+    AsOf,
+    Constraints,
+    DataRequests,
+    FilesystemPayloadStore,
+    Intent,
+    MemoryPayloadStore,
+    PayloadStore,
+    RRPRequest,
+    TableRequest,
+    __version__,
+    canonicalize_request,
+    compute_digest,
+    run_fulfillment,
+    to_canonical_json,
+    validate_request,
+)
+from rrpf.examples import InMemoryEngine, SQLiteEngine
+from rrpf.fulfillment.sections import SectionFanoutResult
+from rrpf.hashing import CANONICAL_ENCODINGS, digest_algorithms
+from rrpf.normalization import canonical_request_json, digest_many
+from rrpf.schemas.as_of import AsOfMode
+from rrpf.schemas.common import CorrelationID, RequestID
+from rrpf.schemas.intent import IntentMode
+from rrpf.schemas.provenance import QueryStats
+from rrpf.storage import decode_response, encode_response
+from rrpf.validation import validate_many
+
+SECTIONS = (1, 8, 32)
+ROWS = (10, 100, 1000)
+PAYLOAD_BYTES = (16, 256)
+
+QUICK_SECTIONS = (1, 8)
+QUICK_ROWS = (10, 100)
+QUICK_PAYLOAD_BYTES = (16,)
+
+HASH_BYTES = (1024, 1024 * 1024, 16 * 1024 * 1024)
+QUICK_HASH_BYTES = (1024, 1024 * 1024)
+BATCH_REQUESTS = 1000
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    name: str
+    params: dict[str, int]
+    loops: int
+    repeats: int
+    median_ns: float
+    mean_ns: float
+    min_ns: float
+    stdev_ns: float
+    # For benchmarks with a "bytes" parameter.
+    throughput_mb_s: float | None = None
+
+
+@dataclass(frozen=True)
+class Regression:
+    name: str
+    baseline_ns: float
+    current_ns: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_ns / self.baseline_ns
+
+
+class SyntheticEngine:
+    """Engine returning `rows` rows of `payload_bytes` bytes per table section."""
+
+    def __init__(self, *, rows: int, payload_bytes: int) -> None:
+        self.rows = rows
+        self.payload = "x" * payload_bytes
+
+    def fulfill(self, request: RRPRequest) -> SectionFanoutResult:
+        data: dict[str, Any] = {}
+        stats: dict[str, QueryStats] = {}
+        for table in request.data.tables:
+            count = min(table.limit, self.rows)
+            key = f"table:{table.table}"
+            data[key] = {"rows": [{"id": i, "payload": self.payload} for i in range(count)]}
+            stats[key] = QueryStats(rows=count, groups=1)
+        return SectionFanoutResult(data=data, query_stats=stats)
+
+
+def make_request(*, sections: int, rows: int = 100) -> RRPRequest:
+    return RRPRequest(
+        rrp_version="1.0",
+        request_id=cast(RequestID, "bench"),
+        correlation_id=cast(CorrelationID, "bench"),
+        requested_at=datetime(2024, 1, 1, tzinfo=UTC),
+        intent=Intent(name="benchmark", mode=IntentMode.SNAPSHOT),
+        as_of=AsOf(mode=AsOfMode.LATEST, timestamp=None),
+        constraints=Constraints(
+            max_total_rows=sections * rows, max_groups=sections, fail_on_partial=False
+        ),
+        data=DataRequests(
+            tables=[
+                TableRequest(table=f"t{i}", fields=["id", "payload"], limit=rows, derived=None)
+                for i in range(sections)
+            ],
+            events=[],
+        ),
+    )
+
+
+def make_sqlite_engine(*, sections: int, rows: int, payload_bytes: int) -> SQLiteEngine:
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    payload = "x" * payload_bytes
+    for i in range(sections):
+        conn.execute(f'CREATE TABLE "t{i}" (id INTEGER, payload TEXT)')
+        conn.executemany(
+            f'INSERT INTO "t{i}" VALUES (?, ?)', ((n, payload) for n in range(rows))
+        )
+    conn.commit()
+    return SQLiteEngine(conn)
+
+
+def measure(fn: Callable[[], object], *, min_time: float, repeats: int) -> tuple[int, list[float]]:
+    """
+    Calibrate a loop count that takes at least `min_time` seconds, then
+    return it with `repeats` per-call timings in nanoseconds.
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter_ns()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter_ns() - start
+        if elapsed >= min_time * 1e9 or loops >= 1 << 20:
+            break
+        loops *= 2
+
+    samples: list[float] = []
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter_ns() - start) / loops)
+    return loops, samples
+
+
+def cases(
+    *, quick: bool, workdir: Path
+) -> Iterator[tuple[str, dict[str, int], Callable[[], object]]]:
+    sections_sweep = QUICK_SECTIONS if quick else SECTIONS
+    rows_sweep = QUICK_ROWS if quick else ROWS
+    payload_sweep = QUICK_PAYLOAD_BYTES if quick else PAYLOAD_BYTES
+
+    for sections in sections_sweep:
+        request = make_request(sections=sections)
+        params = {"sections": sections}
+        yield "validate_request", params, lambda r=request: validate_request(r)
+        yield "digest_request", params, lambda r=request: compute_digest(
+            to_canonical_json(canonicalize_request(r))
+        )
+        yield "digest_request.spliced", params, lambda r=request: compute_digest(
+            canonical_request_json(r)
+        )
+        yield "run_fulfillment.in_memory", params, lambda r=request: run_fulfillment(
+            r, InMemoryEngine()
+        )
+
+    batch = [
+        replace(make_request(sections=4), request_id=cast(RequestID, f"bench-{i}"))
+        for i in range(BATCH_REQUESTS)
+    ]
+    params = {"requests": BATCH_REQUESTS}
+    yield "digest_batch.loop", params, lambda b=batch: [
+        compute_digest(to_canonical_json(canonicalize_request(r))) for r in b
+    ]
+    yield "digest_batch.digest_many", params, lambda b=batch: digest_many(b)
+    yield "validate_batch.loop", params, lambda b=batch: [validate_request(r) for r in b]
+    yield "validate_batch.validate_many", params, lambda b=batch: validate_many(b)
+
+    for size in QUICK_HASH_BYTES if quick else HASH_BYTES:
+        data = bytes(range(256)) * (size // 256)
+        for algorithm in digest_algorithms():
+            yield f"digest.{algorithm}", {"bytes": size}, lambda d=data, a=algorithm: (
+                compute_digest(d, algorithm=a)
+            )
+
+    for sections in sections_sweep:
+        for rows in rows_sweep:
+            for payload_bytes in payload_sweep:
+                params = {"sections": sections, "rows": rows, "payload_bytes": payload_bytes}
+                request = make_request(sections=sections, rows=rows)
+                sqlite_engine = make_sqlite_engine(
+                    sections=sections, rows=rows, payload_bytes=payload_bytes
+                )
+                yield "run_fulfillment.sqlite", params, lambda r=request, e=sqlite_engine: (
+                    run_fulfillment(r, e)
+                )
+
+                result = run_fulfillment(
+                    request, SyntheticEngine(rows=rows, payload_bytes=payload_bytes)
+                )
+                stores: dict[str, PayloadStore] = {
+                    "memory": MemoryPayloadStore(),
+                    "filesystem": FilesystemPayloadStore(
+                        str(workdir / f"fs-{sections}-{rows}-{payload_bytes}")
+                    ),
+                }
+                for encoding in CANONICAL_ENCODINGS:
+                    raw = encode_response(result.response, encoding=encoding)
+                    yield f"encode.{encoding}", params, lambda res=result, e=encoding: (
+                        encode_response(res.response, encoding=e)
+                    )
+                    yield f"decode.{encoding}", params, lambda r=raw: decode_response(r)
+                for store_name, store in stores.items():
+                    store.store(digest=result.digest, response=result.response)
+                    yield f"store.{store_name}", params, lambda s=store, res=result: s.store(
+                        digest=res.digest, response=res.response
+                    )
+                    yield f"load.{store_name}", params, lambda s=store, res=result: s.load(
+                        digest=res.digest
+                    )
+
+
+def bench_key(name: str, params: dict[str, int]) -> str:
+    return name + "[" + ",".join(f"{k}={v}" for k, v in sorted(params.items())) + "]"
+
+
+def run(*, quick: bool, only: str | None, min_time: float, repeats: int) -> list[BenchResult]:
+    results: list[BenchResult] = []
+    with tempfile.TemporaryDirectory(prefix="rrpf-bench-") as tmp:
+        for name, params, fn in cases(quick=quick, workdir=Path(tmp)):
+            if only is not None and only not in name:
+                continue
+            loops, samples = measure(fn, min_time=min_time, repeats=repeats)
+            median_ns = statistics.median(samples)
+            size = params.get("bytes")
+            result = BenchResult(
+                name=name,
+                params=params,
+                loops=loops,
+                repeats=repeats,
+                median_ns=median_ns,
+                mean_ns=statistics.fmean(samples),
+                min_ns=min(samples),
+                stdev_ns=statistics.stdev(samples) if len(samples) > 1 else 0.0,
+                throughput_mb_s=size / median_ns * 1e9 / 1e6 if size else None,
+            )
+            throughput = (
+                f" {result.throughput_mb_s:>10.1f} MB/s" if result.throughput_mb_s else ""
+            )
+            print(
+                f"{bench_key(name, params):<70} {result.median_ns / 1e3:>12.1f} us{throughput}",
+                file=sys.stderr,
+            )
+            results.append(result)
+    return results
+
+
+def compare(
+    current: list[dict[str, Any]],
+    baseline: list[dict[str, Any]],
+    *,
+    threshold: float,
+) -> list[Regression]:
+    """Benchmarks whose median is more than `threshold` slower than the baseline."""
+    previous = {bench_key(r["name"], r["params"]): r["median_ns"] for r in baseline}
+    regressions: list[Regression] = []
+    for r in current:
+        base = previous.get(bench_key(r["name"], r["params"]))
+        if base and r["median_ns"] > base * (1 + threshold):
+            regressions.append(
+                Regression(
+                    name=bench_key(r["name"], r["params"]),
+                    baseline_ns=base,
+                    current_ns=r["median_ns"],
+                )
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", type=Path, help="write results as JSON to this file")
+    parser.add_argument("--baseline", type=Path, help="JSON results to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="allowed median slowdown vs baseline, as a fraction (default 0.10)",
+    )
+    parser.add_argument("--filter", dest="only", help="only run benchmarks containing this")
+    parser.add_argument("--quick", action="store_true", help="run a reduced sweep")
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per repeat")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = run(quick=args.quick, only=args.only, min_time=args.min_time, repeats=args.repeats)
+    report = {
+        "meta": {
+            "rrpf_version": __version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "created_at": datetime.now(UTC).isoformat(),
+        },
+        "results": [asdict(r) for r in results],
+    }
+    encoded = json.dumps(report, indent=2, sort_keys=True)
+    if args.output is not None:
+        args.output.write_text(encoded + "\n", encoding="utf-8")
+    else:
+        print(encoded)
+
+    if args.baseline is None:
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = compare(report["results"], baseline["results"], threshold=args.threshold)
+    for reg in regressions:
+        print(
+            f"REGRESSION {reg.name}: {reg.baseline_ns / 1e3:.1f} us -> "
+            f"{reg.current_ns / 1e3:.1f} us ({reg.ratio:.2f}x)",
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,9 @@
-from collections.abc import Mapping
+from collections.abc import Iterator, Mapping
 from typing import Any
 
 from rrpf.fulfillment.engine import FulfillmentEngine, FulfillmentResult
+from rrpf.fulfillment.sections import SectionResult, event_section_key, table_section_key
+from rrpf.schemas.data_requests import EventRequest, TableRequest
 from rrpf.schemas.provenance import QueryStats
 from rrpf.schemas.request import RRPRequest
 
@@ -38,32 +40,54 @@ class InMemoryEngine(FulfillmentEngine):
 
         # 1. Handle Tables
         for table in request.data.tables:
-            section_key = f"table:{table.table}"
-
-            # Generate deterministic rows: min(limit, 3)
-            # Each row: {"id": i}
-            limit = table.limit
-            count = min(limit, 3)
-            rows = [{"id": i} for i in range(count)]
-
-            data[section_key] = {"rows": rows}
-            stats[section_key] = QueryStats(rows=len(rows), groups=1)
+            section = self.fulfill_table(request, table)
+            data[table_section_key(table)] = section.data
+            stats[table_section_key(table)] = section.stats
 
         # 2. Handle Events
         for event in request.data.events:
-            # key: event:{'+'.join(sorted(types))}
-            types_key = "+".join(sorted(event.types))
-            section_key = f"event:{types_key}"
-
-            limit = event.limit
-            count = min(limit, 3)
-            # Simple synthetic event rows
-            event_rows: list[dict[str, Any]] = [
-                {"id": i, "type": event.types[0] if event.types else "unknown"}
-                for i in range(count)
-            ]
-
-            data[section_key] = {"rows": event_rows}
-            stats[section_key] = QueryStats(rows=len(event_rows), groups=1)
+            section = self.fulfill_event(request, event)
+            data[event_section_key(event)] = section.data
+            stats[event_section_key(event)] = section.stats
 
         return InMemoryResult(data=data, query_stats=stats)
+
+    def fulfill_table(self, request: RRPRequest, table: TableRequest) -> SectionResult:
+        """
+        Section-level entry point; see SectionFulfillmentEngine.
+        """
+        # Generate deterministic rows: min(limit, 3)
+        # Each row: {"id": i}
+        count = min(table.limit, 3)
+        rows = [{"id": i} for i in range(count)]
+
+        return SectionResult(data={"rows": rows}, stats=QueryStats(rows=len(rows), groups=1))
+
+    def fulfill_event(self, request: RRPRequest, event: EventRequest) -> SectionResult:
+        """
+        Section-level entry point; see SectionFulfillmentEngine.
+        """
+        count = min(event.limit, 3)
+        # Simple synthetic event rows
+        event_rows: list[dict[str, Any]] = [
+            {"id": i, "type": event.types[0] if event.types else "unknown"}
+            for i in range(count)
+        ]
+
+        return SectionResult(
+            data={"rows": event_rows}, stats=QueryStats(rows=len(event_rows), groups=1)
+        )
+
+    def stream_table(self, request: RRPRequest, table: TableRequest) -> Iterator[dict[str, Any]]:
+        """
+        Streaming entry point; see StreamingFulfillmentEngine.
+        """
+        for i in range(min(table.limit, 3)):
+            yield {"id": i}
+
+    def stream_event(self, request: RRPRequest, event: EventRequest) -> Iterator[dict[str, Any]]:
+        """
+        Streaming entry point; see StreamingFulfillmentEngine.
+        """
+        for i in range(min(event.limit, 3)):
+            yield {"id": i, "type": event.types[0] if event.types else "unknown"}
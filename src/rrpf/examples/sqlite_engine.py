@@ -1,11 +1,19 @@
 import sqlite3
+import threading
+import time
 from collections.abc import Mapping
+from collections.abc import Set as AbstractSet
 from typing import Any
 
 from rrpf.fulfillment.engine import FulfillmentEngine, FulfillmentResult
+from rrpf.fulfillment.sections import SectionResult, event_section_key, table_section_key
+from rrpf.schemas.data_requests import EventRequest, TableRequest
 from rrpf.schemas.provenance import QueryStats
 from rrpf.schemas.request import RRPRequest
 
+# SQLite virtual machine instructions between deadline checks.
+_PROGRESS_STEPS = 1000
+
 
 class SQLiteResult:
     """Concrete implementation of FulfillmentResult."""
@@ -31,43 +39,145 @@ class SQLiteEngine(FulfillmentEngine):
     """
     A minimal SQLite-backed engine.
     Demonstrates real data interaction with an existing database.
+
+    Implements the section-level protocol, so SectionFanoutEngine can query
+    tables concurrently. Given a database path (or URI), each thread opens
+    its own connection; a single shared connection is used one query at a
+    time. ":memory:" opens a separate, empty database per thread, so in-memory
+    databases must be passed as a connection.
+
+    Also deadline-aware: with Constraints.deadline_ms set, queries run on the
+    calling thread (so a thread-bound connection works) and are interrupted
+    when the deadline passes.
     """
 
-    def __init__(self, connection: sqlite3.Connection) -> None:
+    def __init__(
+        self, connection: sqlite3.Connection | None = None, *, database: str | None = None
+    ) -> None:
+        if (connection is None) == (database is None):
+            raise ValueError("Pass exactly one of connection or database")
         self.conn = connection
-        # Ensure we can access columns by name
-        self.conn.row_factory = sqlite3.Row
+        self.database = database
+        if self.conn is not None:
+            # Ensure we can access columns by name
+            self.conn.row_factory = sqlite3.Row
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
 
     def fulfill(self, request: RRPRequest) -> FulfillmentResult:
+        return self._fulfill(request, None)[0]
+
+    def fulfill_before(
+        self, request: RRPRequest, deadline: float
+    ) -> tuple[FulfillmentResult, AbstractSet[str]]:
+        """
+        Deadline-aware entry point; see DeadlineAwareEngine. Queries run on
+        the calling thread and are interrupted once the deadline passes.
+        """
+        return self._fulfill(request, deadline)
+
+    def fulfill_table(self, request: RRPRequest, table: TableRequest) -> SectionResult | None:
+        """
+        Section-level entry point; see SectionFulfillmentEngine.
+        """
+        return self._table_section(table, None)
+
+    def fulfill_event(self, request: RRPRequest, event: EventRequest) -> SectionResult | None:
+        """
+        Section-level entry point; see SectionFulfillmentEngine.
+        """
+        # This minimal engine does not support event queries as they require
+        # schema assumptions (e.g. a specific 'events' table or filtering).
+        return None
+
+    def _fulfill(
+        self, request: RRPRequest, deadline: float | None
+    ) -> tuple[SQLiteResult, frozenset[str]]:
         data: dict[str, Any] = {}
         stats: dict[str, QueryStats] = {}
-        cursor = self.conn.cursor()
+        timed_out: set[str] = set()
 
         # 1. Handle Tables
         for table in request.data.tables:
-            section_key = f"table:{table.table}"
-            table_name = table.table
-            limit = table.limit
-
-            try:
-                # Note: This is vulnerable to SQL injection if table_name is untrusted.
-                # In a real engine, validate table_name against a schema or allow-list.
-                # For this example, we assume trusted input.
-                # We use double quotes for table name to handle special characters,
-                # but validation is still recommended.
-                query = f'SELECT * FROM "{table_name}" ORDER BY rowid ASC LIMIT ?'
-                cursor.execute(query, (limit,))
-                rows = [dict(row) for row in cursor.fetchall()]
-
-                data[section_key] = {"rows": rows}
-                stats[section_key] = QueryStats(rows=len(rows), groups=1)
-            except sqlite3.Error:
-                # If table doesn't exist or other error, we omit the section.
-                # The runner will mark it as missing.
-                pass
+            key = table_section_key(table)
+            if deadline is not None and time.monotonic() >= deadline:
+                timed_out.add(key)
+                continue
+            section = self._table_section(table, deadline)
+            # A query interrupted by the deadline comes back as None.
+            if deadline is not None and time.monotonic() >= deadline:
+                timed_out.add(key)
+            elif section is not None:
+                data[key] = section.data
+                stats[key] = section.stats
 
         # 2. Handle Events
-        # This minimal engine does not support event queries as they require
-        # schema assumptions (e.g. a specific 'events' table or filtering).
+        for event in request.data.events:
+            event_section = self.fulfill_event(request, event)
+            if event_section is not None:
+                data[event_section_key(event)] = event_section.data
+                stats[event_section_key(event)] = event_section.stats
+
+        return SQLiteResult(data=data, query_stats=stats), frozenset(timed_out)
+
+    def _table_section(self, table: TableRequest, deadline: float | None) -> SectionResult | None:
+        # Note: This is vulnerable to SQL injection if table_name is untrusted.
+        # In a real engine, validate table_name against a schema or allow-list.
+        # For this example, we assume trusted input.
+        # We use double quotes for table name to handle special characters,
+        # but validation is still recommended.
+        query = f'SELECT * FROM "{table.table}" ORDER BY rowid ASC LIMIT ?'
+        try:
+            rows = [dict(row) for row in self._fetch(query, (table.limit,), deadline)]
+        except sqlite3.ProgrammingError:
+            # Misuse (a closed connection, or one used from another thread)
+            # is a bug in the caller, not a missing section.
+            raise
+        except sqlite3.Error:
+            # If table doesn't exist or other error, we omit the section.
+            # The runner will mark it as missing.
+            return None
+        return SectionResult(data={"rows": rows}, stats=QueryStats(rows=len(rows), groups=1))
+
+    def close(self) -> None:
+        """Close the per-thread connections; a passed-in connection is left open."""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def _fetch(
+        self, query: str, params: tuple[Any, ...], deadline: float | None
+    ) -> list[sqlite3.Row]:
+        if self.conn is not None:
+            with self._lock:
+                return _execute(self.conn, query, params, deadline)
+        return _execute(self._connection(), query, params, deadline)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            assert self.database is not None
+            # check_same_thread is off only so close() can close every
+            # connection; each one is otherwise used by its own thread.
+            conn = sqlite3.connect(self.database, uri=True, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
 
-        return SQLiteResult(data=data, query_stats=stats)
+def _execute(
+    conn: sqlite3.Connection, query: str, params: tuple[Any, ...], deadline: float | None
+) -> list[sqlite3.Row]:
+    if deadline is None:
+        return conn.execute(query, params).fetchall()
+    # A truthy progress handler aborts the query with OperationalError.
+    conn.set_progress_handler(lambda: time.monotonic() >= deadline, _PROGRESS_STEPS)
+    try:
+        return conn.execute(query, params).fetchall()
+    finally:
+        conn.set_progress_handler(None, 0)
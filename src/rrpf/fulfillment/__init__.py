@@ -1,14 +1,57 @@
 from .accounting import check_row_constraints
-from .engine import FulfillmentEngine, FulfillmentResult
+from .async_runner import SyncEngineAdapter, run_and_store_async, run_fulfillment_async
+from .batch import run_and_store_many, run_fulfillment_many
+from .cache import ResultCache, compute_content_digest, run_or_replay
+from .coalesce import AsyncCoalescingEngine, CoalescingEngine, CoalescingStats
+from .engine import AsyncFulfillmentEngine, FulfillmentEngine, FulfillmentResult
 from .ordering import stable_order
-from .runner import RunResult, run_and_store, run_fulfillment
+from .pipeline import RunResult
+from .runner import run_and_store, run_fulfillment
+from .sections import (
+    AsyncSectionFanoutEngine,
+    AsyncSectionFulfillmentEngine,
+    SectionFanoutEngine,
+    SectionFulfillmentEngine,
+    SectionResult,
+    event_section_key,
+    table_section_key,
+)
+from .streaming import (
+    AsyncStreamingFulfillmentEngine,
+    StreamingFulfillmentEngine,
+    run_fulfillment_streaming,
+    run_fulfillment_streaming_async,
+)
 
 __all__ = [
     "check_row_constraints",
+    "AsyncFulfillmentEngine",
     "FulfillmentEngine",
     "FulfillmentResult",
     "stable_order",
     "RunResult",
     "run_fulfillment",
     "run_and_store",
+    "SyncEngineAdapter",
+    "run_fulfillment_async",
+    "run_and_store_async",
+    "run_fulfillment_many",
+    "run_and_store_many",
+    "SectionResult",
+    "SectionFulfillmentEngine",
+    "AsyncSectionFulfillmentEngine",
+    "SectionFanoutEngine",
+    "AsyncSectionFanoutEngine",
+    "table_section_key",
+    "event_section_key",
+    "StreamingFulfillmentEngine",
+    "AsyncStreamingFulfillmentEngine",
+    "run_fulfillment_streaming",
+    "run_fulfillment_streaming_async",
+    "ResultCache",
+    "compute_content_digest",
+    "run_or_replay",
+    "CoalescingEngine",
+    "AsyncCoalescingEngine",
+    "CoalescingStats",
 ]
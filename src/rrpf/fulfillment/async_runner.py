@@ -0,0 +1,133 @@
+import asyncio
+import time
+from collections.abc import Set as AbstractSet
+from concurrent.futures import Executor
+from functools import partial
+
+from rrpf.fulfillment.engine import (
+    AsyncDeadlineAwareEngine,
+    AsyncFulfillmentEngine,
+    FulfillmentEngine,
+    FulfillmentResult,
+)
+from rrpf.fulfillment.pipeline import (
+    RunResult,
+    check_chunk_rows,
+    deadline_for,
+    digest_request,
+    expected_sections,
+    finalize,
+    reject_invalid,
+)
+from rrpf.fulfillment.sections import SectionFanoutResult
+from rrpf.instrumentation.observer import RunObserver, Stage, StageTimer
+from rrpf.schemas.request import RRPRequest
+from rrpf.storage.payload_store import PayloadStore
+
+
+class SyncEngineAdapter:
+    """
+    Expose a synchronous FulfillmentEngine as an AsyncFulfillmentEngine.
+    Each fulfill call runs on the given executor (the loop's default if None),
+    so blocking engines never stall the event loop.
+    """
+
+    def __init__(self, engine: FulfillmentEngine, executor: Executor | None = None) -> None:
+        self.engine = engine
+        self.executor = executor
+
+    async def fulfill(self, request: RRPRequest) -> FulfillmentResult:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.engine.fulfill, request)
+
+
+async def run_fulfillment_async(
+    request: RRPRequest,
+    engine: AsyncFulfillmentEngine,
+    *,
+    observer: RunObserver | None = None,
+    chunk_rows: int | None = None,
+) -> RunResult:
+    """
+    Orchestrate a full RRPF cycle against an asynchronous engine.
+    Validation, digest, constraint and partial semantics match run_fulfillment.
+    """
+    check_chunk_rows(chunk_rows)
+    timer = StageTimer.start(observer, request.request_id)
+    deadline = deadline_for(request)
+
+    # 1. Validate request
+    rejected = reject_invalid(request, timer)
+    if rejected is not None:
+        return rejected
+
+    # 2. Canonicalize + digest
+    canonical_json, digest = digest_request(request, timer)
+
+    # 3. Await engine, within the deadline if one is set
+    result, timed_out = await _call_engine_async(engine, request, deadline)
+    timer.lap(
+        Stage.ENGINE,
+        rows=sum(s.rows for s in result.query_stats.values()) if timer.enabled else None,
+    )
+
+    # 4-6. Enforce constraints, check partial semantics, shape response
+    return finalize(
+        request,
+        canonical_json=canonical_json,
+        digest=digest,
+        result=result,
+        timed_out=timed_out,
+        timer=timer,
+        chunk_rows=chunk_rows,
+    )
+
+
+async def run_and_store_async(
+    *,
+    request: RRPRequest,
+    engine: AsyncFulfillmentEngine,
+    store: PayloadStore,
+    observer: RunObserver | None = None,
+    chunk_rows: int | None = None,
+) -> RunResult:
+    """
+    Run asynchronous fulfillment and persist the payload.
+    The store write runs in a worker thread since stores are synchronous.
+    """
+    result = await run_fulfillment_async(
+        request, engine, observer=observer, chunk_rows=chunk_rows
+    )
+
+    # Invalid requests have an empty digest and are never stored.
+    if result.digest:
+        timer = StageTimer.start(observer, request.request_id)
+        await asyncio.to_thread(
+            partial(store.store, digest=result.digest, response=result.response)
+        )
+        timer.lap(Stage.STORE)
+
+    return result
+
+
+async def _call_engine_async(
+    engine: AsyncFulfillmentEngine,
+    request: RRPRequest,
+    deadline: float | None,
+) -> tuple[FulfillmentResult, AbstractSet[str]]:
+    """
+    Await the engine, returning its result and the sections that timed out.
+    """
+    if deadline is None:
+        return await engine.fulfill(request), frozenset()
+
+    if isinstance(engine, AsyncDeadlineAwareEngine):
+        return await engine.fulfill_before(request, deadline)
+
+    try:
+        result = await asyncio.wait_for(
+            engine.fulfill(request), timeout=max(0.0, deadline - time.monotonic())
+        )
+    except TimeoutError:
+        return SectionFanoutResult(), frozenset(expected_sections(request))
+    return result, frozenset()
@@ -0,0 +1,233 @@
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator
+from collections.abc import Set as AbstractSet
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+from rrpf.fulfillment.engine import FulfillmentEngine, FulfillmentResult
+from rrpf.fulfillment.pipeline import (
+    RunResult,
+    call_engine,
+    check_chunk_rows,
+    deadline_for,
+    digest_request,
+    finalize,
+    reject_invalid,
+)
+from rrpf.instrumentation.observer import RunObserver, Stage, StageTimer
+from rrpf.schemas.common import Digest
+from rrpf.schemas.request import RRPRequest
+from rrpf.storage.payload_store import PayloadStore, store_many
+
+# Engine calls kept in flight per worker; bounds memory for very large batches.
+_WINDOW_PER_WORKER = 4
+
+
+@dataclass(frozen=True)
+class _Prepared:
+    request: RRPRequest
+    canonical_json: str
+    digest: Digest
+    timer: StageTimer
+    chunk_rows: int | None
+
+
+_EngineCall = tuple[FulfillmentResult, AbstractSet[str]]
+
+
+def run_fulfillment_many(
+    requests: Iterable[RRPRequest],
+    engine: FulfillmentEngine,
+    *,
+    max_workers: int | None = None,
+    ordered: bool = True,
+    observer: RunObserver | None = None,
+    chunk_rows: int | None = None,
+) -> Iterator[RunResult]:
+    """
+    Fulfill many requests with a bounded pool of worker threads.
+
+    All requests are validated, canonicalized and hashed up front; only the
+    engine calls are dispatched to the pool. Results are yielded lazily, in
+    input order when ordered=True, otherwise as soon as they complete.
+    Invalid requests never reach the engine.
+    """
+    check_chunk_rows(chunk_rows)
+    prepared = [_prepare(request, observer, chunk_rows) for request in requests]
+
+    # Same default as ThreadPoolExecutor, resolved here to size the window.
+    workers = max_workers if max_workers is not None else min(32, (os.cpu_count() or 1) + 4)
+    window = workers * _WINDOW_PER_WORKER
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        if ordered:
+            yield from _run_ordered(prepared, engine, executor, window)
+        else:
+            yield from _run_unordered(prepared, engine, executor, window)
+    finally:
+        # Abandoned iterators must not wait for queued engine calls.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_and_store_many(
+    *,
+    requests: Iterable[RRPRequest],
+    engine: FulfillmentEngine,
+    store: PayloadStore,
+    max_workers: int | None = None,
+    ordered: bool = True,
+    batch_size: int = 100,
+    observer: RunObserver | None = None,
+    chunk_rows: int | None = None,
+) -> Iterator[RunResult]:
+    """
+    Fulfill many requests and persist their payloads in batches.
+
+    Each result is yielded only after its batch has been written, so consumed
+    results are always durable. The iterator must be consumed for work to happen.
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size must be > 0")
+
+    batch: list[RunResult] = []
+    for result in run_fulfillment_many(
+        requests,
+        engine,
+        max_workers=max_workers,
+        ordered=ordered,
+        observer=observer,
+        chunk_rows=chunk_rows,
+    ):
+        batch.append(result)
+        if len(batch) >= batch_size:
+            _store_batch(batch, store, observer)
+            yield from batch
+            batch = []
+
+    if batch:
+        _store_batch(batch, store, observer)
+        yield from batch
+
+
+def _prepare(
+    request: RRPRequest, observer: RunObserver | None, chunk_rows: int | None
+) -> _Prepared | RunResult:
+    timer = StageTimer.start(observer, request.request_id)
+    rejected = reject_invalid(request, timer)
+    if rejected is not None:
+        return rejected
+    canonical_json, digest = digest_request(request, timer)
+    return _Prepared(
+        request=request,
+        canonical_json=canonical_json,
+        digest=digest,
+        timer=timer,
+        chunk_rows=chunk_rows,
+    )
+
+
+def _submit(
+    item: _Prepared | RunResult,
+    engine: FulfillmentEngine,
+    executor: ThreadPoolExecutor,
+) -> Future[_EngineCall] | None:
+    if isinstance(item, RunResult):
+        return None
+    return executor.submit(_fulfill, engine, item)
+
+
+def _fulfill(engine: FulfillmentEngine, item: _Prepared) -> _EngineCall:
+    # The deadline and engine timing start when a worker picks the call up,
+    # not while it is queued. The call already runs on a pool worker, so it
+    # is made inline rather than handed to a second thread.
+    item.timer.restart()
+    return call_engine(
+        engine, item.request, deadline_for(item.request), item.timer, inline=True
+    )
+
+
+def _complete(
+    item: _Prepared | RunResult,
+    future: Future[_EngineCall] | None,
+) -> RunResult:
+    if isinstance(item, RunResult):
+        return item
+    assert future is not None
+    result, timed_out = future.result()
+    item.timer.restart()
+    return finalize(
+        item.request,
+        canonical_json=item.canonical_json,
+        digest=item.digest,
+        result=result,
+        timed_out=timed_out,
+        timer=item.timer,
+        chunk_rows=item.chunk_rows,
+    )
+
+
+def _run_ordered(
+    prepared: list[_Prepared | RunResult],
+    engine: FulfillmentEngine,
+    executor: ThreadPoolExecutor,
+    window: int,
+) -> Iterator[RunResult]:
+    pending: deque[tuple[_Prepared | RunResult, Future[_EngineCall] | None]] = deque()
+    items = iter(prepared)
+
+    for item in items:
+        pending.append((item, _submit(item, engine, executor)))
+        if len(pending) >= window:
+            break
+
+    while pending:
+        item, future = pending.popleft()
+        result = _complete(item, future)
+        next_item = next(items, None)
+        if next_item is not None:
+            pending.append((next_item, _submit(next_item, engine, executor)))
+        yield result
+
+
+def _run_unordered(
+    prepared: list[_Prepared | RunResult],
+    engine: FulfillmentEngine,
+    executor: ThreadPoolExecutor,
+    window: int,
+) -> Iterator[RunResult]:
+    in_flight: dict[Future[_EngineCall], _Prepared] = {}
+    items = iter(prepared)
+
+    def fill() -> Iterator[RunResult]:
+        while len(in_flight) < window:
+            item = next(items, None)
+            if item is None:
+                return
+            if isinstance(item, RunResult):
+                yield item
+                continue
+            in_flight[executor.submit(_fulfill, engine, item)] = item
+
+    yield from fill()
+    while in_flight:
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield _complete(in_flight.pop(future), future)
+        yield from fill()
+
+
+def _store_batch(
+    batch: list[RunResult],
+    store: PayloadStore,
+    observer: RunObserver | None,
+) -> None:
+    # Invalid requests have an empty digest and are never stored.
+    items = [(result.digest, result.response) for result in batch if result.digest]
+    if not items:
+        return
+    # One STORE event covers the whole batch, attributed to its first request.
+    timer = StageTimer.start(observer, items[0][1].request_id)
+    store_many(store, items=items)
+    timer.lap(Stage.STORE, rows=len(items))
@@ -0,0 +1,247 @@
+import dataclasses
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+from rrpf.fulfillment.engine import FulfillmentEngine
+from rrpf.fulfillment.pipeline import (
+    RunResult,
+    call_engine,
+    check_chunk_rows,
+    deadline_for,
+    digest_request,
+    finalize,
+    reject_invalid,
+)
+from rrpf.hashing.canonical_binary import CanonicalEncoding, canonical_digest
+from rrpf.hashing.digest import compute_digest, normalize_digest
+from rrpf.instrumentation.observer import RunObserver, Stage, StageTimer
+from rrpf.normalization.canonicalize import (
+    canonical_request_content_json,
+    canonicalize_request_content,
+)
+from rrpf.schemas.as_of import AsOfMode
+from rrpf.schemas.common import Digest
+from rrpf.schemas.request import RRPRequest
+from rrpf.schemas.response import RRPResponse
+from rrpf.storage.payload_store import PayloadStore
+from rrpf.storage.stats import CacheStats
+
+
+def compute_content_digest(
+    request: RRPRequest,
+    *,
+    algorithm: str | None = None,
+    encoding: CanonicalEncoding = "json",
+) -> Digest:
+    """
+    Digest of the request content (intent, as_of, constraints, data).
+    Unlike the inputs digest it ignores request_id and requested_at.
+    With algorithm, the digest is algorithm-tagged (see compute_digest);
+    encoding="binary" hashes the canonical binary encoding instead of
+    canonical JSON (see canonical_digest).
+    """
+    if encoding == "json":
+        return compute_digest(canonical_request_content_json(request), algorithm=algorithm)
+    return canonical_digest(
+        canonicalize_request_content(request), encoding=encoding, algorithm=algorithm
+    )
+
+
+class ResultCache:
+    """
+    Bounded, thread-safe in-process LRU cache of fulfilled responses,
+    keyed by content digest, with an optional time-to-live.
+    Cached responses are shared and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        ttl_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be > 0")
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be > 0")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[Digest, tuple[float, RRPResponse]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, digest: Digest) -> RRPResponse | None:
+        """Return the cached response, or None on a miss or expired entry."""
+        digest = normalize_digest(digest)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self._misses += 1
+                return None
+            stored_at, response = entry
+            if self.ttl_seconds is not None and self._clock() - stored_at >= self.ttl_seconds:
+                del self._entries[digest]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self._hits += 1
+            return response
+
+    def put(self, digest: Digest, response: RRPResponse) -> None:
+        """Insert or refresh an entry, evicting the least recently used if full."""
+        digest = normalize_digest(digest)
+        with self._lock:
+            self._entries[digest] = (self._clock(), response)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def run_or_replay(
+    request: RRPRequest,
+    engine: FulfillmentEngine,
+    *,
+    store: PayloadStore | None = None,
+    cache: ResultCache | None = None,
+    observer: RunObserver | None = None,
+    chunk_rows: int | None = None,
+    digest_algorithm: str | None = None,
+    digest_encoding: CanonicalEncoding = "json",
+) -> RunResult:
+    """
+    Read-through fulfillment for TIMESTAMP-pinned requests.
+
+    The request's content digest is looked up in the cache, then the store;
+    the engine is only called on a miss. Complete (ok, non-partial) results
+    are then written to both, keyed by content digest. Served responses carry
+    the caller's request_id and inputs digest; fulfilled_at records when the
+    data was originally fulfilled.
+
+    LATEST requests are never served from cache: they behave like
+    run_and_store when a store is given, and like run_fulfillment otherwise.
+
+    digest_algorithm selects the hash for content digest keys, e.g.
+    "blake2b" for faster hashing of large requests, and digest_encoding the
+    canonical encoding that is hashed; inputs digests stay SHA-256 over
+    canonical JSON.
+    """
+    check_chunk_rows(chunk_rows)
+    timer = StageTimer.start(observer, request.request_id)
+    deadline = deadline_for(request)
+
+    # 1. Validate request
+    rejected = reject_invalid(request, timer)
+    if rejected is not None:
+        return rejected
+
+    # 2. Canonicalize + digest
+    canonical_json, digest = digest_request(request, timer)
+
+    if request.as_of.mode != AsOfMode.TIMESTAMP:
+        fulfilled, timed_out = call_engine(engine, request, deadline, timer)
+        result = finalize(
+            request,
+            canonical_json=canonical_json,
+            digest=digest,
+            result=fulfilled,
+            timed_out=timed_out,
+            timer=timer,
+            chunk_rows=chunk_rows,
+        )
+        if store is not None:
+            store.store(digest=result.digest, response=result.response)
+            timer.lap(Stage.STORE)
+        return result
+
+    # 3. Serve from cache, then store
+    content_digest = compute_content_digest(
+        request, algorithm=digest_algorithm, encoding=digest_encoding
+    )
+    cached = _lookup(content_digest, store=store, cache=cache)
+    if cached is not None:
+        return RunResult(
+            response=_rebase(cached, request=request, digest=digest),
+            canonical_json=canonical_json,
+            digest=digest,
+        )
+
+    # 4. Miss: call engine and shape the response as usual
+    timer.restart()
+    fulfilled, timed_out = call_engine(engine, request, deadline, timer)
+    result = finalize(
+        request,
+        canonical_json=canonical_json,
+        digest=digest,
+        result=fulfilled,
+        timed_out=timed_out,
+        timer=timer,
+        chunk_rows=chunk_rows,
+    )
+
+    # 5. Only complete results are reusable
+    if result.response.ok and not result.response.partial:
+        entry = _rebase(result.response, request=request, digest=content_digest)
+        if store is not None:
+            store.store(digest=content_digest, response=entry)
+            timer.lap(Stage.STORE)
+        if cache is not None:
+            cache.put(content_digest, entry)
+
+    return result
+
+
+def _lookup(
+    content_digest: Digest,
+    *,
+    store: PayloadStore | None,
+    cache: ResultCache | None,
+) -> RRPResponse | None:
+    if cache is not None:
+        cached = cache.get(content_digest)
+        if cached is not None:
+            return cached
+
+    if store is None:
+        return None
+    try:
+        stored = store.load(digest=content_digest)
+    except KeyError:
+        return None
+
+    if cache is not None:
+        cache.put(content_digest, stored)
+    return stored
+
+
+def _rebase(response: RRPResponse, *, request: RRPRequest, digest: Digest) -> RRPResponse:
+    """Re-address a response to another request with the same content."""
+    return dataclasses.replace(
+        response,
+        request_id=request.request_id,
+        provenance=dataclasses.replace(response.provenance, inputs_digest=digest),
+    )
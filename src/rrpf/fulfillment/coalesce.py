@@ -0,0 +1,145 @@
+import asyncio
+import copy
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+from rrpf.fulfillment.cache import compute_content_digest
+from rrpf.fulfillment.engine import AsyncFulfillmentEngine, FulfillmentEngine, FulfillmentResult
+from rrpf.fulfillment.sections import SectionFanoutResult
+from rrpf.schemas.common import Digest
+from rrpf.schemas.request import RRPRequest
+
+
+@dataclass(frozen=True)
+class CoalescingStats:
+    """Point-in-time counters for a coalescing engine."""
+
+    calls: int
+    coalesced: int
+
+    @property
+    def engine_calls(self) -> int:
+        """Calls that actually reached the wrapped engine."""
+        return self.calls - self.coalesced
+
+
+_Call = TypeVar("_Call")
+
+
+class _Flight(Generic[_Call]):
+    """One shared engine call and the number of callers waiting on it."""
+
+    __slots__ = ("call", "callers")
+
+    def __init__(self, call: _Call) -> None:
+        self.call = call
+        self.callers = 1
+
+    def hand_out(self, result: FulfillmentResult) -> FulfillmentResult:
+        """
+        The result for one caller. Callers of a shared call each get a deep
+        copy of its data, so none can change rows another caller sees; the
+        shared result itself is never handed out. A lone caller gets it as is.
+        """
+        if self.callers == 1:
+            return result
+        return SectionFanoutResult(
+            data=copy.deepcopy(dict(result.data)), query_stats=dict(result.query_stats)
+        )
+
+
+class CoalescingEngine:
+    """
+    Single-flight wrapper around a FulfillmentEngine.
+
+    Concurrent fulfill calls whose requests share a content digest wait on one
+    engine call and each receive their own copy of its result. Because
+    coalescing happens at the engine boundary, run_fulfillment (and the batch
+    runners) still shape a separate response per caller, with its own
+    request_id, inputs digest and fulfilled_at. Nothing is cached once a call
+    completes.
+    """
+
+    def __init__(self, engine: FulfillmentEngine) -> None:
+        self.engine = engine
+        self._in_flight: dict[Digest, _Flight[Future[FulfillmentResult]]] = {}
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._coalesced = 0
+
+    def fulfill(self, request: RRPRequest) -> FulfillmentResult:
+        key = compute_content_digest(request)
+        with self._lock:
+            self._calls += 1
+            flight = self._in_flight.get(key)
+            if flight is None:
+                flight = self._in_flight[key] = _Flight(Future())
+                leading = True
+            else:
+                flight.callers += 1
+                self._coalesced += 1
+                leading = False
+
+        if not leading:
+            return flight.hand_out(flight.call.result())
+
+        try:
+            result = self.engine.fulfill(request)
+        except BaseException as exc:
+            self._land(key)
+            flight.call.set_exception(exc)
+            raise
+        # No caller can join once the flight has landed, so callers is final
+        # before anyone gets the result.
+        self._land(key)
+        flight.call.set_result(result)
+        return flight.hand_out(result)
+
+    def stats(self) -> CoalescingStats:
+        with self._lock:
+            return CoalescingStats(calls=self._calls, coalesced=self._coalesced)
+
+    def _land(self, key: Digest) -> None:
+        with self._lock:
+            del self._in_flight[key]
+
+
+class AsyncCoalescingEngine:
+    """
+    Single-flight wrapper around an AsyncFulfillmentEngine.
+
+    Same semantics as CoalescingEngine for coroutines on one event loop.
+    The shared engine call is shielded, so a cancelled caller does not
+    cancel it for the others.
+    """
+
+    def __init__(self, engine: AsyncFulfillmentEngine) -> None:
+        self.engine = engine
+        self._in_flight: dict[Digest, _Flight[asyncio.Task[FulfillmentResult]]] = {}
+        self._calls = 0
+        self._coalesced = 0
+
+    async def fulfill(self, request: RRPRequest) -> FulfillmentResult:
+        key = compute_content_digest(request)
+        self._calls += 1
+        flight = self._in_flight.get(key)
+        if flight is None:
+            flight = self._in_flight[key] = _Flight(
+                asyncio.ensure_future(self._lead(key, request))
+            )
+        else:
+            flight.callers += 1
+            self._coalesced += 1
+        return flight.hand_out(await asyncio.shield(flight.call))
+
+    def stats(self) -> CoalescingStats:
+        return CoalescingStats(calls=self._calls, coalesced=self._coalesced)
+
+    async def _lead(self, key: Digest, request: RRPRequest) -> FulfillmentResult:
+        try:
+            return await self.engine.fulfill(request)
+        finally:
+            # Land before the result is delivered, as in CoalescingEngine.
+            del self._in_flight[key]
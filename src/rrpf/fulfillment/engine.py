@@ -1,5 +1,6 @@
 from collections.abc import Mapping
-from typing import Any, Protocol
+from collections.abc import Set as AbstractSet
+from typing import Any, Protocol, runtime_checkable
 
 from rrpf.schemas.provenance import QueryStats
 from rrpf.schemas.request import RRPRequest
@@ -20,3 +21,36 @@ class FulfillmentEngine(Protocol):
         MUST return deterministic ordering.
         """
         ...
+
+
+class AsyncFulfillmentEngine(Protocol):
+    async def fulfill(self, request: RRPRequest) -> FulfillmentResult:
+        """
+        Asynchronous counterpart of FulfillmentEngine.fulfill.
+        Same contract: explicit scope, per-group limits, deterministic ordering.
+        """
+        ...
+
+
+@runtime_checkable
+class DeadlineAwareEngine(Protocol):
+    def fulfill_before(
+        self, request: RRPRequest, deadline: float
+    ) -> tuple[FulfillmentResult, AbstractSet[str]]:
+        """
+        Fulfill the request, returning no later than `deadline` (a
+        time.monotonic() value) with whatever sections completed.
+        Also returns the keys of sections abandoned because time ran out.
+        """
+        ...
+
+
+@runtime_checkable
+class AsyncDeadlineAwareEngine(Protocol):
+    async def fulfill_before(
+        self, request: RRPRequest, deadline: float
+    ) -> tuple[FulfillmentResult, AbstractSet[str]]:
+        """
+        Asynchronous counterpart of DeadlineAwareEngine.fulfill_before.
+        """
+        ...
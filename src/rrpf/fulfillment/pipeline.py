@@ -0,0 +1,332 @@
+import os
+import threading
+import time
+from collections.abc import Mapping, Sequence
+from collections.abc import Set as AbstractSet
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from rrpf.fulfillment.engine import DeadlineAwareEngine, FulfillmentEngine, FulfillmentResult
+from rrpf.fulfillment.sections import SectionFanoutResult, event_section_key, table_section_key
+from rrpf.hashing.digest import compute_digest
+from rrpf.hashing.merkle import SectionDigests, digest_sections
+from rrpf.instrumentation.observer import NULL_TIMER, Stage, StageTimer
+from rrpf.normalization.canonicalize import canonical_request_json
+from rrpf.schemas.as_of import AsOfMode
+from rrpf.schemas.common import Digest
+from rrpf.schemas.errors import RRPError
+from rrpf.schemas.provenance import Provenance, QueryStats
+from rrpf.schemas.request import RRPRequest
+from rrpf.schemas.response import RRPResponse
+from rrpf.validation.validator import validate_request
+
+# The steps of one fulfillment run, shared by the sync, async, batch,
+# streaming and caching runners. Each runner strings them together:
+# reject_invalid, digest_request, its own engine call (call_engine for
+# synchronous engines), then finalize.
+
+# Runs opaque engines that have a deadline; created on first use.
+_deadline_pool: ThreadPoolExecutor | None = None
+_deadline_pool_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class RunResult:
+    response: RRPResponse
+    canonical_json: str
+    digest: Digest
+
+
+def reject_invalid(request: RRPRequest, timer: StageTimer = NULL_TIMER) -> RunResult | None:
+    """
+    Validate the request; return the failed RunResult if it is invalid.
+    """
+    validation_errors = validate_request(request)
+    timer.lap(Stage.VALIDATE)
+    if not validation_errors:
+        return None
+
+    rrp_errors = [
+        RRPError(
+            code=ve.code,
+            message=ve.message,
+            section=ve.path,
+        )
+        for ve in validation_errors
+    ]
+    response = RRPResponse(
+        ok=False,
+        request_id=request.request_id,
+        as_of="unknown",
+        partial=False,
+        errors=rrp_errors,
+        data={},
+        provenance=Provenance(
+            fulfilled_at=datetime.now(UTC),
+            inputs_digest=Digest(""),
+            query_stats={},
+        ),
+    )
+    # For invalid requests, we don't produce canonical JSON/digest effectively
+    return RunResult(response=response, canonical_json="", digest=Digest(""))
+
+
+def digest_request(request: RRPRequest, timer: StageTimer = NULL_TIMER) -> tuple[str, Digest]:
+    """
+    Canonicalize a validated request and compute its inputs digest.
+    """
+    # Canonical JSON is spliced from cached sub-form fragments, so encoding
+    # happens during canonicalization and the ENCODE stage only sizes it.
+    canonical_json = canonical_request_json(request)
+    timer.lap(Stage.CANONICALIZE)
+    timer.lap(
+        Stage.ENCODE,
+        size_bytes=len(canonical_json.encode("utf-8")) if timer.enabled else None,
+    )
+    digest = compute_digest(canonical_json)
+    timer.lap(Stage.DIGEST)
+    return canonical_json, digest
+
+
+def check_chunk_rows(chunk_rows: int | None) -> None:
+    """
+    Raise ValueError for an unusable chunk_rows. Runners call this on entry,
+    so a bad value is rejected before any request is fulfilled.
+    """
+    if chunk_rows is not None and chunk_rows <= 0:
+        raise ValueError("chunk_rows must be > 0")
+
+
+def deadline_for(request: RRPRequest) -> float | None:
+    """
+    Absolute time.monotonic() deadline for a request, or None if unbounded.
+    """
+    deadline_ms = request.constraints.deadline_ms
+    if deadline_ms is None:
+        return None
+    return time.monotonic() + deadline_ms / 1000
+
+
+def call_engine(
+    engine: FulfillmentEngine,
+    request: RRPRequest,
+    deadline: float | None,
+    timer: StageTimer = NULL_TIMER,
+    *,
+    inline: bool = False,
+) -> tuple[FulfillmentResult, AbstractSet[str]]:
+    """
+    Call the engine, returning its result and the sections that timed out.
+
+    Opaque engines with a deadline run on a shared, bounded thread pool so
+    the caller stops waiting at the deadline. With inline=True (for callers
+    already on a worker thread) they run on the calling thread instead, and
+    a result that arrives after the deadline is discarded.
+    """
+    result, timed_out = _call_engine_untimed(engine, request, deadline, inline)
+    timer.lap(
+        Stage.ENGINE,
+        rows=sum(s.rows for s in result.query_stats.values()) if timer.enabled else None,
+    )
+    return result, timed_out
+
+
+def _call_engine_untimed(
+    engine: FulfillmentEngine,
+    request: RRPRequest,
+    deadline: float | None,
+    inline: bool,
+) -> tuple[FulfillmentResult, AbstractSet[str]]:
+    if deadline is None:
+        return engine.fulfill(request), frozenset()
+
+    if isinstance(engine, DeadlineAwareEngine):
+        return engine.fulfill_before(request, deadline)
+
+    if inline:
+        result = engine.fulfill(request)
+        if time.monotonic() > deadline:
+            return SectionFanoutResult(), frozenset(expected_sections(request))
+        return result, frozenset()
+
+    # Opaque engines cannot be interrupted: stop waiting at the deadline and
+    # discard a late result. A call still queued then never runs.
+    future = _deadline_executor().submit(engine.fulfill, request)
+    try:
+        return future.result(timeout=max(0.0, deadline - time.monotonic())), frozenset()
+    except TimeoutError:
+        future.cancel()
+        return SectionFanoutResult(), frozenset(expected_sections(request))
+
+
+def _deadline_executor() -> ThreadPoolExecutor:
+    global _deadline_pool
+    with _deadline_pool_lock:
+        if _deadline_pool is None:
+            # Same default size as ThreadPoolExecutor. Threads are reused, so
+            # engines keeping per-thread state (e.g. connections) stay bounded.
+            _deadline_pool = ThreadPoolExecutor(
+                max_workers=min(32, (os.cpu_count() or 1) + 4),
+                thread_name_prefix="rrpf-deadline",
+            )
+        return _deadline_pool
+
+
+def finalize(
+    request: RRPRequest,
+    *,
+    canonical_json: str,
+    digest: Digest,
+    result: FulfillmentResult,
+    raised: Sequence[RRPError] = (),
+    timed_out: AbstractSet[str] = frozenset(),
+    timer: StageTimer = NULL_TIMER,
+    chunk_rows: int | None = None,
+) -> RunResult:
+    """
+    Apply constraint and partial-section checks to an engine result and
+    shape the final response. Errors already raised by the caller come first.
+    Sections in timed_out are reported as deadline_exceeded, even if some of
+    their rows arrived. Unless Constraints.section_digests is False,
+    provenance records a digest of every returned section and their Merkle
+    root, plus row chunk digests when chunk_rows is set.
+    """
+    data: dict[str, Any] = dict(result.data)
+    stats: dict[str, QueryStats] = dict(result.query_stats)
+
+    errors: list[RRPError] = list(raised)
+
+    # 4. Enforce constraints
+    total_rows = sum(s.rows for s in stats.values())
+
+    if total_rows > request.constraints.max_total_rows:
+        error = RRPError(
+            code="max_total_rows_exceeded",
+            message=f"Total rows {total_rows} exceeds limit {request.constraints.max_total_rows}",
+            section="constraints",
+        )
+        errors.append(error)
+        # If fail_on_partial is True, we fail hard.
+        # If False, we continue but include the error and mark partial=True.
+        # Logic handled at the end when determining ok/partial status.
+
+    # 5. Partial semantics check
+    for late in sorted(timed_out):
+        errors.append(
+            RRPError(
+                code="deadline_exceeded",
+                message=(
+                    f"Section {late} did not complete within "
+                    f"{request.constraints.deadline_ms} ms"
+                ),
+                section=late,
+            )
+        )
+
+    missing_sections = expected_sections(request) - set(data.keys()) - set(timed_out)
+    if missing_sections:
+        for missing in sorted(missing_sections):
+            errors.append(
+                RRPError(
+                    code="missing_section",
+                    message=f"Section {missing} was not fulfilled",
+                    section=missing,
+                )
+            )
+
+    timer.lap(Stage.CONSTRAINTS, rows=total_rows)
+
+    # 6. Response shaping
+    response = _shape_response(
+        request, digest=digest, data=data, stats=stats, errors=errors, chunk_rows=chunk_rows
+    )
+    timer.lap(Stage.SHAPE)
+    return RunResult(
+        response=response,
+        canonical_json=canonical_json,
+        digest=digest,
+    )
+
+
+def expected_sections(request: RRPRequest) -> set[str]:
+    expected_sections = set()
+    for table in request.data.tables:
+        expected_sections.add(table_section_key(table))
+    for event in request.data.events:
+        expected_sections.add(event_section_key(event))
+    return expected_sections
+
+
+def _shape_response(
+    request: RRPRequest,
+    *,
+    digest: Digest,
+    data: Mapping[str, Any],
+    stats: Mapping[str, QueryStats],
+    errors: list[RRPError],
+    chunk_rows: int | None = None,
+) -> RRPResponse:
+    # Determine final status
+    is_failed = False
+    is_partial = False
+
+    if errors:
+        if request.constraints.fail_on_partial:
+            is_failed = True
+            is_partial = False
+        else:
+            is_failed = False
+            is_partial = True
+
+    as_of_str: str
+    if request.as_of.mode == AsOfMode.LATEST:
+        as_of_str = "latest"
+    else:
+        # Use same logic as canonicalize for consistency if needed,
+        # but spec says "ISO UTC timestamp string (same format as canonicalization)"
+        # Canonicalization uses: dt.astimezone(UTC).isoformat().replace("+00:00", "Z")
+        # If AsOfMode.TIMESTAMP, timestamp is not None (validated).
+        ts = request.as_of.timestamp
+        if ts is not None:
+            ts = ts.replace(tzinfo=UTC) if ts.tzinfo is None else ts.astimezone(UTC)
+            as_of_str = ts.isoformat().replace("+00:00", "Z")
+        else:
+            # Should not happen given validation, but fallback
+            as_of_str = "unknown"
+
+    # Construct final response
+    returned = {} if is_failed else data
+    sections = (
+        _digest_sections(returned, chunk_rows) if request.constraints.section_digests else None
+    )
+    return RRPResponse(
+        ok=not is_failed,
+        request_id=request.request_id,
+        as_of=as_of_str,
+        partial=is_partial,
+        errors=errors,
+        data=returned,
+        provenance=Provenance(
+            fulfilled_at=datetime.now(UTC),
+            inputs_digest=digest,
+            query_stats=stats,
+            section_digests=sections.sections if sections is not None else None,
+            merkle_root=sections.root if sections is not None else None,
+            chunk_rows=sections.chunk_rows if sections is not None else None,
+            chunk_digests=sections.chunks if sections is not None else None,
+        ),
+    )
+
+
+def _digest_sections(data: Mapping[str, Any], chunk_rows: int | None) -> SectionDigests | None:
+    """
+    Section digests of data, or None if data holds values canonical JSON
+    cannot encode (e.g. Decimal, datetime or bytes from a database driver).
+    Such responses are still returned; they just cannot be verified.
+    """
+    try:
+        return digest_sections(data, chunk_rows=chunk_rows)
+    except TypeError:
+        return None
@@ -0,0 +1,224 @@
+import asyncio
+import os
+import time
+from collections.abc import Awaitable, Mapping, Sequence
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Any, Protocol
+
+from rrpf.schemas.data_requests import EventRequest, TableRequest
+from rrpf.schemas.provenance import QueryStats
+from rrpf.schemas.request import RRPRequest
+
+
+@dataclass(frozen=True)
+class SectionResult:
+    """Data and stats for a single fulfilled section."""
+
+    data: Any
+    stats: QueryStats
+
+
+@dataclass(frozen=True)
+class SectionFanoutResult:
+    """Concrete FulfillmentResult merged from per-section calls."""
+
+    data: Mapping[str, Any] = field(default_factory=dict)
+    query_stats: Mapping[str, QueryStats] = field(default_factory=dict)
+
+
+class SectionFulfillmentEngine(Protocol):
+    def fulfill_table(self, request: RRPRequest, table: TableRequest) -> SectionResult | None:
+        """
+        Fulfill a single table section.
+        Return None to omit the section; the runner reports it as missing.
+        """
+        ...
+
+    def fulfill_event(self, request: RRPRequest, event: EventRequest) -> SectionResult | None:
+        """
+        Fulfill a single event section.
+        Return None to omit the section; the runner reports it as missing.
+        """
+        ...
+
+
+class AsyncSectionFulfillmentEngine(Protocol):
+    async def fulfill_table(
+        self, request: RRPRequest, table: TableRequest
+    ) -> SectionResult | None: ...
+
+    async def fulfill_event(
+        self, request: RRPRequest, event: EventRequest
+    ) -> SectionResult | None: ...
+
+
+def table_section_key(table: TableRequest) -> str:
+    """Section key for a table request: table:{name}."""
+    return f"table:{table.table}"
+
+
+def event_section_key(event: EventRequest) -> str:
+    """Section key for an event request: event:{'+'.join(sorted(types))}."""
+    return "event:" + "+".join(sorted(event.types))
+
+
+class SectionFanoutEngine:
+    """
+    FulfillmentEngine that dispatches every table and event section of a
+    request to its own call on a thread pool, then merges the results.
+    Request latency becomes that of the slowest section rather than the sum.
+    """
+
+    def __init__(
+        self,
+        engine: SectionFulfillmentEngine,
+        *,
+        max_workers: int | None = None,
+        executor: Executor | None = None,
+    ) -> None:
+        self.engine = engine
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers or min(32, (os.cpu_count() or 1) + 4),
+            thread_name_prefix="rrpf-section",
+        )
+
+    def fulfill(self, request: RRPRequest) -> SectionFanoutResult:
+        futures = _submit_sections(self._executor, self.engine, request)
+        return _merge([(key, future.result()) for key, future in futures])
+
+    def fulfill_before(
+        self, request: RRPRequest, deadline: float
+    ) -> tuple[SectionFanoutResult, frozenset[str]]:
+        """
+        Fulfill the sections that complete by `deadline` (time.monotonic()).
+        Late sections are abandoned: queued ones are cancelled, running ones
+        finish in the background and are discarded.
+        """
+        futures = _submit_sections(self._executor, self.engine, request)
+        wait(
+            [future for _, future in futures],
+            timeout=max(0.0, deadline - time.monotonic()),
+        )
+
+        completed: list[tuple[str, SectionResult | None]] = []
+        timed_out: set[str] = set()
+        for key, future in futures:
+            if future.done():
+                completed.append((key, future.result()))
+            else:
+                future.cancel()
+                timed_out.add(key)
+        return _merge(completed), frozenset(timed_out)
+
+    def close(self) -> None:
+        """Shut down the thread pool if this engine created it."""
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "SectionFanoutEngine":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class AsyncSectionFanoutEngine:
+    """
+    AsyncFulfillmentEngine that awaits all sections of a request concurrently.
+    """
+
+    def __init__(self, engine: AsyncSectionFulfillmentEngine) -> None:
+        self.engine = engine
+
+    async def fulfill(self, request: RRPRequest) -> SectionFanoutResult:
+        """
+        Await every section. If one raises, the others are cancelled before
+        its exception propagates.
+        """
+        keys, calls = self._section_calls(request)
+        tasks = [asyncio.ensure_future(call) for call in calls]
+        try:
+            results: list[SectionResult | None] = await asyncio.gather(*tasks)
+        except Exception:
+            # gather leaves the remaining sections running when one raises.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return _merge(list(zip(keys, results, strict=True)))
+
+    async def fulfill_before(
+        self, request: RRPRequest, deadline: float
+    ) -> tuple[SectionFanoutResult, frozenset[str]]:
+        """
+        Fulfill the sections that complete by `deadline` (time.monotonic());
+        late sections are cancelled.
+        """
+        keys, calls = self._section_calls(request)
+        tasks = [asyncio.ensure_future(call) for call in calls]
+        if tasks:
+            await asyncio.wait(tasks, timeout=max(0.0, deadline - time.monotonic()))
+
+        # Cancel the late sections first, so none is left running if a
+        # completed one raises below.
+        late = [not task.done() for task in tasks]
+        for task, is_late in zip(tasks, late, strict=True):
+            if is_late:
+                task.cancel()
+        completed = [
+            (key, task.result())
+            for key, task, is_late in zip(keys, tasks, late, strict=True)
+            if not is_late
+        ]
+        timed_out = {key for key, is_late in zip(keys, late, strict=True) if is_late}
+        return _merge(completed), frozenset(timed_out)
+
+    def _section_calls(
+        self, request: RRPRequest
+    ) -> tuple[list[str], list[Awaitable[SectionResult | None]]]:
+        keys: list[str] = []
+        calls: list[Awaitable[SectionResult | None]] = []
+        for table in request.data.tables:
+            keys.append(table_section_key(table))
+            calls.append(self.engine.fulfill_table(request, table))
+        for event in request.data.events:
+            keys.append(event_section_key(event))
+            calls.append(self.engine.fulfill_event(request, event))
+        return keys, calls
+
+
+def _submit_sections(
+    executor: Executor,
+    engine: SectionFulfillmentEngine,
+    request: RRPRequest,
+) -> list[tuple[str, Future[SectionResult | None]]]:
+    futures: list[tuple[str, Future[SectionResult | None]]] = []
+    for table in request.data.tables:
+        futures.append(
+            (table_section_key(table), executor.submit(engine.fulfill_table, request, table))
+        )
+    for event in request.data.events:
+        futures.append(
+            (event_section_key(event), executor.submit(engine.fulfill_event, request, event))
+        )
+    return futures
+
+
+def _merge(results: Sequence[tuple[str, SectionResult | None]]) -> SectionFanoutResult:
+    # Merge in request order so later duplicates win, as in a sequential engine.
+    data: dict[str, Any] = {}
+    stats: dict[str, QueryStats] = {}
+    for key, result in results:
+        if result is None:
+            continue
+        data[key] = result.data
+        stats[key] = result.stats
+    return SectionFanoutResult(data=data, query_stats=stats)
@@ -0,0 +1,265 @@
+import asyncio
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, Mapping
+from functools import partial
+from typing import Any, Protocol
+
+from rrpf.fulfillment.pipeline import (
+    RunResult,
+    check_chunk_rows,
+    deadline_for,
+    digest_request,
+    finalize,
+    reject_invalid,
+)
+from rrpf.fulfillment.sections import SectionFanoutResult, event_section_key, table_section_key
+from rrpf.instrumentation.observer import RunObserver, Stage, StageTimer
+from rrpf.schemas.data_requests import EventRequest, TableRequest
+from rrpf.schemas.errors import RRPError
+from rrpf.schemas.provenance import QueryStats
+from rrpf.schemas.request import RRPRequest
+
+Row = Mapping[str, Any]
+
+
+class StreamingFulfillmentEngine(Protocol):
+    def stream_table(self, request: RRPRequest, table: TableRequest) -> Iterable[Row] | None:
+        """
+        Yield the rows of a table section lazily.
+        Return None to omit the section; the runner reports it as missing.
+        """
+        ...
+
+    def stream_event(self, request: RRPRequest, event: EventRequest) -> Iterable[Row] | None:
+        """
+        Yield the rows of an event section lazily.
+        Return None to omit the section; the runner reports it as missing.
+        """
+        ...
+
+
+class AsyncStreamingFulfillmentEngine(Protocol):
+    def stream_table(
+        self, request: RRPRequest, table: TableRequest
+    ) -> AsyncIterable[Row] | None: ...
+
+    def stream_event(
+        self, request: RRPRequest, event: EventRequest
+    ) -> AsyncIterable[Row] | None: ...
+
+
+class _RowBudget:
+    """
+    Tracks rows pulled against Constraints.max_total_rows and deadline_ms.
+    One row past the budget is pulled to detect an overflow, then never kept.
+    """
+
+    def __init__(self, max_total_rows: int, deadline: float | None) -> None:
+        self.remaining = max_total_rows
+        self.exceeded = False
+        self.deadline = deadline
+        self.timed_out: set[str] = set()
+
+    def admit(self) -> bool:
+        if self.remaining <= 0:
+            self.exceeded = True
+            return False
+        self.remaining -= 1
+        return True
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def time_left(self) -> float | None:
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+
+def run_fulfillment_streaming(
+    request: RRPRequest,
+    engine: StreamingFulfillmentEngine,
+    *,
+    observer: RunObserver | None = None,
+    chunk_rows: int | None = None,
+) -> RunResult:
+    """
+    Orchestrate an RRPF cycle against a streaming engine.
+
+    Rows are counted as they arrive. Each section stops at its limit, and the
+    whole stream stops as soon as max_total_rows would be exceeded; the response
+    is then marked partial or failed according to fail_on_partial.
+    """
+    check_chunk_rows(chunk_rows)
+    timer = StageTimer.start(observer, request.request_id)
+    deadline = deadline_for(request)
+
+    # 1. Validate request
+    rejected = reject_invalid(request, timer)
+    if rejected is not None:
+        return rejected
+
+    # 2. Canonicalize + digest
+    canonical_json, digest = digest_request(request, timer)
+
+    # 3. Pull rows section by section under the row budget and deadline
+    budget = _RowBudget(request.constraints.max_total_rows, deadline)
+    data: dict[str, Any] = {}
+    stats: dict[str, QueryStats] = {}
+
+    for key, limit, open_rows in _stream_sections(request, engine):
+        if budget.exceeded:
+            break
+        if budget.expired():
+            budget.timed_out.add(key)
+            continue
+        rows_source = open_rows()
+        if rows_source is None:
+            continue
+        rows = _pull(key, iter(rows_source), limit, budget)
+        data[key] = {"rows": rows}
+        stats[key] = QueryStats(rows=len(rows), groups=1)
+
+    timer.lap(Stage.ENGINE, rows=request.constraints.max_total_rows - budget.remaining)
+
+    # 4-6. Enforce constraints, check partial semantics, shape response
+    return finalize(
+        request,
+        canonical_json=canonical_json,
+        digest=digest,
+        result=SectionFanoutResult(data=data, query_stats=stats),
+        raised=_budget_errors(request, budget),
+        timed_out=budget.timed_out,
+        timer=timer,
+        chunk_rows=chunk_rows,
+    )
+
+
+async def run_fulfillment_streaming_async(
+    request: RRPRequest,
+    engine: AsyncStreamingFulfillmentEngine,
+    *,
+    observer: RunObserver | None = None,
+    chunk_rows: int | None = None,
+) -> RunResult:
+    """
+    Asynchronous counterpart of run_fulfillment_streaming.
+    """
+    check_chunk_rows(chunk_rows)
+    timer = StageTimer.start(observer, request.request_id)
+    deadline = deadline_for(request)
+
+    # 1. Validate request
+    rejected = reject_invalid(request, timer)
+    if rejected is not None:
+        return rejected
+
+    # 2. Canonicalize + digest
+    canonical_json, digest = digest_request(request, timer)
+
+    # 3. Pull rows section by section under the row budget and deadline
+    budget = _RowBudget(request.constraints.max_total_rows, deadline)
+    data: dict[str, Any] = {}
+    stats: dict[str, QueryStats] = {}
+
+    for key, limit, open_rows in _stream_sections_async(request, engine):
+        if budget.exceeded:
+            break
+        if budget.expired():
+            budget.timed_out.add(key)
+            continue
+        rows_source = open_rows()
+        if rows_source is None:
+            continue
+        rows = await _pull_async(key, aiter(rows_source), limit, budget)
+        data[key] = {"rows": rows}
+        stats[key] = QueryStats(rows=len(rows), groups=1)
+
+    timer.lap(Stage.ENGINE, rows=request.constraints.max_total_rows - budget.remaining)
+
+    # 4-6. Enforce constraints, check partial semantics, shape response
+    return finalize(
+        request,
+        canonical_json=canonical_json,
+        digest=digest,
+        result=SectionFanoutResult(data=data, query_stats=stats),
+        raised=_budget_errors(request, budget),
+        timed_out=budget.timed_out,
+        timer=timer,
+        chunk_rows=chunk_rows,
+    )
+
+
+def _stream_sections(
+    request: RRPRequest,
+    engine: StreamingFulfillmentEngine,
+) -> Iterator[tuple[str, int, Callable[[], Iterable[Row] | None]]]:
+    # Sections are opened lazily so nothing is started once the budget is spent.
+    for table in request.data.tables:
+        yield table_section_key(table), table.limit, partial(engine.stream_table, request, table)
+    for event in request.data.events:
+        yield event_section_key(event), event.limit, partial(engine.stream_event, request, event)
+
+
+def _stream_sections_async(
+    request: RRPRequest,
+    engine: AsyncStreamingFulfillmentEngine,
+) -> Iterator[tuple[str, int, Callable[[], AsyncIterable[Row] | None]]]:
+    for table in request.data.tables:
+        yield table_section_key(table), table.limit, partial(engine.stream_table, request, table)
+    for event in request.data.events:
+        yield event_section_key(event), event.limit, partial(engine.stream_event, request, event)
+
+
+def _pull(key: str, rows_iter: Iterator[Row], limit: int, budget: _RowBudget) -> list[Row]:
+    # Sync iterators cannot be interrupted, so the deadline is checked between rows.
+    rows: list[Row] = []
+    try:
+        while len(rows) < limit:
+            if budget.expired():
+                budget.timed_out.add(key)
+                break
+            row = next(rows_iter, None)
+            if row is None or not budget.admit():
+                break
+            rows.append(row)
+    finally:
+        # Release backend resources held by generators we stopped early.
+        close = getattr(rows_iter, "close", None)
+        if close is not None:
+            close()
+    return rows
+
+
+async def _pull_async(
+    key: str, rows_iter: AsyncIterator[Row], limit: int, budget: _RowBudget
+) -> list[Row]:
+    rows: list[Row] = []
+    try:
+        while len(rows) < limit:
+            try:
+                row = await asyncio.wait_for(anext(rows_iter, None), budget.time_left())
+            except TimeoutError:
+                budget.timed_out.add(key)
+                break
+            if row is None or not budget.admit():
+                break
+            rows.append(row)
+    finally:
+        aclose = getattr(rows_iter, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    return rows
+
+
+def _budget_errors(request: RRPRequest, budget: _RowBudget) -> list[RRPError]:
+    if not budget.exceeded:
+        return []
+    limit = request.constraints.max_total_rows
+    return [
+        RRPError(
+            code="max_total_rows_exceeded",
+            message=f"Total rows exceed limit {limit}; stream stopped after {limit} rows",
+            section="constraints",
+        )
+    ]
@@ -1,4 +1,67 @@
+from .canonical_binary import (
+    BINARY_MAGIC,
+    CANONICAL_ENCODINGS,
+    CanonicalEncoding,
+    canonical_digest,
+    compute_binary_digest,
+    decode_canonical_binary,
+    encode_canonical,
+    encode_canonical_binary,
+    is_canonical_binary,
+)
 from .canonical_json import to_canonical_json
-from .digest import compute_digest
+from .digest import (
+    DEFAULT_DIGEST_ALGORITHM,
+    DigestAlgorithm,
+    compute_digest,
+    digest_algorithms,
+    get_digest_algorithm,
+    normalize_digest,
+    parse_digest,
+    register_digest_algorithm,
+    same_digest,
+    tag_digest,
+)
+from .merkle import (
+    SectionDigests,
+    chunk_digests,
+    content_digest,
+    diff_sections,
+    digest_sections,
+    merkle_root,
+    verify_sections,
+)
+from .streaming import StreamedJSON, iter_canonical_json, write_canonical_json
 
-__all__ = ["to_canonical_json", "compute_digest"]
+__all__ = [
+    "to_canonical_json",
+    "BINARY_MAGIC",
+    "CANONICAL_ENCODINGS",
+    "CanonicalEncoding",
+    "canonical_digest",
+    "compute_binary_digest",
+    "decode_canonical_binary",
+    "encode_canonical",
+    "encode_canonical_binary",
+    "is_canonical_binary",
+    "compute_digest",
+    "DEFAULT_DIGEST_ALGORITHM",
+    "DigestAlgorithm",
+    "digest_algorithms",
+    "get_digest_algorithm",
+    "normalize_digest",
+    "parse_digest",
+    "register_digest_algorithm",
+    "same_digest",
+    "tag_digest",
+    "StreamedJSON",
+    "iter_canonical_json",
+    "write_canonical_json",
+    "SectionDigests",
+    "chunk_digests",
+    "content_digest",
+    "diff_sections",
+    "digest_sections",
+    "merkle_root",
+    "verify_sections",
+]
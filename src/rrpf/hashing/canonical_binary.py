@@ -0,0 +1,415 @@
+import struct
+from collections.abc import Mapping
+from typing import Any, Literal
+
+from rrpf.hashing.canonical_json import to_canonical_json
+from rrpf.hashing.digest import (
+    DEFAULT_DIGEST_ALGORITHM,
+    compute_digest,
+    parse_digest,
+    tag_digest,
+)
+from rrpf.schemas.common import Digest
+
+# Canonical binary encoding: deterministic CBOR (RFC 8949 section 4.2.1)
+# restricted to the JSON data model.
+#
+#   payload  = magic value
+#   magic    = d9 d9 f7 (CBOR self-describe tag 55799)
+#   head     = major type (3 bits) | argument, in the shortest form:
+#              arg < 24 -> 1 byte; else 1 + 1/2/4/8 big-endian bytes
+#              (additional info 24/25/26/27)
+#   value    = 0: unsigned int n          1: negative int, n = -1 - value
+#              3: UTF-8 text, n bytes     4: array, n values
+#              5: map, n (text key, value) pairs, keys sorted by their
+#                 encoded bytes (shorter keys first, then bytewise)
+#              7: f4 false, f5 true, f6 null, and floats as f9/fa/fb +
+#                 the shortest of half/single/double that is exact
+#                 (NaN is always f9 7e 00)
+#              integers beyond 64 bits: tag 2/3 (c2/c3) + big-endian byte
+#              string (major type 2) of n
+#
+# The same value always encodes to the same bytes. JSON and binary
+# encodings of a value differ, and so do their digests; binary digests are
+# tagged "cbor-<algorithm>:<hex>".
+
+CanonicalEncoding = Literal["json", "binary"]
+CANONICAL_ENCODINGS: tuple[CanonicalEncoding, ...] = ("json", "binary")
+
+BINARY_MAGIC = b"\xd9\xd9\xf7"
+BINARY_DIGEST_PREFIX = "cbor-"
+
+_UINT, _NEGINT, _BYTES, _TEXT, _ARRAY, _MAP, _TAG, _SIMPLE = range(8)
+
+_FALSE = b"\xf4"
+_TRUE = b"\xf5"
+_NULL = b"\xf6"
+_NAN = b"\xf9\x7e\x00"
+_MAX_UINT = 1 << 64
+_SIMPLE_VALUES: dict[int, bool | None] = {0xF4: False, 0xF5: True, 0xF6: None}
+
+# Heads with an argument below 24, by major type.
+_SMALL_HEADS = [[bytes((major << 5 | n,)) for n in range(24)] for major in range(8)]
+_U8 = struct.Struct(">BB")
+_U16 = struct.Struct(">BH")
+_U32 = struct.Struct(">BI")
+_U64 = struct.Struct(">BQ")
+_ARG16 = struct.Struct(">H")
+_ARG32 = struct.Struct(">I")
+_ARG64 = struct.Struct(">Q")
+_HALF = struct.Struct(">e")
+_SINGLE = struct.Struct(">f")
+_DOUBLE = struct.Struct(">d")
+
+
+def encode_canonical_binary(data: Any) -> bytes:
+    """
+    Encode a JSON-compatible value (str-keyed mappings, lists/tuples, str,
+    int, float, bool, None) in the canonical binary encoding.
+    """
+    out = bytearray(BINARY_MAGIC)
+    _Encoder(out).value(data)
+    return bytes(out)
+
+
+def decode_canonical_binary(raw: bytes) -> Any:
+    """
+    Decode a canonical binary payload. Maps decode to dicts and arrays to
+    lists, as with json.loads. Raises ValueError on malformed input.
+    """
+    if not raw.startswith(BINARY_MAGIC):
+        raise ValueError("Not a canonical binary payload")
+    decoder = _Decoder(raw)
+    try:
+        value, end = decoder.value(len(BINARY_MAGIC))
+    except (IndexError, struct.error):
+        raise ValueError("Truncated canonical binary payload") from None
+    if end != len(raw):
+        raise ValueError("Trailing bytes after canonical binary payload")
+    return value
+
+
+def is_canonical_binary(raw: bytes) -> bool:
+    return raw.startswith(BINARY_MAGIC)
+
+
+def encode_canonical(data: Mapping[str, Any], *, encoding: CanonicalEncoding = "json") -> bytes:
+    """Canonical bytes of data in the given encoding."""
+    if encoding == "json":
+        return to_canonical_json(data).encode("utf-8")
+    if encoding == "binary":
+        return encode_canonical_binary(data)
+    raise ValueError(f"Unknown canonical encoding: {encoding}")
+
+
+def compute_binary_digest(data: Mapping[str, Any], *, algorithm: str | None = None) -> Digest:
+    """Digest of the canonical binary encoding, tagged "cbor-<algorithm>:<hex>"."""
+    name = algorithm or DEFAULT_DIGEST_ALGORITHM
+    hexdigest = parse_digest(compute_digest(encode_canonical_binary(data), algorithm=name))[1]
+    return tag_digest(f"{BINARY_DIGEST_PREFIX}{name}", hexdigest)
+
+
+def canonical_digest(
+    data: Mapping[str, Any],
+    *,
+    encoding: CanonicalEncoding = "json",
+    algorithm: str | None = None,
+) -> Digest:
+    """
+    Digest of data in the given canonical encoding: compute_digest of its
+    canonical JSON, or compute_binary_digest.
+    """
+    if encoding == "json":
+        return compute_digest(to_canonical_json(data), algorithm=algorithm)
+    if encoding == "binary":
+        return compute_binary_digest(data, algorithm=algorithm)
+    raise ValueError(f"Unknown canonical encoding: {encoding}")
+
+
+def _head(major: int, n: int) -> bytes:
+    if n < 24:
+        return _SMALL_HEADS[major][n]
+    if n < 0x100:
+        return _U8.pack(major << 5 | 24, n)
+    if n < 0x10000:
+        return _U16.pack(major << 5 | 25, n)
+    if n < 0x100000000:
+        return _U32.pack(major << 5 | 26, n)
+    return _U64.pack(major << 5 | 27, n)
+
+
+def _encode_float(value: float) -> bytes:
+    if value != value:
+        return _NAN
+    try:
+        half = _HALF.pack(value)
+        if _HALF.unpack(half)[0] == value:
+            return b"\xf9" + half
+    except OverflowError:
+        pass
+    try:
+        single = _SINGLE.pack(value)
+        if _SINGLE.unpack(single)[0] == value:
+            return b"\xfa" + single
+    except OverflowError:
+        pass
+    return b"\xfb" + _DOUBLE.pack(value)
+
+
+def _encode_int(value: int) -> bytes:
+    if value >= 0:
+        if value < _MAX_UINT:
+            return _head(_UINT, value)
+        tag, n = 2, value
+    else:
+        n = -1 - value
+        if n < _MAX_UINT:
+            return _head(_NEGINT, n)
+        tag = 3
+    magnitude = n.to_bytes((n.bit_length() + 7) // 8, "big")
+    return _SMALL_HEADS[_TAG][tag] + _head(_BYTES, len(magnitude)) + magnitude
+
+
+class _Encoder:
+    """
+    Appends encodings to out. Key encodings, and the map head and sorted
+    key order of each distinct key layout, are cached for the encoder's
+    lifetime, so rows sharing their keys are neither re-encoded nor
+    re-sorted.
+    """
+
+    def __init__(self, out: bytearray) -> None:
+        self.out = out
+        self.keys: dict[str, bytes] = {}
+        self.layouts: dict[tuple[str, ...], tuple[bytes, list[tuple[bytes, str]]]] = {}
+
+    def value(self, value: Any) -> None:
+        out = self.out
+        kind = type(value)
+        if kind is str:
+            raw = value.encode("utf-8")
+            out += _head(_TEXT, len(raw))
+            out += raw
+        elif kind is int:
+            out += _head(_UINT, value) if 0 <= value < _MAX_UINT else _encode_int(value)
+        elif kind is dict:
+            self.mapping(value)
+        elif kind is list or kind is tuple:
+            out += _head(_ARRAY, len(value))
+            mapping = self.mapping
+            for item in value:
+                # Rows are dicts; skip the generic dispatch for them.
+                if type(item) is dict:
+                    mapping(item)
+                else:
+                    self.value(item)
+        elif value is None:
+            out += _NULL
+        elif value is True:
+            out += _TRUE
+        elif value is False:
+            out += _FALSE
+        elif kind is float:
+            out += _encode_float(value)
+        # Subclasses (str enums, frozen mappings, ...) encode as their base.
+        elif isinstance(value, str):
+            raw = str.encode(value, "utf-8")
+            out += _head(_TEXT, len(raw))
+            out += raw
+        elif isinstance(value, int):
+            self.value(int(value))
+        elif isinstance(value, float):
+            self.value(float(value))
+        elif isinstance(value, Mapping):
+            self.mapping(value)
+        elif isinstance(value, list | tuple):
+            self.value(list(value))
+        else:
+            raise TypeError(
+                f"Object of type {kind.__name__} is not canonical binary serializable"
+            )
+
+    def mapping(self, value: Mapping[Any, Any]) -> None:
+        out = self.out
+        layout = tuple(value)
+        cached = self.layouts.get(layout)
+        if cached is None:
+            order = sorted(self.key(key) for key in layout)
+            cached = self.layouts[layout] = (_head(_MAP, len(order)), order)
+        head, order = cached
+        out += head
+        append = out.append
+        for encoded_key, key in order:
+            out += encoded_key
+            item = value[key]
+            # Inline the common row cells; everything else recurses.
+            kind = type(item)
+            if kind is str:
+                raw = item.encode("utf-8")
+                length = len(raw)
+                if length < 24:
+                    append(0x60 | length)
+                elif length < 0x100:
+                    append(0x78)
+                    append(length)
+                else:
+                    out += _head(_TEXT, length)
+                out += raw
+            elif kind is int and 0 <= item < 0x10000:
+                if item < 24:
+                    append(item)
+                elif item < 0x100:
+                    append(0x18)
+                    append(item)
+                else:
+                    out += _U16.pack(0x19, item)
+            else:
+                self.value(item)
+
+    def key(self, key: Any) -> tuple[bytes, str]:
+        if not isinstance(key, str):
+            raise TypeError(
+                f"Canonical binary map keys must be str, not {type(key).__name__}"
+            )
+        encoded = self.keys.get(key)
+        if encoded is None:
+            raw = key.encode("utf-8")
+            encoded = self.keys[key] = _head(_TEXT, len(raw)) + raw
+        return encoded, key
+
+
+class _Decoder:
+    def __init__(self, raw: bytes) -> None:
+        self.raw = raw
+        # Row keys repeat; share one str per distinct key, as json.loads does.
+        self.keys: dict[bytes, str] = {}
+
+    def argument(self, info: int, pos: int) -> tuple[int, int]:
+        if info < 24:
+            return info, pos
+        raw = self.raw
+        if info == 24:
+            return raw[pos], pos + 1
+        # unpack_from raises struct.error, reported as truncation, when the
+        # argument runs past the end.
+        if info == 25:
+            return _ARG16.unpack_from(raw, pos)[0], pos + 2
+        if info == 26:
+            return _ARG32.unpack_from(raw, pos)[0], pos + 4
+        if info == 27:
+            return _ARG64.unpack_from(raw, pos)[0], pos + 8
+        raise ValueError(f"Unsupported canonical binary argument: {info}")
+
+    def value(self, pos: int) -> tuple[Any, int]:
+        raw = self.raw
+        initial = raw[pos]
+        major = initial >> 5
+        pos += 1
+        if major == _SIMPLE:
+            return self.simple(initial, pos)
+        n, pos = self.argument(initial & 0x1F, pos)
+        if major == _MAP:
+            return self.mapping(n, pos)
+        if major == _ARRAY:
+            items: list[Any] = []
+            append = items.append
+            mapping = self.mapping
+            for _ in range(n):
+                # Rows are small maps; skip the generic dispatch for them.
+                initial = raw[pos]
+                if 0xA0 <= initial < 0xB8:
+                    item, pos = mapping(initial - 0xA0, pos + 1)
+                else:
+                    item, pos = self.value(pos)
+                append(item)
+            return items, pos
+        return self.scalar(major, n, pos)
+
+    def mapping(self, n: int, pos: int) -> tuple[dict[str, Any], int]:
+        raw = self.raw
+        size = len(raw)
+        keys = self.keys
+        mapping: dict[str, Any] = {}
+        for _ in range(n):
+            initial = raw[pos]
+            if 0x60 <= initial < 0x78:
+                start = pos + 1
+                pos = start + initial - 0x60
+            elif initial >> 5 == _TEXT:
+                length, start = self.argument(initial & 0x1F, pos + 1)
+                pos = start + length
+            else:
+                raise ValueError("Canonical binary map keys must be text")
+            encoded = raw[start:pos]
+            key = keys.get(encoded)
+            if key is None:
+                key = keys[encoded] = encoded.decode("utf-8")
+            # Inline the common row cells (small ints and text with a short
+            # head); everything else recurses.
+            initial = raw[pos]
+            if initial < 0x1A:
+                if initial < 24:
+                    mapping[key] = initial
+                    pos += 1
+                elif initial == 0x18:
+                    mapping[key] = raw[pos + 1]
+                    pos += 2
+                else:
+                    mapping[key] = raw[pos + 1] << 8 | raw[pos + 2]
+                    pos += 3
+            elif 0x60 <= initial < 0x7A:
+                if initial < 0x78:
+                    start = pos + 1
+                    end = start + initial - 0x60
+                elif initial == 0x78:
+                    start = pos + 2
+                    end = start + raw[pos + 1]
+                else:
+                    start = pos + 3
+                    end = start + (raw[pos + 1] << 8 | raw[pos + 2])
+                if end > size:
+                    raise IndexError(end)
+                mapping[key] = raw[start:end].decode("utf-8")
+                pos = end
+            elif initial in _SIMPLE_VALUES:
+                mapping[key] = _SIMPLE_VALUES[initial]
+                pos += 1
+            else:
+                mapping[key], pos = self.value(pos)
+        return mapping, pos
+
+    def scalar(self, major: int, n: int, pos: int) -> tuple[Any, int]:
+        raw = self.raw
+        if major == _TEXT:
+            end = pos + n
+            if end > len(raw):
+                raise IndexError(end)
+            return raw[pos:end].decode("utf-8"), end
+        if major == _UINT:
+            return n, pos
+        if major == _NEGINT:
+            return -1 - n, pos
+        if major == _TAG and n in (2, 3) and raw[pos] >> 5 == _BYTES:
+            length, start = self.argument(raw[pos] & 0x1F, pos + 1)
+            end = start + length
+            if end > len(raw):
+                raise IndexError(end)
+            magnitude = int.from_bytes(raw[start:end], "big")
+            return (magnitude if n == 2 else -1 - magnitude), end
+        raise ValueError(f"Unsupported canonical binary value: major type {major}")
+
+    def simple(self, initial: int, pos: int) -> tuple[Any, int]:
+        raw = self.raw
+        if initial == 0xF4:
+            return False, pos
+        if initial == 0xF5:
+            return True, pos
+        if initial == 0xF6:
+            return None, pos
+        if initial == 0xF9:
+            return _HALF.unpack_from(raw, pos)[0], pos + 2
+        if initial == 0xFA:
+            return _SINGLE.unpack_from(raw, pos)[0], pos + 4
+        if initial == 0xFB:
+            return _DOUBLE.unpack_from(raw, pos)[0], pos + 8
+        raise ValueError(f"Unsupported canonical binary value: 0x{initial:02x}")
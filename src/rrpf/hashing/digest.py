@@ -1,12 +1,101 @@
 import hashlib
-from typing import cast
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Protocol, cast
 
 from rrpf.schemas.common import Digest
 
+# Bare (untagged) digests are SHA-256; every digest created before algorithm
+# tags existed is one.
+DEFAULT_DIGEST_ALGORITHM = "sha256"
 
-def compute_digest(canonical_json: str) -> Digest:
+
+class Hasher(Protocol):
+    def update(self, data: bytes, /) -> None: ...
+
+    def hexdigest(self) -> str: ...
+
+
+@dataclass(frozen=True)
+class DigestAlgorithm:
+    """A named hash constructor usable for digests."""
+
+    name: str
+    new: Callable[[], Hasher]
+
+
+_ALGORITHMS: dict[str, DigestAlgorithm] = {}
+
+
+def register_digest_algorithm(name: str, new: Callable[[], Hasher]) -> DigestAlgorithm:
+    """
+    Register (or replace) a digest algorithm under name. Names must not
+    contain ":", which separates the algorithm from the hex digest.
+    """
+    if not name or ":" in name:
+        raise ValueError(f"Invalid digest algorithm name: {name!r}")
+    algorithm = DigestAlgorithm(name=name, new=new)
+    _ALGORITHMS[name] = algorithm
+    return algorithm
+
+
+def get_digest_algorithm(name: str) -> DigestAlgorithm:
+    algorithm = _ALGORITHMS.get(name)
+    if algorithm is None:
+        raise ValueError(f"Unknown digest algorithm: {name}")
+    return algorithm
+
+
+def digest_algorithms() -> list[str]:
+    """Names of the registered digest algorithms."""
+    return sorted(_ALGORITHMS)
+
+
+register_digest_algorithm("sha256", hashlib.sha256)
+# 32-byte BLAKE2b: same digest length as SHA-256, faster on large inputs.
+register_digest_algorithm("blake2b", lambda: hashlib.blake2b(digest_size=32))
+
+
+def compute_digest(canonical_json: str | bytes, *, algorithm: str | None = None) -> Digest:
     """
-    Compute SHA-256 digest of canonical JSON.
+    Compute the digest of canonical JSON.
+
+    Without algorithm this is the bare SHA-256 hex digest. With one, the
+    digest is tagged with its name, e.g. "blake2b:<hex>".
     """
-    digest_hash = hashlib.sha256(canonical_json.encode("utf-8")).hexdigest()
-    return cast(Digest, digest_hash)
+    data = canonical_json.encode("utf-8") if isinstance(canonical_json, str) else canonical_json
+    if algorithm is None:
+        return cast(Digest, hashlib.sha256(data).hexdigest())
+    hasher = get_digest_algorithm(algorithm).new()
+    hasher.update(data)
+    return tag_digest(algorithm, hasher.hexdigest())
+
+
+def tag_digest(algorithm: str, hexdigest: str) -> Digest:
+    """The algorithm-tagged form "<algorithm>:<hexdigest>"."""
+    return Digest(f"{algorithm}:{hexdigest}")
+
+
+def parse_digest(digest: str) -> tuple[str, str]:
+    """Split a tagged or bare digest into (algorithm, hex digest)."""
+    algorithm, sep, hexdigest = digest.partition(":")
+    if not sep:
+        return DEFAULT_DIGEST_ALGORITHM, digest
+    return algorithm, hexdigest
+
+
+def normalize_digest(digest: str) -> Digest:
+    """
+    Canonical form of a digest, used as the storage key: SHA-256 digests
+    are bare (so "sha256:<hex>" and "<hex>" are the same key), others keep
+    their algorithm tag.
+    """
+    algorithm, hexdigest = parse_digest(digest)
+    if algorithm == DEFAULT_DIGEST_ALGORITHM:
+        return Digest(hexdigest)
+    return Digest(digest)
+
+
+def same_digest(left: str, right: str) -> bool:
+    """True if two digests, tagged or bare, name the same value."""
+    return normalize_digest(left) == normalize_digest(right)
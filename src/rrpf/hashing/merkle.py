@@ -0,0 +1,158 @@
+import hashlib
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from rrpf.hashing.streaming import encode_json
+from rrpf.schemas.common import Digest
+
+# Domain separation between leaves and interior nodes (as in RFC 6962), so a
+# leaf can never be passed off as a subtree.
+_LEAF = b"\x00"
+_NODE = b"\x01"
+
+
+@dataclass(frozen=True)
+class SectionDigests:
+    """
+    Content digests of the `data` sections of a response.
+
+    sections maps each section key to the SHA-256 digest of its canonical
+    JSON. With chunk_rows set, chunks maps each section that has a "rows"
+    list to the digests of consecutive chunk_rows-row slices of it. root is
+    the Merkle root over all sections (and their chunks).
+    """
+
+    sections: Mapping[str, Digest]
+    root: Digest
+    chunk_rows: int | None = None
+    chunks: Mapping[str, Sequence[Digest]] | None = None
+
+
+def content_digest(value: Any) -> Digest:
+    """
+    SHA-256 digest of the canonical JSON of any JSON value. The value is
+    encoded in one C encoder call, so the transient string is the size of
+    the value's JSON, which is well below its in-memory size.
+    """
+    return Digest(hashlib.sha256(encode_json(value).encode("utf-8")).hexdigest())
+
+
+def chunk_digests(rows: Sequence[Any], *, chunk_rows: int) -> list[Digest]:
+    """Digests of the canonical JSON of consecutive chunk_rows-row slices."""
+    if chunk_rows <= 0:
+        raise ValueError("chunk_rows must be > 0")
+    return [
+        content_digest(list(rows[start : start + chunk_rows]))
+        for start in range(0, len(rows), chunk_rows)
+    ]
+
+
+def merkle_root(leaves: Sequence[bytes]) -> Digest:
+    """
+    Merkle tree hash of leaves, built like RFC 6962: a leaf hashes as
+    sha256(0x00 + leaf), a node as sha256(0x01 + left + right), and the
+    left subtree holds the largest power of two below the leaf count.
+    The root of no leaves is sha256(b"").
+    """
+    if not leaves:
+        return Digest(hashlib.sha256(b"").hexdigest())
+    return Digest(_tree_hash(leaves).hex())
+
+
+def section_leaf(key: str, digest: Digest, chunks: Sequence[Digest] | None = None) -> bytes:
+    """
+    Leaf of the section tree: canonical JSON of [key, digest], plus the
+    Merkle root of the section's row chunks when it was chunked.
+    """
+    if chunks is None:
+        return encode_json([key, digest]).encode("utf-8")
+    chunk_root = merkle_root([bytes.fromhex(chunk) for chunk in chunks])
+    return encode_json([key, digest, chunk_root]).encode("utf-8")
+
+
+def digest_sections(data: Mapping[str, Any], *, chunk_rows: int | None = None) -> SectionDigests:
+    """
+    Digest every section of data and build the Merkle root over them.
+    """
+    if chunk_rows is not None and chunk_rows <= 0:
+        raise ValueError("chunk_rows must be > 0")
+    sections: dict[str, Digest] = {}
+    chunks: dict[str, list[Digest]] | None = None if chunk_rows is None else {}
+    for key, value in sorted(data.items()):
+        if chunks is not None and chunk_rows is not None and _rows(value) is not None:
+            sections[key], chunks[key] = _digest_chunked(value, chunk_rows)
+        else:
+            sections[key] = content_digest(value)
+    root = merkle_root(
+        [
+            section_leaf(key, digest, chunks.get(key) if chunks is not None else None)
+            for key, digest in sections.items()
+        ]
+    )
+    return SectionDigests(sections=sections, root=root, chunk_rows=chunk_rows, chunks=chunks)
+
+
+def verify_sections(
+    data: Mapping[str, Any],
+    expected: Mapping[str, Digest],
+    *,
+    keys: Sequence[str] | None = None,
+) -> list[str]:
+    """
+    Keys (all of expected, or just `keys`) whose section in data is missing
+    or does not match its expected digest, in sorted order.
+    """
+    mismatched: list[str] = []
+    for key in sorted(expected if keys is None else keys):
+        digest = expected.get(key)
+        if digest is None or key not in data or content_digest(data[key]) != digest:
+            mismatched.append(key)
+    return mismatched
+
+
+def diff_sections(left: Mapping[str, Digest], right: Mapping[str, Digest]) -> list[str]:
+    """Section keys whose digests differ, or that only one side has, sorted."""
+    return sorted(key for key in left.keys() | right.keys() if left.get(key) != right.get(key))
+
+
+def _rows(section: Any) -> list[Any] | None:
+    if not isinstance(section, Mapping) or not all(isinstance(key, str) for key in section):
+        return None
+    rows = section.get("rows")
+    return rows if isinstance(rows, list) else None
+
+
+def _digest_chunked(section: Mapping[str, Any], chunk_rows: int) -> tuple[Digest, list[Digest]]:
+    """
+    Section digest and row chunk digests in one pass: the section's canonical
+    JSON is hashed piecewise, reusing each chunk's encoding for its rows.
+    """
+    sha = hashlib.sha256(b"{")
+    chunks: list[Digest] = []
+    for position, (key, value) in enumerate(sorted(section.items())):
+        if position:
+            sha.update(b",")
+        sha.update((encode_json(key) + ":").encode("utf-8"))
+        if key != "rows":
+            sha.update(encode_json(value).encode("utf-8"))
+            continue
+        sha.update(b"[")
+        for start in range(0, len(value), chunk_rows):
+            encoded = encode_json(value[start : start + chunk_rows]).encode("utf-8")
+            chunks.append(Digest(hashlib.sha256(encoded).hexdigest()))
+            if start:
+                sha.update(b",")
+            sha.update(encoded[1:-1])
+        sha.update(b"]")
+    sha.update(b"}")
+    return Digest(sha.hexdigest()), chunks
+
+
+def _tree_hash(leaves: Sequence[bytes]) -> bytes:
+    if len(leaves) == 1:
+        return hashlib.sha256(_LEAF + leaves[0]).digest()
+    split = 1 << ((len(leaves) - 1).bit_length() - 1)
+    left = _tree_hash(leaves[:split])
+    right = _tree_hash(leaves[split:])
+    return hashlib.sha256(_NODE + left + right).digest()
@@ -0,0 +1,145 @@
+import hashlib
+import json
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from rrpf.hashing.digest import Hasher, get_digest_algorithm, tag_digest
+from rrpf.schemas.common import Digest
+
+# Building blocks shared with the other canonical JSON producers (request
+# canonicalization, section digests and the indexed payload writer), which
+# must stay byte-identical to to_canonical_json.
+
+# Same settings as to_canonical_json; used for leaves and flat containers.
+encode_json = json.JSONEncoder(
+    sort_keys=True,
+    separators=(",", ":"),
+    ensure_ascii=False,
+).encode
+
+# Default output chunk size, in bytes.
+CHUNK_SIZE = 64 * 1024
+# Flat list items encoded per C encoder call.
+ROW_BATCH = 256
+
+
+class ByteSink(Protocol):
+    def write(self, data: bytes, /) -> object: ...
+
+
+@dataclass(frozen=True)
+class StreamedJSON:
+    """Result of write_canonical_json: digest and size of the UTF-8 output."""
+
+    digest: Digest
+    size_bytes: int
+
+
+def iter_canonical_json(
+    data: Mapping[str, Any], *, chunk_size: int = CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Encode data as canonical JSON, yielding UTF-8 chunks of about chunk_size
+    bytes. The concatenated chunks are byte-identical to
+    to_canonical_json(data).encode("utf-8"), but the whole document is
+    never held in memory at once.
+    """
+    buffer: list[bytes] = []
+    buffered = 0
+    for piece in iter_json_pieces(data):
+        encoded = piece.encode("utf-8")
+        buffer.append(encoded)
+        buffered += len(encoded)
+        if buffered >= chunk_size:
+            yield b"".join(buffer)
+            buffer.clear()
+            buffered = 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def write_canonical_json(
+    data: Mapping[str, Any],
+    sink: ByteSink | None = None,
+    *,
+    chunk_size: int = CHUNK_SIZE,
+    algorithm: str | None = None,
+) -> StreamedJSON:
+    """
+    Stream canonical JSON into sink (if given) while hashing it, in one pass.
+    The digest equals compute_digest(to_canonical_json(data), algorithm=algorithm).
+    """
+    hasher: Hasher = (
+        hashlib.sha256() if algorithm is None else get_digest_algorithm(algorithm).new()
+    )
+    size = 0
+    for chunk in iter_canonical_json(data, chunk_size=chunk_size):
+        hasher.update(chunk)
+        size += len(chunk)
+        if sink is not None:
+            sink.write(chunk)
+    digest = hasher.hexdigest()
+    return StreamedJSON(
+        digest=Digest(digest) if algorithm is None else tag_digest(algorithm, digest),
+        size_bytes=size,
+    )
+
+
+def iter_json_pieces(value: Any) -> Iterator[str]:
+    """Canonical JSON of value as str pieces; their concatenation is the document."""
+    # Containers are walked element by element, except flat ones (typically
+    # rows) and scalars, which are handed to the C encoder. Runs of flat list
+    # items are encoded ROW_BATCH at a time to amortize the per-call overhead.
+    if is_flat(value):
+        yield encode_json(value)
+    elif isinstance(value, dict):
+        yield "{"
+        first = True
+        for key, item in sorted(value.items()):
+            if not first:
+                yield ","
+            first = False
+            yield encode_json(key)
+            yield ":"
+            yield from iter_json_pieces(item)
+        yield "}"
+    else:
+        yield "["
+        separator = ""
+        batch: list[Any] = []
+        for item in value:
+            if is_flat(item):
+                batch.append(item)
+                if len(batch) == ROW_BATCH:
+                    yield separator + encode_json(batch)[1:-1]
+                    separator = ","
+                    batch = []
+                continue
+            if batch:
+                yield separator + encode_json(batch)[1:-1]
+                separator = ","
+                batch = []
+            yield separator
+            separator = ","
+            yield from iter_json_pieces(item)
+        if batch:
+            yield separator + encode_json(batch)[1:-1]
+        yield "]"
+
+
+def is_flat(value: Any) -> bool:
+    """
+    True for scalars and for containers without nested containers. Objects
+    with non-str keys also count as flat: json coerces those keys itself.
+    """
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if not isinstance(key, str):
+                return True
+            if isinstance(item, dict | list | tuple):
+                return False
+        return True
+    if isinstance(value, list | tuple):
+        return not any(isinstance(item, dict | list | tuple) for item in value)
+    return True
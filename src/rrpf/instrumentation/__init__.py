@@ -0,0 +1,11 @@
+from .collector import StageSummary, StageTimingCollector
+from .observer import RunObserver, Stage, StageEvent, StageTimer
+
+__all__ = [
+    "RunObserver",
+    "Stage",
+    "StageEvent",
+    "StageSummary",
+    "StageTimer",
+    "StageTimingCollector",
+]
@@ -0,0 +1,87 @@
+import math
+import threading
+from collections import deque
+from dataclasses import dataclass
+
+from rrpf.instrumentation.observer import Stage, StageEvent
+
+
+@dataclass(frozen=True)
+class StageSummary:
+    """Aggregated timings for one stage; durations in milliseconds."""
+
+    count: int
+    total_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    rows: int
+    size_bytes: int
+
+
+class StageTimingCollector:
+    """
+    Thread-safe RunObserver that aggregates stage timings.
+
+    Counts and totals cover every event; percentiles are computed over the
+    most recent max_samples durations of each stage.
+    """
+
+    def __init__(self, *, max_samples: int = 10_000) -> None:
+        if max_samples <= 0:
+            raise ValueError("max_samples must be > 0")
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._samples: dict[Stage, deque[int]] = {}
+        self._counts: dict[Stage, int] = {}
+        self._totals_ns: dict[Stage, int] = {}
+        self._rows: dict[Stage, int] = {}
+        self._bytes: dict[Stage, int] = {}
+
+    def on_stage(self, event: StageEvent) -> None:
+        with self._lock:
+            stage = event.stage
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.max_samples)
+            samples.append(event.duration_ns)
+            self._counts[stage] = self._counts.get(stage, 0) + 1
+            self._totals_ns[stage] = self._totals_ns.get(stage, 0) + event.duration_ns
+            if event.rows is not None:
+                self._rows[stage] = self._rows.get(stage, 0) + event.rows
+            if event.size_bytes is not None:
+                self._bytes[stage] = self._bytes.get(stage, 0) + event.size_bytes
+
+    def summary(self) -> dict[Stage, StageSummary]:
+        """Per-stage summary, in pipeline order."""
+        with self._lock:
+            snapshot = {stage: sorted(samples) for stage, samples in self._samples.items()}
+            result: dict[Stage, StageSummary] = {}
+            for stage in Stage:
+                samples = snapshot.get(stage)
+                if not samples:
+                    continue
+                result[stage] = StageSummary(
+                    count=self._counts[stage],
+                    total_ms=self._totals_ns[stage] / 1e6,
+                    p50_ms=_percentile(samples, 50) / 1e6,
+                    p95_ms=_percentile(samples, 95) / 1e6,
+                    p99_ms=_percentile(samples, 99) / 1e6,
+                    rows=self._rows.get(stage, 0),
+                    size_bytes=self._bytes.get(stage, 0),
+                )
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+            self._totals_ns.clear()
+            self._rows.clear()
+            self._bytes.clear()
+
+
+def _percentile(sorted_samples: list[int], pct: float) -> int:
+    # Nearest-rank percentile.
+    rank = max(1, math.ceil(pct / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
@@ -0,0 +1,97 @@
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Protocol
+
+from rrpf.schemas.common import RequestID
+
+
+class Stage(str, Enum):
+    VALIDATE = "validate"
+    CANONICALIZE = "canonicalize"
+    ENCODE = "encode"
+    DIGEST = "digest"
+    ENGINE = "engine"
+    CONSTRAINTS = "constraints"
+    SHAPE = "shape"
+    STORE = "store"
+
+
+@dataclass(frozen=True)
+class StageEvent:
+    """
+    Timing of one runner stage for one request.
+    rows and size_bytes are reported where the stage has them.
+    """
+
+    stage: Stage
+    request_id: RequestID
+    duration_ns: int
+    rows: int | None = None
+    size_bytes: int | None = None
+
+
+class RunObserver(Protocol):
+    def on_stage(self, event: StageEvent) -> None:
+        """
+        Receive a completed stage.
+        May be called concurrently from several threads; must not raise.
+        """
+        ...
+
+
+class StageTimer:
+    """
+    Lap timer that reports consecutive runner stages to an observer using
+    time.perf_counter_ns(). Each lap measures the time since the previous
+    lap (or since start/restart).
+    """
+
+    enabled = True
+
+    def __init__(self, observer: RunObserver, request_id: RequestID) -> None:
+        self.observer = observer
+        self.request_id = request_id
+        self._last = time.perf_counter_ns()
+
+    @classmethod
+    def start(cls, observer: RunObserver | None, request_id: RequestID) -> "StageTimer":
+        """Return a running timer, or the shared no-op timer if observer is None."""
+        if observer is None:
+            return NULL_TIMER
+        return cls(observer, request_id)
+
+    def restart(self) -> None:
+        """Begin the next lap now, e.g. when work resumes on another thread."""
+        self._last = time.perf_counter_ns()
+
+    def lap(self, stage: Stage, *, rows: int | None = None, size_bytes: int | None = None) -> None:
+        now = time.perf_counter_ns()
+        self.observer.on_stage(
+            StageEvent(
+                stage=stage,
+                request_id=self.request_id,
+                duration_ns=now - self._last,
+                rows=rows,
+                size_bytes=size_bytes,
+            )
+        )
+        self._last = time.perf_counter_ns()
+
+
+class _NullTimer(StageTimer):
+    """No-op timer used when no observer is attached."""
+
+    enabled = False
+
+    def __init__(self) -> None:
+        pass
+
+    def restart(self) -> None:
+        pass
+
+    def lap(self, stage: Stage, *, rows: int | None = None, size_bytes: int | None = None) -> None:
+        pass
+
+
+NULL_TIMER: StageTimer = _NullTimer()
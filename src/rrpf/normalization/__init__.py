@@ -1,3 +1,22 @@
-from .canonicalize import canonicalize_request
+from .batch import canonicalize_many, digest_many
+from .canonicalize import (
+    CANONICAL_CACHE_SIZE,
+    canonical_request_content_json,
+    canonical_request_json,
+    canonicalization_cache_stats,
+    canonicalize_request,
+    canonicalize_request_content,
+    clear_canonicalization_cache,
+)
 
-__all__ = ["canonicalize_request"]
+__all__ = [
+    "CANONICAL_CACHE_SIZE",
+    "canonical_request_content_json",
+    "canonical_request_json",
+    "canonicalization_cache_stats",
+    "canonicalize_many",
+    "canonicalize_request",
+    "canonicalize_request_content",
+    "clear_canonicalization_cache",
+    "digest_many",
+]
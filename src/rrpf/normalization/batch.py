@@ -0,0 +1,127 @@
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from itertools import chain, islice
+from typing import Any, TypeVar
+
+from rrpf.hashing.canonical_binary import CanonicalEncoding, canonical_digest
+from rrpf.hashing.digest import compute_digest
+from rrpf.schemas.common import Digest
+from rrpf.schemas.request import RRPRequest
+
+from .canonicalize import canonical_request_json, canonicalize_request
+
+T = TypeVar("T")
+
+# Chunks per worker process that may be queued ahead of the oldest result.
+_WINDOW_PER_WORKER = 4
+
+
+def canonicalize_many(
+    requests: Iterable[RRPRequest],
+    *,
+    workers: int = 1,
+    parallel_threshold: int = 10_000,
+    chunk_size: int = 1_000,
+) -> list[Mapping[str, Any]]:
+    """
+    canonicalize_request for many requests, in input order.
+
+    Sub-structures shared across the batch are canonicalized once (see
+    canonicalization_cache_stats). With workers > 1, batches of at least
+    parallel_threshold requests are split into chunk_size-request chunks
+    and spread over that many worker processes.
+    """
+    return _map_chunked(
+        _canonicalize_chunk,
+        requests,
+        workers=workers,
+        parallel_threshold=parallel_threshold,
+        chunk_size=chunk_size,
+    )
+
+
+def digest_many(
+    requests: Iterable[RRPRequest],
+    *,
+    algorithm: str | None = None,
+    encoding: CanonicalEncoding = "json",
+    workers: int = 1,
+    parallel_threshold: int = 10_000,
+    chunk_size: int = 1_000,
+) -> list[Digest]:
+    """
+    Digests of many requests, in input order.
+
+    Each digest equals compute_digest(to_canonical_json(canonicalize_request(r)))
+    (or canonical_digest with the given algorithm and encoding), but canonical
+    JSON is spliced from sub-forms cached across the batch and encoded with
+    one shared encoder. workers, parallel_threshold and chunk_size work as in
+    canonicalize_many.
+    """
+    return _map_chunked(
+        partial(_digest_chunk, algorithm=algorithm, encoding=encoding),
+        requests,
+        workers=workers,
+        parallel_threshold=parallel_threshold,
+        chunk_size=chunk_size,
+    )
+
+
+def _canonicalize_chunk(requests: list[RRPRequest]) -> list[Mapping[str, Any]]:
+    return [canonicalize_request(request) for request in requests]
+
+
+def _digest_chunk(
+    requests: list[RRPRequest], *, algorithm: str | None, encoding: CanonicalEncoding
+) -> list[Digest]:
+    if encoding == "json":
+        return [
+            compute_digest(canonical_request_json(request), algorithm=algorithm)
+            for request in requests
+        ]
+    return [
+        canonical_digest(canonicalize_request(request), encoding=encoding, algorithm=algorithm)
+        for request in requests
+    ]
+
+
+def _map_chunked(
+    fn: Callable[[list[RRPRequest]], list[T]],
+    requests: Iterable[RRPRequest],
+    *,
+    workers: int,
+    parallel_threshold: int,
+    chunk_size: int,
+) -> list[T]:
+    if workers <= 0:
+        raise ValueError("workers must be > 0")
+    if parallel_threshold < 0:
+        raise ValueError("parallel_threshold must be >= 0")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be > 0")
+
+    # Look ahead only as far as needed to decide; the rest stays lazy.
+    iterator = iter(requests)
+    head = list(islice(iterator, parallel_threshold))
+    if workers == 1 or len(head) < parallel_threshold:
+        return fn([*head, *iterator])
+
+    results: list[T] = []
+    pending: deque[Future[list[T]]] = deque()
+    window = workers * _WINDOW_PER_WORKER
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in _chunks(chain(head, iterator), chunk_size):
+            pending.append(pool.submit(fn, chunk))
+            while len(pending) >= window:
+                results.extend(pending.popleft().result())
+        while pending:
+            results.extend(pending.popleft().result())
+    return results
+
+
+def _chunks(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
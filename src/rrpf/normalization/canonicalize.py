@@ -1,8 +1,11 @@
 from collections.abc import Mapping
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from enum import Enum
+from functools import lru_cache
 from typing import Any, cast
 
+from rrpf.hashing.streaming import encode_json
 from rrpf.schemas import (
     AsOf,
     Constraints,
@@ -13,9 +16,22 @@ from rrpf.schemas import (
     TableRequest,
 )
 from rrpf.schemas.as_of import AsOfMode
+from rrpf.storage.stats import CacheStats
 
 from .sorting import stable_sorted
 
+# Entries per memoized sub-form kind. Traffic reuses a small set of table,
+# event, intent and constraints shapes, so this is plenty.
+CANONICAL_CACHE_SIZE = 4096
+
+
+@dataclass(frozen=True)
+class _Fragment:
+    """A canonical sub-form and its canonical JSON, shared between requests."""
+
+    form: Any
+    json: str
+
 
 def canonicalize_request(request: RRPRequest) -> Mapping[str, Any]:
     """
@@ -24,57 +40,119 @@ def canonicalize_request(request: RRPRequest) -> Mapping[str, Any]:
     return cast(Mapping[str, Any], _to_canonical_dict(request))
 
 
+def canonical_request_json(request: RRPRequest) -> str:
+    """
+    Canonical JSON of a request, equal to
+    to_canonical_json(canonicalize_request(request)). Sub-forms shared with
+    earlier requests are spliced in from cache instead of re-serialized.
+    """
+    return "".join(
+        (
+            '{"as_of":',
+            _as_of_fragment(request.as_of).json,
+            ',"constraints":',
+            _constraints_fragment(request.constraints).json,
+            ',"correlation_id":',
+            encode_json(request.correlation_id),
+            ',"data":',
+            _data_json(request.data),
+            ',"intent":',
+            _intent_fragment(request.intent).json,
+            ',"request_id":',
+            encode_json(request.request_id),
+            ',"requested_at":',
+            _datetime_fragment(request.requested_at).json,
+            ',"rrp_version":',
+            encode_json(request.rrp_version),
+            "}",
+        )
+    )
+
+
+def canonicalize_request_content(request: RRPRequest) -> Mapping[str, Any]:
+    """
+    Canonical mapping of what a request asks for: intent, as_of, constraints
+    and data. Envelope fields (version, ids, requested_at) are excluded, so
+    logically identical requests share one content digest.
+    """
+    return {
+        "intent": _to_canonical_dict(request.intent),
+        "as_of": dict(_as_of_fragment(request.as_of).form),
+        "constraints": _to_canonical_dict(request.constraints),
+        "data": _to_canonical_dict(request.data),
+    }
+
+
+def canonical_request_content_json(request: RRPRequest) -> str:
+    """
+    Canonical JSON of canonicalize_request_content(request), spliced from
+    cached fragments like canonical_request_json.
+    """
+    return "".join(
+        (
+            '{"as_of":',
+            _as_of_fragment(request.as_of).json,
+            ',"constraints":',
+            _constraints_fragment(request.constraints).json,
+            ',"data":',
+            _data_json(request.data),
+            ',"intent":',
+            _intent_fragment(request.intent).json,
+            "}",
+        )
+    )
+
+
+def canonicalization_cache_stats() -> dict[str, CacheStats]:
+    """Hit/miss/eviction counters of each memoized sub-form kind."""
+    stats: dict[str, CacheStats] = {}
+    for kind, memo in _MEMOS.items():
+        info = memo.cache_info()
+        stats[kind] = CacheStats(
+            hits=info.hits,
+            misses=info.misses,
+            # Every miss adds an entry; only eviction removes one.
+            evictions=info.misses - info.currsize,
+        )
+    return stats
+
+
+def clear_canonicalization_cache() -> None:
+    """Drop all memoized sub-forms and reset their counters."""
+    for memo in _MEMOS.values():
+        memo.cache_clear()
+
+
 def _to_canonical_dict(obj: Any) -> Any:
     if isinstance(obj, RRPRequest):
         return {
             "rrp_version": obj.rrp_version,
             "request_id": obj.request_id,
             "correlation_id": obj.correlation_id,
-            "requested_at": _canonicalize_datetime(obj.requested_at),
+            "requested_at": _datetime_fragment(obj.requested_at).form,
             "intent": _to_canonical_dict(obj.intent),
-            "as_of": _canonicalize_as_of(obj.as_of),
+            "as_of": dict(_as_of_fragment(obj.as_of).form),
             "constraints": _to_canonical_dict(obj.constraints),
             "data": _to_canonical_dict(obj.data),
         }
     elif isinstance(obj, Intent):
-        return {
-            "name": obj.name,
-            "mode": obj.mode.value,
-        }
+        return dict(_intent_fragment(obj).form)
     elif isinstance(obj, Constraints):
-        return {
-            "max_total_rows": obj.max_total_rows,
-            "max_groups": obj.max_groups,
-            "fail_on_partial": obj.fail_on_partial,
-        }
+        return dict(_constraints_fragment(obj).form)
     elif isinstance(obj, DataRequests):
+        tables, events = _sorted_fragments(obj)
         return {
-            "tables": [
-                _to_canonical_dict(t)
-                for t in stable_sorted(obj.tables, key=lambda x: x.table)
-            ],
-            "events": [
-                _to_canonical_dict(e)
-                for e in stable_sorted(obj.events, key=lambda x: ",".join(sorted(x.types)))
-            ],
+            "tables": [_copy_form(t.form) for t in tables],
+            "events": [_copy_form(e.form) for e in events],
         }
     elif isinstance(obj, TableRequest):
-        return {
-            "table": obj.table,
-            "fields": sorted(obj.fields),
-            "limit": obj.limit,
-            "derived": sorted(obj.derived) if obj.derived else None,
-        }
+        return _copy_form(_table_fragment(obj).form)
     elif isinstance(obj, EventRequest):
-        return {
-            "types": sorted(obj.types),
-            "fields": sorted(obj.fields),
-            "limit": obj.limit,
-        }
+        return _copy_form(_event_fragment(obj).form)
     elif isinstance(obj, Enum):
         return obj.value
     elif isinstance(obj, datetime):
-        return _canonicalize_datetime(obj)
+        return _datetime_fragment(obj).form
     elif obj is None:
         return None
     elif isinstance(obj, (str, int, float, bool)):
@@ -104,3 +182,152 @@ def _canonicalize_as_of(as_of: AsOf) -> Mapping[str, Any]:
         }
     else:
         raise ValueError(f"Unknown AsOf mode: {as_of.mode}")
+
+
+# Memoized sub-forms. Each is keyed on the hashable fields of its frozen
+# dataclass, with sequences as tuples. typed=True keeps e.g. limit=1,
+# limit=1.0 and limit=True apart, since they serialize differently.
+
+
+def _table_fragment(table: TableRequest) -> _Fragment:
+    return _table_memo(
+        table.table,
+        tuple(table.fields),
+        table.limit,
+        tuple(table.derived) if table.derived is not None else None,
+    )
+
+
+@lru_cache(maxsize=CANONICAL_CACHE_SIZE, typed=True)
+def _table_memo(
+    table: str, fields: tuple[str, ...], limit: int, derived: tuple[str, ...] | None
+) -> _Fragment:
+    return _fragment(
+        {
+            "table": table,
+            "fields": sorted(fields),
+            "limit": limit,
+            "derived": sorted(derived) if derived else None,
+        }
+    )
+
+
+def _event_fragment(event: EventRequest) -> _Fragment:
+    return _event_memo(tuple(event.types), tuple(event.fields), event.limit)
+
+
+@lru_cache(maxsize=CANONICAL_CACHE_SIZE, typed=True)
+def _event_memo(types: tuple[str, ...], fields: tuple[str, ...], limit: int) -> _Fragment:
+    return _fragment(
+        {
+            "types": sorted(types),
+            "fields": sorted(fields),
+            "limit": limit,
+        }
+    )
+
+
+def _intent_fragment(intent: Intent) -> _Fragment:
+    return _intent_memo(intent.name, intent.mode.value)
+
+
+@lru_cache(maxsize=CANONICAL_CACHE_SIZE, typed=True)
+def _intent_memo(name: str, mode: str) -> _Fragment:
+    return _fragment({"name": name, "mode": mode})
+
+
+def _constraints_fragment(constraints: Constraints) -> _Fragment:
+    return _constraints_memo(
+        constraints.max_total_rows,
+        constraints.max_groups,
+        constraints.fail_on_partial,
+        constraints.deadline_ms,
+        constraints.section_digests,
+    )
+
+
+@lru_cache(maxsize=CANONICAL_CACHE_SIZE, typed=True)
+def _constraints_memo(
+    max_total_rows: int,
+    max_groups: int,
+    fail_on_partial: bool,
+    deadline_ms: int | None,
+    section_digests: bool,
+) -> _Fragment:
+    constraints: dict[str, Any] = {
+        "max_total_rows": max_total_rows,
+        "max_groups": max_groups,
+        "fail_on_partial": fail_on_partial,
+    }
+    # Only present when set, so digests of requests without a deadline
+    # are unchanged.
+    if deadline_ms is not None:
+        constraints["deadline_ms"] = deadline_ms
+    # Likewise only present when digests are turned off.
+    if not section_digests:
+        constraints["section_digests"] = False
+    return _fragment(constraints)
+
+
+def _as_of_fragment(as_of: AsOf) -> _Fragment:
+    # Keyed on fold for the same reason as _datetime_fragment.
+    timestamp = as_of.timestamp
+    return _as_of_memo(as_of.mode, timestamp, timestamp.fold if timestamp is not None else 0)
+
+
+@lru_cache(maxsize=CANONICAL_CACHE_SIZE, typed=True)
+def _as_of_memo(mode: AsOfMode, timestamp: datetime | None, fold: int) -> _Fragment:
+    return _fragment(_canonicalize_as_of(AsOf(mode=mode, timestamp=timestamp)))
+
+
+def _datetime_fragment(dt: datetime) -> _Fragment:
+    # Datetimes differing only in fold compare equal, but may not be the
+    # same instant.
+    return _datetime_memo(dt, dt.fold)
+
+
+@lru_cache(maxsize=CANONICAL_CACHE_SIZE, typed=True)
+def _datetime_memo(dt: datetime, fold: int) -> _Fragment:
+    return _fragment(_canonicalize_datetime(dt))
+
+
+_MEMOS: dict[str, Any] = {
+    "table": _table_memo,
+    "event": _event_memo,
+    "intent": _intent_memo,
+    "constraints": _constraints_memo,
+    "as_of": _as_of_memo,
+    "datetime": _datetime_memo,
+}
+
+
+def _fragment(form: Any) -> _Fragment:
+    return _Fragment(form=form, json=encode_json(form))
+
+
+def _copy_form(form: Mapping[str, Any]) -> dict[str, Any]:
+    """Copy of a cached sub-form, so callers may mutate what they get."""
+    return {key: list(value) if isinstance(value, list) else value for key, value in form.items()}
+
+
+def _sorted_fragments(data: DataRequests) -> tuple[list[_Fragment], list[_Fragment]]:
+    tables = stable_sorted(
+        (_table_fragment(t) for t in data.tables), key=lambda x: cast(str, x.form["table"])
+    )
+    events = stable_sorted(
+        (_event_fragment(e) for e in data.events), key=lambda x: ",".join(x.form["types"])
+    )
+    return tables, events
+
+
+def _data_json(data: DataRequests) -> str:
+    tables, events = _sorted_fragments(data)
+    return "".join(
+        (
+            '{"events":[',
+            ",".join(e.json for e in events),
+            '],"tables":[',
+            ",".join(t.json for t in tables),
+            "]}",
+        )
+    )
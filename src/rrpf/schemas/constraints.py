@@ -6,3 +6,9 @@ class Constraints:
     max_total_rows: int
     max_groups: int
     fail_on_partial: bool
+    # Optional fulfillment time budget; sections not done in time are reported
+    # as deadline_exceeded. Omitted from canonical form when None.
+    deadline_ms: int | None = None
+    # Whether provenance records section digests and their Merkle root.
+    # Omitted from canonical form when True.
+    section_digests: bool = True
@@ -1,4 +1,4 @@
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -15,3 +15,10 @@ class Provenance:
     fulfilled_at: datetime
     inputs_digest: Digest
     query_stats: Mapping[str, QueryStats]
+    # Content digests of the returned data (see rrpf.hashing.merkle);
+    # None for responses that predate them, or whose data holds values
+    # canonical JSON cannot encode.
+    section_digests: Mapping[str, Digest] | None = None
+    merkle_root: Digest | None = None
+    chunk_rows: int | None = None
+    chunk_digests: Mapping[str, Sequence[Digest]] | None = None
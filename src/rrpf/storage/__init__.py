@@ -1,11 +1,39 @@
 from .filesystem_store import FilesystemPayloadStore
 from .memory_store import MemoryPayloadStore
-from .payload_store import PayloadStore
-from .replay import replay_from_store
+from .migration import MigrationStats, migrate_to_sharded
+from .payload_reader import PayloadReader
+from .payload_store import BatchPayloadStore, PayloadStore, load_many, store_many
+from .replay import replay_from_store, replay_many_from_store
+from .scrub import ScrubIssue, ScrubReport, scrub_store
+from .segment_store import SegmentLocation, SegmentPayloadStore
+from .serialization import decode_response, encode_response
+from .sqlite_store import PayloadMetadata, SQLitePayloadStore
+from .stats import CacheStats, CompressionStats, TieredStats
+from .tiered_store import TieredPayloadStore
 
 __all__ = [
+    "BatchPayloadStore",
+    "CacheStats",
+    "CompressionStats",
     "FilesystemPayloadStore",
     "MemoryPayloadStore",
+    "MigrationStats",
+    "PayloadMetadata",
+    "PayloadReader",
     "PayloadStore",
+    "ScrubIssue",
+    "ScrubReport",
+    "SegmentLocation",
+    "SegmentPayloadStore",
+    "SQLitePayloadStore",
+    "TieredPayloadStore",
+    "TieredStats",
+    "decode_response",
+    "encode_response",
+    "load_many",
+    "migrate_to_sharded",
     "replay_from_store",
+    "replay_many_from_store",
+    "scrub_store",
+    "store_many",
 ]
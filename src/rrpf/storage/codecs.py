@@ -0,0 +1,128 @@
+import bz2
+import gzip
+import lzma
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Protocol
+
+from rrpf.hashing.streaming import ByteSink
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes, /) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+@dataclass(frozen=True)
+class Codec:
+    """
+    A byte-level payload codec. Encoded payloads start with `magic`,
+    which is how decode_payload recognizes them. `compressor` returns an
+    incremental compressor producing the same format as `compress`.
+    """
+
+    name: str
+    magic: bytes
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[bytes], bytes]
+    compressor: Callable[[], Compressor]
+
+
+CODECS: dict[str, Codec] = {
+    "zlib": Codec(
+        name="zlib",
+        # zlib streams start with 0x78 for the default 32K window; canonical
+        # JSON always starts with "{" and canonical binary with 0xd9, so
+        # they never collide.
+        magic=b"\x78",
+        compress=lambda raw: zlib.compress(raw, 6),
+        decompress=zlib.decompress,
+        compressor=lambda: zlib.compressobj(6),
+    ),
+    "gzip": Codec(
+        name="gzip",
+        magic=b"\x1f\x8b",
+        # mtime=0 keeps the output deterministic for identical payloads.
+        compress=lambda raw: gzip.compress(raw, compresslevel=6, mtime=0),
+        decompress=gzip.decompress,
+        # wbits=31 writes a gzip container with a zero mtime, like the above.
+        compressor=lambda: zlib.compressobj(6, zlib.DEFLATED, 31),
+    ),
+    "lzma": Codec(
+        name="lzma",
+        magic=b"\xfd7zXZ\x00",
+        compress=lambda raw: lzma.compress(raw, format=lzma.FORMAT_XZ),
+        decompress=lzma.decompress,
+        compressor=lambda: lzma.LZMACompressor(format=lzma.FORMAT_XZ),
+    ),
+    "bz2": Codec(
+        name="bz2",
+        magic=b"BZh",
+        compress=lambda raw: bz2.compress(raw, 9),
+        decompress=bz2.decompress,
+        compressor=lambda: bz2.BZ2Compressor(9),
+    ),
+}
+
+
+def get_codec(name: str | None) -> Codec | None:
+    """
+    Resolve a codec by name; None or "none" means uncompressed.
+    Raises ValueError for unknown names.
+    """
+    if name is None or name == "none":
+        return None
+    try:
+        return CODECS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown codec {name!r}; expected one of: none, {', '.join(CODECS)}"
+        ) from None
+
+
+def encode_payload(raw: bytes, codec: Codec | None) -> bytes:
+    return raw if codec is None else codec.compress(raw)
+
+
+class EncodingWriter:
+    """
+    Byte sink that compresses with `codec` (if any) into `file`, counting
+    raw and stored bytes. Call finish() after the last write.
+    """
+
+    def __init__(self, file: ByteSink, codec: Codec | None) -> None:
+        self.file = file
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+        self._compressor = codec.compressor() if codec is not None else None
+
+    def write(self, data: bytes, /) -> None:
+        self.raw_bytes += len(data)
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+        self.stored_bytes += len(data)
+        self.file.write(data)
+
+    def finish(self) -> None:
+        if self._compressor is not None:
+            tail = self._compressor.flush()
+            self.stored_bytes += len(tail)
+            self.file.write(tail)
+
+
+def decompress_payload(stored: bytes) -> bytes:
+    """
+    Decompress a stored payload, detecting the codec from its leading bytes.
+    Uncompressed payloads are returned as is.
+    """
+    for codec in CODECS.values():
+        if stored.startswith(codec.magic):
+            return codec.decompress(stored)
+    return stored
+
+
+def decode_payload(stored: bytes) -> str:
+    """Decompress a stored canonical JSON payload and decode it to text."""
+    return decompress_payload(stored).decode("utf-8")
@@ -1,64 +1,193 @@
+import io
 import json
+import mmap
 import shutil
 import tempfile
-from datetime import datetime
+import threading
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, cast
+from typing import IO, Any
 
-from rrpf.hashing.canonical_json import to_canonical_json
-from rrpf.schemas.common import Digest, RequestID
-from rrpf.schemas.errors import RRPError
-from rrpf.schemas.provenance import Provenance, QueryStats
+from rrpf.hashing.canonical_binary import CanonicalEncoding, encode_canonical_binary
+from rrpf.hashing.digest import same_digest
+from rrpf.schemas.common import Digest
 from rrpf.schemas.response import RRPResponse
+from rrpf.storage.codecs import EncodingWriter, decompress_payload, get_codec
+from rrpf.storage.layout import file_stem, sharded_path
+from rrpf.storage.payload_reader import (
+    PayloadReader,
+    index_payload,
+    read_head,
+    write_indexed_payload,
+)
+from rrpf.storage.serialization import (
+    check_encoding,
+    decode_response,
+    deserialize_response,
+    parse_payload,
+    serialize_response,
+)
+from rrpf.storage.stats import CompressionStats
 
 
 class FilesystemPayloadStore:
     """
     Filesystem-backed implementation of PayloadStore.
     Persists responses as digest-addressed JSON files.
+
+    With shard_depth > 0, files are fanned out into nested directories named
+    after successive shard_width-character prefixes of the digest, e.g.
+    ab/cd/<digest>.json for depth 2 and width 2. Loads fall back to the flat
+    <digest>.json layout, so a store can be read while it is being migrated
+    (see migrate_to_sharded).
+
+    codec selects compression for new payloads ("none", "zlib", "gzip",
+    "lzma" or "bz2"). Compressed files keep the <digest>.json name; load
+    detects the codec from the file's leading bytes, so stores may mix
+    codecs and older uncompressed files remain readable.
+
+    store_many and load_many spread file I/O over up to io_workers threads.
+
+    Digests may be bare SHA-256 or algorithm-tagged ("blake2b:<hex>"); a
+    tagged digest is stored as <algorithm>-<hex>.json and sharded on its hex
+    part, and "sha256:<hex>" resolves to the same file as "<hex>".
+
+    open_payload decodes the response metadata up front and each data
+    section, or slice of its rows, only when it is read, using an index of
+    section byte ranges. By default the index is built on each open_payload
+    by scanning the payload's bytes once, without decoding them. With
+    index_sections=True it is kept in a small <digest>.idx sidecar, written
+    on store or on the first open_payload, at the cost of a second file per
+    payload.
+
+    encoding="binary" writes new payloads in the canonical binary encoding
+    (see rrpf.hashing.canonical_binary) instead of canonical JSON. Binary
+    payloads are smaller but get no sidecar; open_payload decodes them in
+    full. Loads recognize either encoding, so a store may hold both.
     """
 
-    def __init__(self, root: str) -> None:
+    def __init__(
+        self,
+        root: str,
+        *,
+        shard_depth: int = 0,
+        shard_width: int = 2,
+        codec: str = "none",
+        io_workers: int = 8,
+        encoding: CanonicalEncoding = "json",
+        index_sections: bool = False,
+    ) -> None:
+        if shard_depth < 0:
+            raise ValueError("shard_depth must be >= 0")
+        if shard_width <= 0:
+            raise ValueError("shard_width must be > 0")
+        if io_workers <= 0:
+            raise ValueError("io_workers must be > 0")
+        check_encoding(encoding)
         self.root = Path(root)
+        self.shard_depth = shard_depth
+        self.shard_width = shard_width
+        self.codec = get_codec(codec)
+        self.io_workers = io_workers
+        self.encoding = encoding
+        self.index_sections = index_sections
         self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._payloads = 0
+        self._raw_bytes = 0
+        self._stored_bytes = 0
 
     def store(self, *, digest: Digest, response: RRPResponse) -> None:
         """
         Persist the response to a file named <digest>.json.
         Writes atomically via a temporary file.
         """
-        path = self.root / f"{digest}.json"
+        path = self._path_for(digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
 
         # Serialize to dict first
-        data = _serialize_response(response)
-        # Use canonical JSON for deterministic formatting
-        content = to_canonical_json(data)
-
-        # Atomic write
-        with tempfile.NamedTemporaryFile(
-            mode="w", dir=str(self.root), delete=False, encoding="utf-8"
-        ) as tmp:
-            tmp.write(content)
+        data = serialize_response(response)
+
+        # Atomic write. Canonical JSON is streamed through the codec into
+        # the file, so the encoded payload is never held in memory; binary
+        # payloads are encoded up front.
+        # A value that cannot be encoded only surfaces mid-stream, so the
+        # partial temporary file is removed before the error propagates.
+        index: dict[str, Any] | None = None
+        with tempfile.NamedTemporaryFile(dir=str(path.parent), delete=False) as tmp:
             tmp_path = Path(tmp.name)
+            try:
+                writer = EncodingWriter(tmp, self.codec)
+                if self.encoding == "binary":
+                    writer.write(encode_canonical_binary(data))
+                else:
+                    index = write_indexed_payload(data, writer)
+                writer.finish()
+            except BaseException:
+                tmp.close()
+                tmp_path.unlink(missing_ok=True)
+                raise
+
+        try:
+            shutil.move(str(tmp_path), str(path))
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        # The sidecar follows the payload; open_payload rejects an index
+        # that does not match the payload it finds.
+        if index is not None and self.index_sections:
+            _write_index(path.with_suffix(".idx"), index)
 
-        shutil.move(str(tmp_path), str(path))
+        with self._lock:
+            self._payloads += 1
+            self._raw_bytes += writer.raw_bytes
+            self._stored_bytes += writer.stored_bytes
+
+    def store_many(self, *, items: Iterable[tuple[Digest, RRPResponse]]) -> None:
+        """
+        Persist many responses, writing files in parallel.
+        """
+        batch = list(items)
+        if len(batch) <= 1 or self.io_workers == 1:
+            for digest, response in batch:
+                self.store(digest=digest, response=response)
+            return
+        with ThreadPoolExecutor(max_workers=min(self.io_workers, len(batch))) as pool:
+            # Consume the results so the first failure is raised here.
+            list(pool.map(lambda item: self.store(digest=item[0], response=item[1]), batch))
+
+    def load_many(self, *, digests: Sequence[Digest]) -> list[RRPResponse]:
+        """
+        Load many responses in order, reading files in parallel.
+        """
+        if len(digests) <= 1 or self.io_workers == 1:
+            return [self.load(digest=digest) for digest in digests]
+        with ThreadPoolExecutor(max_workers=min(self.io_workers, len(digests))) as pool:
+            return list(pool.map(lambda digest: self.load(digest=digest), digests))
+
+    def compression_stats(self) -> CompressionStats:
+        """Raw vs. stored bytes for payloads written through this instance."""
+        with self._lock:
+            return CompressionStats(
+                payloads=self._payloads,
+                raw_bytes=self._raw_bytes,
+                stored_bytes=self._stored_bytes,
+            )
 
     def load(self, *, digest: Digest) -> RRPResponse:
         """
         Load response from <digest>.json.
         """
-        path = self.root / f"{digest}.json"
-        if not path.exists():
+        content = self._read(digest)
+        if content is None:
             raise KeyError(f"Payload not found: {digest}")
 
-        with path.open("r", encoding="utf-8") as f:
-            content = f.read()
-
-        data = json.loads(content)
-        response = _deserialize_response(data)
+        response = decode_response(content)
 
         # Verify integrity
-        if response.provenance.inputs_digest != digest:
+        if not same_digest(response.provenance.inputs_digest, digest):
             # If the stored file corresponds to a different digest than requested,
             # that's a serious integrity issue or misuse.
             # However, the user request says "inputs_digest must match filename digest".
@@ -71,62 +200,97 @@ class FilesystemPayloadStore:
 
         return response
 
+    def open_payload(self, *, digest: Digest) -> PayloadReader:
+        """
+        Open a payload for lazy, section-level reads.
+
+        Uncompressed payloads are memory-mapped and only the requested byte
+        ranges are decoded; compressed ones are decompressed but not parsed
+        up front. Without a usable sidecar, the index of a canonical JSON
+        payload is built by scanning its bytes, and with index_sections=True
+        it is then saved as the sidecar. Binary payloads, and JSON that is not
+        canonical, are decoded in full to rebuild the index in memory.
+        """
+        opened = self._open(digest)
+        if opened is None:
+            raise KeyError(f"Payload not found: {digest}")
+        f, path = opened
+        content: bytes | mmap.mmap
+        with f:
+            if f.read(1) == b"{":
+                content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                f.seek(0)
+                content = decompress_payload(f.read())
+
+        index_path = path.with_suffix(".idx")
+        index = _read_index(index_path) if self.index_sections else None
+        head = read_head(content, index) if index is not None else None
+        if head is None and content[:1] == b"{":
+            # Canonical JSON is indexed by scanning its bytes; anything else
+            # is decoded once and re-encoded to rebuild the index below.
+            index = index_payload(content)
+            if index is not None:
+                head = read_head(content, index)
+                if head is not None and self.index_sections:
+                    _write_index(index_path, index)
+        if index is None or head is None:
+            raw = bytes(content)
+            rebuilt = io.BytesIO()
+            index = write_indexed_payload(parse_payload(raw), rebuilt)
+            if isinstance(content, mmap.mmap):
+                content.close()
+            content = rebuilt.getvalue()
+            head = read_head(content, index)
+            assert head is not None
+
+        metadata = deserialize_response(head)
+        if not same_digest(metadata.provenance.inputs_digest, digest):
+            if isinstance(content, mmap.mmap):
+                content.close()
+            raise AssertionError(
+                f"Integrity check failed: stored digest {metadata.provenance.inputs_digest} "
+                f"does not match requested digest {digest}"
+            )
+        return PayloadReader(content, index, metadata=metadata)
+
+    def _path_for(self, digest: Digest) -> Path:
+        return sharded_path(self.root, digest, self.shard_depth, self.shard_width)
+
+    def _read(self, digest: Digest) -> bytes | None:
+        opened = self._open(digest)
+        if opened is None:
+            return None
+        with opened[0] as f:
+            return decompress_payload(f.read())
+
+    def _open(self, digest: Digest) -> tuple[IO[bytes], Path] | None:
+        path = self._path_for(digest)
+        flat = self.root / f"{file_stem(digest)}.json"
+        # Fall back to the flat layout for payloads not yet migrated. The
+        # sharded path is tried again in case a migration moved the file
+        # between the first two attempts.
+        candidates = [path] if flat == path else [path, flat, path]
+        for candidate in candidates:
+            try:
+                return candidate.open("rb"), candidate
+            except FileNotFoundError:
+                continue
+        return None
+
+
+def _write_index(path: Path, index: dict[str, Any]) -> None:
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=str(path.parent), delete=False
+    ) as tmp_index:
+        json.dump(index, tmp_index, separators=(",", ":"))
+    shutil.move(tmp_index.name, str(path))
+
 
-def _serialize_response(resp: RRPResponse) -> dict[str, Any]:
-    """Helper to serialize RRPResponse to a dict."""
-    return {
-        "ok": resp.ok,
-        "request_id": resp.request_id,
-        "as_of": resp.as_of,
-        "partial": resp.partial,
-        "data": dict(resp.data),
-        "errors": [
-            {"code": e.code, "message": e.message, "section": e.section}
-            for e in resp.errors
-        ],
-        "provenance": {
-            "fulfilled_at": resp.provenance.fulfilled_at.isoformat().replace("+00:00", "Z"),
-            "inputs_digest": resp.provenance.inputs_digest,
-            "query_stats": {
-                k: {"rows": v.rows, "groups": v.groups}
-                for k, v in resp.provenance.query_stats.items()
-            },
-        },
-    }
-
-
-def _deserialize_response(data: dict[str, Any]) -> RRPResponse:
-    """Helper to deserialize dict to RRPResponse."""
-    # Provenance
-    prov_data = data["provenance"]
-    stats: dict[str, QueryStats] = {}
-    for k, v in prov_data["query_stats"].items():
-        stats[k] = QueryStats(rows=v["rows"], groups=v["groups"])
-
-    # Handle timestamp: ISO format potentially with Z
-    ts_str = prov_data["fulfilled_at"]
-    if ts_str.endswith("Z"):
-        ts_str = ts_str[:-1] + "+00:00"
-    fulfilled_at = datetime.fromisoformat(ts_str)
-
-    provenance = Provenance(
-        fulfilled_at=fulfilled_at,
-        inputs_digest=cast(Digest, prov_data["inputs_digest"]),
-        query_stats=stats,
-    )
-
-    # Errors
-    errors = [
-        RRPError(code=e["code"], message=e["message"], section=e["section"])
-        for e in data["errors"]
-    ]
-
-    return RRPResponse(
-        ok=data["ok"],
-        request_id=cast(RequestID, data["request_id"]),
-        as_of=data["as_of"],
-        partial=data["partial"],
-        data=data["data"],
-        errors=errors,
-        provenance=provenance,
-    )
+def _read_index(path: Path) -> dict[str, Any] | None:
+    try:
+        with path.open("rb") as f:
+            index: dict[str, Any] = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    return index
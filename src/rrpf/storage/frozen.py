@@ -0,0 +1,145 @@
+import dataclasses
+from collections.abc import Mapping, Sequence
+from typing import Any, NoReturn
+
+from rrpf.schemas.response import RRPResponse
+
+
+def _immutable(self: object, *args: object, **kwargs: object) -> NoReturn:
+    raise TypeError(f"{type(self).__name__} is immutable")
+
+
+class FrozenDict(dict[str, Any]):
+    """
+    Read-only dict. Compares, iterates and serializes like a dict, but every
+    mutating method raises TypeError. Copies return the same object.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = _immutable
+    __delitem__ = _immutable
+    __ior__ = _immutable
+    clear = _immutable
+    pop = _immutable
+    popitem = _immutable
+    setdefault = _immutable
+    update = _immutable
+
+    def __copy__(self) -> "FrozenDict":
+        return self
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> "FrozenDict":
+        return self
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(list[Any]):
+    """
+    Read-only list, so payload rows keep comparing equal to plain lists.
+    Every mutating method raises TypeError. Copies return the same object.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = _immutable
+    __delitem__ = _immutable
+    __iadd__ = _immutable
+    __imul__ = _immutable
+    append = _immutable
+    clear = _immutable
+    extend = _immutable
+    insert = _immutable
+    pop = _immutable
+    remove = _immutable
+    reverse = _immutable
+    sort = _immutable
+
+    def __copy__(self) -> "FrozenList":
+        return self
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> "FrozenList":
+        return self
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (FrozenList, (list(self),))
+
+
+def freeze(value: Any) -> tuple[Any, int]:
+    """
+    Deeply freeze JSON-like data: mappings become FrozenDicts and sequences
+    (other than strings) FrozenLists. Returns the frozen value and an
+    approximate size in bytes of its JSON encoding.
+    """
+    if isinstance(value, FrozenDict | FrozenList):
+        return value, _approx_size(value)
+    if isinstance(value, Mapping):
+        items: dict[str, Any] = {}
+        size = 2
+        for key, item in value.items():
+            items[key], item_size = freeze(item)
+            size += len(key) + 4 + item_size
+        return FrozenDict(items), size
+    if isinstance(value, list | tuple):
+        frozen: list[Any] = []
+        size = 2
+        for item in value:
+            frozen_item, item_size = freeze(item)
+            frozen.append(frozen_item)
+            size += item_size + 1
+        return FrozenList(frozen), size
+    return value, _approx_size(value)
+
+
+def freeze_response(response: RRPResponse) -> RRPResponse:
+    """
+    Deeply frozen copy of a response.
+    """
+    data, _ = freeze(response.data)
+    provenance = response.provenance
+    section_digests = provenance.section_digests
+    if section_digests is not None:
+        section_digests = FrozenDict(section_digests)
+    chunk_digests = provenance.chunk_digests
+    if chunk_digests is not None:
+        chunk_digests = FrozenDict({k: FrozenList(v) for k, v in chunk_digests.items()})
+    return dataclasses.replace(
+        response,
+        data=data,
+        errors=FrozenList(response.errors),
+        provenance=dataclasses.replace(
+            provenance,
+            query_stats=FrozenDict(provenance.query_stats),
+            section_digests=section_digests,
+            chunk_digests=chunk_digests,
+        ),
+    )
+
+
+def response_size(response: RRPResponse) -> int:
+    """
+    Approximate size in bytes of a response's JSON encoding. Walks the data
+    without copying it.
+    """
+    provenance = response.provenance
+    digests = len(provenance.section_digests or ()) + sum(
+        len(v) for v in (provenance.chunk_digests or {}).values()
+    )
+    return (
+        _approx_size(response.data)
+        + 64 * (len(response.errors) + len(provenance.query_stats))
+        + 72 * digests
+        + 256
+    )
+
+
+def _approx_size(value: Any) -> int:
+    if isinstance(value, str):
+        return len(value) + 2
+    if isinstance(value, Mapping):
+        return 2 + sum(len(k) + 4 + _approx_size(v) for k, v in value.items())
+    if isinstance(value, Sequence):
+        return 2 + sum(_approx_size(v) + 1 for v in value)
+    return 8
@@ -0,0 +1,29 @@
+from pathlib import Path
+
+from rrpf.hashing.digest import normalize_digest, parse_digest
+from rrpf.schemas.common import Digest
+
+
+def sharded_path(root: Path, digest: str, depth: int, width: int) -> Path:
+    """Path of <digest>.json under `depth` levels of `width`-character prefixes."""
+    stem = file_stem(digest)
+    hexdigest = parse_digest(normalize_digest(digest))[1]
+    if len(hexdigest) < depth * width:
+        # Too short to shard; keep it flat rather than producing empty names.
+        return root / f"{stem}.json"
+    parts = [hexdigest[i * width : (i + 1) * width] for i in range(depth)]
+    return root.joinpath(*parts, f"{stem}.json")
+
+
+def file_stem(digest: str) -> str:
+    """
+    File name of a digest, without extension: its normalized form, with
+    ":" (not allowed in Windows file names) replaced by "-".
+    """
+    return normalize_digest(digest).replace(":", "-")
+
+
+def digest_from_stem(stem: str) -> Digest:
+    """Inverse of file_stem. Hex digests contain no "-", algorithm names may."""
+    algorithm, sep, hexdigest = stem.rpartition("-")
+    return Digest(f"{algorithm}:{hexdigest}" if sep else stem)
@@ -1,16 +1,73 @@
 import copy
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from itertools import chain
+from typing import Literal
 
+from rrpf.hashing.digest import normalize_digest
 from rrpf.schemas.common import Digest
 from rrpf.schemas.response import RRPResponse
+from rrpf.storage.frozen import freeze_response, response_size
+from rrpf.storage.stats import CacheStats
+
+EvictionPolicy = Literal["lru", "lfu"]
+
+
+class _Entry:
+    """A stored response, its frozen view once loaded, and its size once measured."""
+
+    __slots__ = ("response", "frozen", "size")
+
+    def __init__(self, response: RRPResponse, size: int | None) -> None:
+        self.response = response
+        self.frozen: RRPResponse | None = None
+        self.size = size
 
 
 class MemoryPayloadStore:
     """
     Reference in-memory implementation of PayloadStore.
+
+    store is a dict insert: the response is kept as given, so the caller
+    must not mutate it afterwards. The first load freezes a deep copy (see
+    rrpf.storage.frozen); every load then hands out a new shallow
+    RRPResponse over that shared, read-only data instead of deep-copying it.
+
+    The store is unbounded by default. With max_entries and/or max_bytes
+    (approximate JSON size), entries are evicted by least recent ("lru") or
+    least frequent ("lfu", ties broken by recency) use. The most recently
+    stored entry is always kept, even if it alone exceeds max_bytes. Only
+    with max_bytes is each payload measured when stored.
     """
 
-    def __init__(self) -> None:
-        self._store: dict[Digest, RRPResponse] = {}
+    def __init__(
+        self,
+        *,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        eviction: EvictionPolicy = "lru",
+    ) -> None:
+        if max_entries is not None and max_entries <= 0:
+            raise ValueError("max_entries must be > 0")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("max_bytes must be > 0")
+        if eviction not in ("lru", "lfu"):
+            raise ValueError(f"Unknown eviction policy: {eviction}")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.eviction = eviction
+
+        self._store: dict[Digest, _Entry] = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        # LRU: recency order. LFU: use count -> digests in recency order.
+        self._recency: OrderedDict[Digest, None] = OrderedDict()
+        self._uses: dict[Digest, int] = {}
+        self._by_uses: dict[int, OrderedDict[Digest, None]] = {}
 
     def store(self, *, digest: Digest, response: RRPResponse) -> None:
         """
@@ -20,15 +77,130 @@ class MemoryPayloadStore:
         # In a real immutable store, we might check if existing content matches.
         # For this reference, last-write-wins is acceptable as long as
         # the digest assumption holds (same digest = same content).
-        self._store[digest] = response
+        self.store_many(items=[(digest, response)])
+
+    def store_many(self, *, items: Iterable[tuple[Digest, RRPResponse]]) -> None:
+        """
+        Persist many responses under a single lock acquisition.
+        """
+        # Sizes are only needed up front to enforce max_bytes.
+        measure = self.max_bytes is not None
+        entries = [
+            (
+                normalize_digest(digest),
+                _Entry(response, response_size(response) if measure else None),
+            )
+            for digest, response in items
+        ]
+        with self._lock:
+            for digest, entry in entries:
+                previous = self._store.get(digest)
+                if previous is not None:
+                    self._bytes -= previous.size or 0
+                    self._touch(digest)
+                else:
+                    self._track(digest)
+                self._store[digest] = entry
+                self._bytes += entry.size or 0
+                self._evict(keep=digest)
 
     def load(self, *, digest: Digest) -> RRPResponse:
         """
         Load a previously stored response.
-        Returns a deep copy to prevent mutation of the store.
+        Returns a new response object over the stored, deeply frozen data.
         """
-        if digest not in self._store:
-            raise KeyError(f"Payload not found: {digest}")
+        return self.load_many(digests=[digest])[0]
+
+    def load_many(self, *, digests: Sequence[Digest]) -> list[RRPResponse]:
+        """
+        Load many responses, in order, under a single lock acquisition.
+        """
+        entries: list[_Entry] = []
+        with self._lock:
+            for digest in map(normalize_digest, digests):
+                entry = self._store.get(digest)
+                if entry is None:
+                    self._misses += 1
+                    raise KeyError(f"Payload not found: {digest}")
+                self._hits += 1
+                self._touch(digest)
+                entries.append(entry)
+
+        responses: list[RRPResponse] = []
+        for entry in entries:
+            frozen = entry.frozen
+            if frozen is None:
+                # Racing first loads may each freeze; the copies are equal.
+                frozen = entry.frozen = freeze_response(entry.response)
+            # Shallow copy: a distinct object, sharing the immutable data.
+            responses.append(copy.copy(frozen))
+        return responses
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(hits=self._hits, misses=self._misses, evictions=self._evictions)
+
+    @property
+    def size_bytes(self) -> int:
+        """Approximate size of all stored payloads, measuring any not yet measured."""
+        with self._lock:
+            for entry in self._store.values():
+                if entry.size is None:
+                    entry.size = response_size(entry.response)
+                    self._bytes += entry.size
+            return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def _over_capacity(self) -> bool:
+        return (self.max_entries is not None and len(self._store) > self.max_entries) or (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        )
+
+    def _evict(self, *, keep: Digest) -> None:
+        while len(self._store) > 1 and self._over_capacity():
+            victim = self._victim(keep)
+            self._untrack(victim)
+            self._bytes -= self._store.pop(victim).size or 0
+            self._evictions += 1
+
+    def _track(self, digest: Digest) -> None:
+        if self.eviction == "lru":
+            self._recency[digest] = None
+            return
+        self._uses[digest] = 1
+        self._by_uses.setdefault(1, OrderedDict())[digest] = None
+
+    def _touch(self, digest: Digest) -> None:
+        if self.eviction == "lru":
+            self._recency.move_to_end(digest)
+            return
+        uses = self._uses[digest]
+        bucket = self._by_uses[uses]
+        del bucket[digest]
+        if not bucket:
+            del self._by_uses[uses]
+        self._uses[digest] = uses + 1
+        self._by_uses.setdefault(uses + 1, OrderedDict())[digest] = None
+
+    def _untrack(self, digest: Digest) -> None:
+        if self.eviction == "lru":
+            del self._recency[digest]
+            return
+        uses = self._uses.pop(digest)
+        bucket = self._by_uses[uses]
+        del bucket[digest]
+        if not bucket:
+            del self._by_uses[uses]
 
-        # Return a copy to simulate loading from disk (new object)
-        return copy.deepcopy(self._store[digest])
+    def _victim(self, keep: Digest) -> Digest:
+        # The first candidate is the victim unless it is the entry just stored.
+        if self.eviction == "lru":
+            candidates: Iterable[Digest] = self._recency
+        else:
+            # Distinct use counts are few, so sorting the buckets is cheap.
+            candidates = chain.from_iterable(
+                self._by_uses[uses] for uses in sorted(self._by_uses)
+            )
+        return next(digest for digest in candidates if digest != keep)
@@ -0,0 +1,111 @@
+import argparse
+import os
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from rrpf.schemas.common import Digest
+from rrpf.storage.layout import digest_from_stem, sharded_path
+
+
+@dataclass(frozen=True)
+class MigrationStats:
+    """Outcome of a layout migration."""
+
+    moved: int
+    duplicates: int
+
+
+def migrate_to_sharded(
+    root: str,
+    *,
+    shard_depth: int = 2,
+    shard_width: int = 2,
+    on_moved: Callable[[Digest], None] | None = None,
+) -> MigrationStats:
+    """
+    Move a flat FilesystemPayloadStore (<digest>.json under root) into the
+    sharded layout in place.
+
+    Entries are streamed with os.scandir and moved one at a time with an
+    atomic rename, so memory use is constant and the store stays readable
+    throughout by a FilesystemPayloadStore configured with the target layout.
+    A flat file whose sharded copy already exists (written during the
+    migration) is removed, since equal digests mean equal content.
+    The migration is idempotent and can be resumed after an interruption.
+    """
+    if shard_depth <= 0:
+        raise ValueError("shard_depth must be > 0")
+    if shard_width <= 0:
+        raise ValueError("shard_width must be > 0")
+
+    base = Path(root)
+    moved = 0
+    duplicates = 0
+    with os.scandir(base) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".json") or not entry.is_file(follow_symlinks=False):
+                continue
+            stem = entry.name[: -len(".json")]
+            digest = digest_from_stem(stem)
+            target = sharded_path(base, digest, shard_depth, shard_width)
+            if target.parent == base:
+                continue
+
+            target.parent.mkdir(parents=True, exist_ok=True)
+            # Move the section index sidecar first so it is never left behind
+            # a moved payload; a payload read without it still loads.
+            _move_sidecar(base / f"{stem}.idx", target.with_suffix(".idx"))
+            if target.exists():
+                os.unlink(entry.path)
+                duplicates += 1
+                continue
+            os.replace(entry.path, target)
+            moved += 1
+            if on_moved is not None:
+                on_moved(digest)
+
+    return MigrationStats(moved=moved, duplicates=duplicates)
+
+
+def _move_sidecar(source: Path, target: Path) -> None:
+    try:
+        if target.exists():
+            os.unlink(source)
+        else:
+            os.replace(source, target)
+    except FileNotFoundError:
+        pass
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m rrpf.storage.migration",
+        description="Migrate a flat FilesystemPayloadStore into the sharded layout in place.",
+    )
+    parser.add_argument("root", help="store root directory")
+    parser.add_argument("--depth", type=int, default=2, help="shard directory levels")
+    parser.add_argument("--width", type=int, default=2, help="digest characters per level")
+    parser.add_argument(
+        "--progress-every", type=int, default=10_000, help="report after this many moves"
+    )
+    args = parser.parse_args(argv)
+
+    count = 0
+
+    def report(_: Digest) -> None:
+        nonlocal count
+        count += 1
+        if count % args.progress_every == 0:
+            print(f"moved {count} payloads", file=sys.stderr)
+
+    stats = migrate_to_sharded(
+        args.root, shard_depth=args.depth, shard_width=args.width, on_moved=report
+    )
+    print(f"moved {stats.moved} payloads, removed {stats.duplicates} duplicates")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,463 @@
+import hashlib
+import json
+import mmap
+import re
+import zlib
+from collections.abc import Iterator, Mapping
+from types import TracebackType
+from typing import Any
+
+from rrpf.hashing.streaming import (
+    CHUNK_SIZE,
+    ROW_BATCH,
+    ByteSink,
+    encode_json,
+    is_flat,
+    iter_json_pieces,
+)
+from rrpf.schemas.common import RequestID
+from rrpf.schemas.errors import RRPError
+from rrpf.schemas.provenance import Provenance
+from rrpf.schemas.response import RRPResponse
+
+# Sidecar layout, stored as <digest>.idx next to the payload. Offsets are
+# byte positions in the uncompressed canonical JSON:
+#   {"version": 1, "size": n, "head_crc": crc, "data": [start, end],
+#    "sections": {key: {"span": [start, end], "rows": [start, end] | null,
+#                       "row_count": n, "checkpoints": [offset, ...]}}}
+# "data" and "span" cover a JSON value; "rows" covers the inside of a section's
+# rows array, and checkpoints mark the first byte of every ROW_BATCH-th row.
+# size and head_crc (crc32 of every byte outside "data") tie the index to one
+# payload, so an index left over from a replaced payload is detected.
+INDEX_VERSION = 1
+
+
+def write_indexed_payload(data: Mapping[str, Any], sink: ByteSink) -> dict[str, Any]:
+    """
+    Stream a serialized response into sink as canonical JSON and return the
+    section index for it. The bytes written are identical to
+    write_canonical_json(data, sink).
+    """
+    out = _PositionedWriter(sink)
+    sections: dict[str, Any] = {}
+    data_span = [0, 0]
+
+    out.write("{")
+    for position, (key, value) in enumerate(sorted(data.items())):
+        if position:
+            out.write(",")
+        out.write(encode_json(key) + ":")
+        if key != "data":
+            out.write_value(value)
+            continue
+
+        data_span[0] = out.position
+        out.checksum = False
+        out.write("{")
+        for number, (section_key, section) in enumerate(sorted(value.items())):
+            if number:
+                out.write(",")
+            out.write(encode_json(section_key) + ":")
+            start = out.position
+            rows = _write_section(out, section)
+            sections[section_key] = {"span": [start, out.position], **rows}
+        out.write("}")
+        data_span[1] = out.position
+        out.checksum = True
+    out.write("}")
+    out.flush()
+
+    return {
+        "version": INDEX_VERSION,
+        "size": out.position,
+        "head_crc": out.crc,
+        "data": data_span,
+        "sections": sections,
+    }
+
+
+def index_payload(content: bytes | mmap.mmap) -> dict[str, Any] | None:
+    """
+    Build the section index of a stored canonical JSON payload in one scan
+    of its bytes, without decoding it. Returns the same index as
+    write_indexed_payload did when the payload was written, or None if
+    content is not laid out as canonical JSON; the caller then decodes the
+    payload and rebuilds it instead.
+    """
+    scan = _Scanner(content)
+    try:
+        return scan.payload()
+    except (_Unindexable, IndexError):
+        return None
+
+
+class PayloadReader:
+    """
+    Lazy, section-level view of a stored payload.
+
+    Response metadata, errors and provenance are decoded when the reader is
+    opened; `data` sections are decoded only when asked for, and rows of a
+    section can be iterated or sliced without decoding the rest of it.
+    Obtain one from FilesystemPayloadStore.open_payload and close it (or use
+    it as a context manager) when done.
+    """
+
+    def __init__(
+        self,
+        content: bytes | mmap.mmap,
+        index: Mapping[str, Any],
+        *,
+        metadata: RRPResponse,
+    ) -> None:
+        self._content = content
+        self._index = index
+        self.ok: bool = metadata.ok
+        self.request_id: RequestID = metadata.request_id
+        self.as_of: str = metadata.as_of
+        self.partial: bool = metadata.partial
+        self.errors: list[RRPError] = list(metadata.errors)
+        self.provenance: Provenance = metadata.provenance
+
+    @property
+    def sections(self) -> list[str]:
+        """Section keys present in `data`, in canonical order."""
+        return list(self._index["sections"])
+
+    def section(self, key: str) -> Any:
+        """Decode a single section."""
+        start, end = self._entry(key)["span"]
+        return json.loads(bytes(self._content[start:end]))
+
+    def verify_section(self, key: str) -> bool:
+        """
+        Check a section against its digest in provenance by hashing only its
+        stored bytes, which are its canonical JSON. Raises ValueError if the
+        payload predates section digests.
+        """
+        expected = self.provenance.section_digests
+        if expected is None:
+            raise ValueError("Payload has no section digests")
+        start, end = self._entry(key)["span"]
+        return hashlib.sha256(self._content[start:end]).hexdigest() == expected.get(key)
+
+    def row_count(self, key: str) -> int | None:
+        """Number of rows in a section, or None if it has no rows array."""
+        entry = self._entry(key)
+        return entry["row_count"] if entry["rows"] is not None else None
+
+    def iter_rows(
+        self, key: str, *, offset: int = 0, count: int | None = None
+    ) -> Iterator[Any]:
+        """
+        Yield rows offset .. offset + count (or to the end) of a section,
+        decoding them one batch of rows at a time.
+        """
+        if offset < 0:
+            raise ValueError("offset must be >= 0")
+        if count is not None and count < 0:
+            raise ValueError("count must be >= 0")
+        entry = self._entry(key)
+        if entry["rows"] is None:
+            raise ValueError(f"Section has no rows: {key}")
+
+        total = entry["row_count"]
+        stop = total if count is None else min(total, offset + count)
+        checkpoints: list[int] = entry["checkpoints"]
+        rows_end = entry["rows"][1]
+        first = offset // ROW_BATCH
+        for batch in range(first, len(checkpoints)):
+            batch_start = batch * ROW_BATCH
+            if batch_start >= stop:
+                return
+            start = checkpoints[batch]
+            # Each span but the last ends with the "," before the next batch.
+            end = checkpoints[batch + 1] - 1 if batch + 1 < len(checkpoints) else rows_end
+            rows = json.loads(b"[" + bytes(self._content[start:end]) + b"]")
+            yield from rows[max(offset - batch_start, 0) : stop - batch_start]
+
+    def rows(self, key: str, *, offset: int = 0, count: int | None = None) -> list[Any]:
+        """List form of iter_rows."""
+        return list(self.iter_rows(key, offset=offset, count=count))
+
+    def to_response(self) -> RRPResponse:
+        """Decode every section and return the full response."""
+        return RRPResponse(
+            ok=self.ok,
+            request_id=self.request_id,
+            as_of=self.as_of,
+            partial=self.partial,
+            data={key: self.section(key) for key in self.sections},
+            errors=list(self.errors),
+            provenance=self.provenance,
+        )
+
+    def close(self) -> None:
+        if isinstance(self._content, mmap.mmap):
+            self._content.close()
+
+    def __enter__(self) -> "PayloadReader":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _entry(self, key: str) -> Mapping[str, Any]:
+        entry: Mapping[str, Any] | None = self._index["sections"].get(key)
+        if entry is None:
+            raise KeyError(f"Section not found: {key}")
+        return entry
+
+
+def read_head(content: bytes | mmap.mmap, index: Mapping[str, Any]) -> dict[str, Any] | None:
+    """
+    Decode everything but the data sections, which come back as {}.
+    Returns None if the index does not describe this content.
+    """
+    if index.get("version") != INDEX_VERSION or index.get("size") != len(content):
+        return None
+    data_start, data_end = index["data"]
+    before = bytes(content[:data_start])
+    after = bytes(content[data_end:])
+    if zlib.crc32(after, zlib.crc32(before)) != index["head_crc"]:
+        return None
+    head: dict[str, Any] = json.loads(before + b"{}" + after)
+    return head
+
+
+class _PositionedWriter:
+    """Buffers UTF-8 output for a sink, tracking the byte position."""
+
+    def __init__(self, sink: ByteSink) -> None:
+        self.sink = sink
+        self.position = 0
+        self.checksum = True
+        self.crc = 0
+        self._buffer: list[bytes] = []
+        self._buffered = 0
+
+    def write(self, text: str) -> None:
+        encoded = text.encode("utf-8")
+        self._buffer.append(encoded)
+        self.position += len(encoded)
+        if self.checksum:
+            self.crc = zlib.crc32(encoded, self.crc)
+        self._buffered += len(encoded)
+        if self._buffered >= CHUNK_SIZE:
+            self.flush()
+
+    def write_value(self, value: Any) -> None:
+        for piece in iter_json_pieces(value):
+            self.write(piece)
+
+    def flush(self) -> None:
+        if self._buffer:
+            self.sink.write(b"".join(self._buffer))
+            self._buffer.clear()
+            self._buffered = 0
+
+
+def _write_section(out: _PositionedWriter, section: Any) -> dict[str, Any]:
+    """Write one section value, indexing its rows array if it has one."""
+    rows = section.get("rows") if isinstance(section, dict) else None
+    if not isinstance(rows, list) or not all(isinstance(key, str) for key in section):
+        out.write_value(section)
+        return {"rows": None, "row_count": 0, "checkpoints": []}
+
+    span = [0, 0]
+    checkpoints: list[int] = []
+    out.write("{")
+    for position, (key, value) in enumerate(sorted(section.items())):
+        if position:
+            out.write(",")
+        out.write(encode_json(key) + ":")
+        if key != "rows":
+            out.write_value(value)
+            continue
+
+        out.write("[")
+        span[0] = out.position
+        for start in range(0, len(rows), ROW_BATCH):
+            if start:
+                out.write(",")
+            checkpoints.append(out.position)
+            batch = rows[start : start + ROW_BATCH]
+            if all(is_flat(row) for row in batch):
+                out.write(encode_json(batch)[1:-1])
+                continue
+            for number, row in enumerate(batch):
+                if number:
+                    out.write(",")
+                out.write_value(row)
+        span[1] = out.position
+        out.write("]")
+    out.write("}")
+    return {"rows": span, "row_count": len(rows), "checkpoints": checkpoints}
+
+
+# Patterns for index_payload. A value nested at most _SHALLOW_DEPTH levels
+# deep is skipped by one regex match; possessive quantifiers keep failed
+# matches linear. Rows are skipped a whole batch at a time while they match.
+_SHALLOW_DEPTH = 4
+_STRING = rb'"(?:[^"\\]++|\\.)*+"'
+_SCALARS = rb"(?:" + _STRING + rb'|[^"{}\[\]]++)'
+
+
+def _container(member: bytes) -> bytes:
+    return rb"\{" + member + rb"*+\}|\[" + member + rb"*+\]"
+
+
+_MEMBER = _SCALARS
+for _ in range(_SHALLOW_DEPTH - 1):
+    _MEMBER = rb"(?:" + _SCALARS + rb"|" + _container(_MEMBER) + rb")"
+_SHALLOW = rb"(?:" + _container(_MEMBER) + rb"|" + _STRING + rb"|[-+.0-9A-Za-z]++)"
+_STRING_RE = re.compile(_STRING, re.DOTALL)
+_SHALLOW_RE = re.compile(_SHALLOW, re.DOTALL)
+_SHALLOW_BATCH_RE = re.compile(rb"(?:" + _SHALLOW + rb",){%d}" % ROW_BATCH, re.DOTALL)
+
+
+class _Unindexable(Exception):
+    """Raised by _Scanner when content is not compact canonical JSON."""
+
+
+class _Scanner:
+    """Walks canonical JSON bytes, recording the offsets the index needs."""
+
+    def __init__(self, content: bytes | mmap.mmap) -> None:
+        self.content = content
+        self.pos = 0
+
+    def payload(self) -> dict[str, Any]:
+        sections: dict[str, Any] = {}
+        data_span: list[int] | None = None
+        self.expect(b"{")
+        for key in self.keys():
+            if key != "data":
+                self.skip_value()
+                continue
+            data_span = [self.pos, 0]
+            self.expect(b"{")
+            for section_key in self.keys():
+                start = self.pos
+                rows = self.section()
+                sections[section_key] = {"span": [start, self.pos], **rows}
+            data_span[1] = self.pos
+        if data_span is None or self.pos != len(self.content):
+            raise _Unindexable
+
+        content = self.content
+        before = content[: data_span[0]]
+        after = content[data_span[1] :]
+        return {
+            "version": INDEX_VERSION,
+            "size": len(content),
+            "head_crc": zlib.crc32(after, zlib.crc32(before)),
+            "data": data_span,
+            "sections": sections,
+        }
+
+    def keys(self) -> Iterator[str]:
+        """
+        Yield the keys of the object just opened, leaving the position at
+        each value, and consume the closing brace.
+        """
+        if self.peek(b"}"):
+            return
+        while True:
+            match = _STRING_RE.match(self.content, self.pos)
+            if match is None:
+                raise _Unindexable
+            self.pos = match.end()
+            self.expect(b":")
+            yield json.loads(match.group())
+            if self.peek(b","):
+                continue
+            self.expect(b"}")
+            return
+
+    def section(self) -> dict[str, Any]:
+        """Skip one section value, indexing its rows array if it has one."""
+        entry: dict[str, Any] = {"rows": None, "row_count": 0, "checkpoints": []}
+        if self.content[self.pos] != ord("{"):
+            self.skip_value()
+            return entry
+        self.pos += 1
+        for key in self.keys():
+            if key == "rows" and self.content[self.pos] == ord("["):
+                self.pos += 1
+                entry = self.rows()
+            else:
+                self.skip_value()
+        return entry
+
+    def rows(self) -> dict[str, Any]:
+        """Skip the rows of an array just opened, checkpointing every batch."""
+        start = self.pos
+        checkpoints: list[int] = []
+        count = 0
+        if not self.peek(b"]"):
+            while True:
+                if count % ROW_BATCH == 0:
+                    checkpoints.append(self.pos)
+                    batch = _SHALLOW_BATCH_RE.match(self.content, self.pos)
+                    if batch is not None:
+                        self.pos = batch.end()
+                        count += ROW_BATCH
+                        continue
+                self.skip_value()
+                count += 1
+                if not self.peek(b","):
+                    break
+            self.expect(b"]")
+        end = self.pos - 1
+        return {"rows": [start, end], "row_count": count, "checkpoints": checkpoints}
+
+    def skip_value(self) -> None:
+        content = self.content
+        shallow = _SHALLOW_RE.match(content, self.pos)
+        if shallow is not None:
+            self.pos = shallow.end()
+            return
+        # Deeper values are walked one level at a time, skipping each
+        # shallow member with a single match.
+        opening = content[self.pos]
+        self.pos += 1
+        if opening == ord("{"):
+            close = b"}"
+            if self.peek(close):
+                return
+            while True:
+                key = _STRING_RE.match(content, self.pos)
+                if key is None:
+                    raise _Unindexable
+                self.pos = key.end()
+                self.expect(b":")
+                self.skip_value()
+                if not self.peek(b","):
+                    break
+        elif opening == ord("["):
+            close = b"]"
+            if self.peek(close):
+                return
+            while True:
+                self.skip_value()
+                if not self.peek(b","):
+                    break
+        else:
+            raise _Unindexable
+        self.expect(close)
+
+    def peek(self, char: bytes) -> bool:
+        """Consume char if it comes next."""
+        if self.content[self.pos : self.pos + 1] == char:
+            self.pos += 1
+            return True
+        return False
+
+    def expect(self, char: bytes) -> None:
+        if not self.peek(char):
+            raise _Unindexable
@@ -1,4 +1,5 @@
-from typing import Protocol
+from collections.abc import Iterable, Sequence
+from typing import Protocol, runtime_checkable
 
 from rrpf.schemas.common import Digest
 from rrpf.schemas.response import RRPResponse
@@ -23,3 +24,45 @@ class PayloadStore(Protocol):
         Must raise KeyError if missing.
         """
         ...
+
+
+@runtime_checkable
+class BatchPayloadStore(PayloadStore, Protocol):
+    """
+    PayloadStore with native bulk operations.
+    Use the module-level store_many / load_many helpers to work with any
+    PayloadStore; they fall back to per-digest calls.
+    """
+
+    def store_many(self, *, items: Iterable[tuple[Digest, RRPResponse]]) -> None:
+        """
+        Persist many responses. Same semantics as calling store for each item.
+        """
+        ...
+
+    def load_many(self, *, digests: Sequence[Digest]) -> list[RRPResponse]:
+        """
+        Load many responses, in the order of `digests`.
+        Must raise KeyError if any is missing.
+        """
+        ...
+
+
+def store_many(store: PayloadStore, *, items: Iterable[tuple[Digest, RRPResponse]]) -> None:
+    """
+    Persist many responses, using the store's store_many if it has one.
+    """
+    if isinstance(store, BatchPayloadStore):
+        store.store_many(items=items)
+        return
+    for digest, response in items:
+        store.store(digest=digest, response=response)
+
+
+def load_many(store: PayloadStore, *, digests: Sequence[Digest]) -> list[RRPResponse]:
+    """
+    Load many responses in order, using the store's load_many if it has one.
+    """
+    if isinstance(store, BatchPayloadStore):
+        return store.load_many(digests=digests)
+    return [store.load(digest=digest) for digest in digests]
@@ -1,14 +1,59 @@
+from collections.abc import Sequence
+
+from rrpf.hashing.merkle import verify_sections
 from rrpf.schemas.common import Digest
 from rrpf.schemas.response import RRPResponse
-from rrpf.storage.payload_store import PayloadStore
+from rrpf.storage.payload_store import PayloadStore, load_many
 
 
 def replay_from_store(
     *,
     digest: Digest,
     store: PayloadStore,
+    verify: bool | Sequence[str] = False,
 ) -> RRPResponse:
     """
     Replay a fulfilled RRPF payload without re-executing fulfillment.
+
+    With verify=True every section is checked against the digests recorded
+    in its provenance; a sequence of section keys checks only those.
+    Raises AssertionError on a mismatch.
+    """
+    response = store.load(digest=digest)
+    _verify(response, verify)
+    return response
+
+
+def replay_many_from_store(
+    *,
+    digests: Sequence[Digest],
+    store: PayloadStore,
+    verify: bool | Sequence[str] = False,
+) -> list[RRPResponse]:
+    """
+    Replay many fulfilled payloads in one bulk load, in the order given.
+    Raises KeyError if any digest is missing. verify works as in
+    replay_from_store, per payload.
     """
-    return store.load(digest=digest)
+    responses = load_many(store, digests=digests)
+    for response in responses:
+        _verify(response, verify)
+    return responses
+
+
+def _verify(response: RRPResponse, verify: bool | Sequence[str]) -> None:
+    if not verify:
+        return
+    keys = None if isinstance(verify, bool) else verify
+    expected = response.provenance.section_digests
+    if expected is None:
+        raise AssertionError(
+            f"Integrity check failed: payload {response.provenance.inputs_digest} "
+            "has no section digests"
+        )
+    mismatched = verify_sections(response.data, expected, keys=keys)
+    if mismatched:
+        raise AssertionError(
+            f"Integrity check failed: sections {', '.join(mismatched)} of payload "
+            f"{response.provenance.inputs_digest} do not match their digests"
+        )
@@ -0,0 +1,355 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal
+
+from rrpf.hashing.canonical_binary import (
+    CanonicalEncoding,
+    encode_canonical,
+    is_canonical_binary,
+)
+from rrpf.hashing.digest import same_digest
+from rrpf.hashing.merkle import digest_sections
+from rrpf.schemas.common import Digest
+from rrpf.storage.codecs import decompress_payload
+from rrpf.storage.layout import digest_from_stem
+from rrpf.storage.serialization import deserialize_response, parse_payload
+
+PoolKind = Literal["thread", "process"]
+
+_CHECKPOINT_VERSION = 1
+
+# Files checked per worker that may be queued ahead of the slowest result.
+_WINDOW_PER_WORKER = 4
+
+
+@dataclass(frozen=True)
+class ScrubIssue:
+    """A corrupt or orphaned file found by scrub_store."""
+
+    path: str
+    kind: Literal["corrupt", "orphaned"]
+    reason: str
+    digest: Digest | None = None
+
+
+@dataclass(frozen=True)
+class ScrubReport:
+    """
+    Outcome of a scrub run: payloads checked, their total size and every
+    issue found. When resumed from a checkpoint, it covers only this run.
+    """
+
+    scanned: int
+    bytes_read: int
+    issues: tuple[ScrubIssue, ...] = ()
+    resumed_after: str | None = None
+
+    @property
+    def corrupt(self) -> int:
+        return sum(issue.kind == "corrupt" for issue in self.issues)
+
+    @property
+    def orphaned(self) -> int:
+        return sum(issue.kind == "orphaned" for issue in self.issues)
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+
+class RateLimiter:
+    """
+    Paces callers to `rate` units per second (files or bytes). Each acquire
+    books its amount and sleeps until the pace allows it, so bursts are
+    spread out instead of being rejected.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = rate
+        self._clock = clock
+        self._sleep = sleep
+        self._next = clock()
+
+    def acquire(self, amount: float = 1) -> None:
+        now = self._clock()
+        start = max(self._next, now)
+        self._next = start + amount / self.rate
+        if start > now:
+            self._sleep(start - now)
+
+
+def scrub_store(
+    root: str,
+    *,
+    workers: int = 4,
+    pool: PoolKind = "thread",
+    max_files_per_second: float | None = None,
+    max_bytes_per_second: float | None = None,
+    checkpoint: str | None = None,
+    checkpoint_every: int = 1000,
+    on_issue: Callable[[ScrubIssue], None] | None = None,
+) -> ScrubReport:
+    """
+    Verify every payload of a FilesystemPayloadStore (flat or sharded).
+
+    Each <digest>.json is decoded and checked for:
+      * provenance.inputs_digest matching the file name,
+      * byte-exact canonical (JSON or binary) encoding,
+      * section digests and Merkle root, when the payload records them.
+    Section index sidecars without a payload and leftover temporary files
+    are reported as orphaned.
+
+    Files are walked in sorted path order and checked on `workers` threads
+    or processes. Reads can be paced with max_files_per_second and/or
+    max_bytes_per_second. With `checkpoint`, the last path below which
+    everything has been checked is saved every checkpoint_every payloads,
+    and a later run with the same checkpoint resumes after it. The
+    checkpoint is removed once a run completes.
+    """
+    if workers <= 0:
+        raise ValueError("workers must be > 0")
+    if checkpoint_every <= 0:
+        raise ValueError("checkpoint_every must be > 0")
+    if pool not in ("thread", "process"):
+        raise ValueError(f"Unknown pool kind: {pool}")
+
+    base = Path(root)
+    resume_after = _read_checkpoint(checkpoint) if checkpoint is not None else None
+    file_limiter = RateLimiter(max_files_per_second) if max_files_per_second else None
+    byte_limiter = RateLimiter(max_bytes_per_second) if max_bytes_per_second else None
+    # The checkpoint itself may live inside the store.
+    excluded = (
+        Path(os.path.relpath(os.path.abspath(checkpoint), os.path.abspath(root))).as_posix()
+        if checkpoint is not None
+        else None
+    )
+
+    scanned = 0
+    bytes_read = 0
+    issues: list[ScrubIssue] = []
+
+    def record(issue: ScrubIssue) -> None:
+        issues.append(issue)
+        if on_issue is not None:
+            on_issue(issue)
+
+    executor: Executor = (
+        ProcessPoolExecutor(max_workers=workers)
+        if pool == "process"
+        else ThreadPoolExecutor(max_workers=workers)
+    )
+    pending: deque[tuple[str, Future[str | None]]] = deque()
+    window = workers * _WINDOW_PER_WORKER
+
+    def complete() -> None:
+        nonlocal scanned
+        relative, future = pending.popleft()
+        scanned += 1
+        reason = future.result()
+        if reason is not None:
+            record(
+                ScrubIssue(
+                    path=relative,
+                    kind="corrupt",
+                    reason=reason,
+                    digest=digest_from_stem(Path(relative).name[: -len(".json")]),
+                )
+            )
+        if checkpoint is not None and scanned % checkpoint_every == 0:
+            _write_checkpoint(checkpoint, relative)
+
+    try:
+        for relative, path, size in _walk(base, resume_after):
+            if relative == excluded:
+                continue
+            orphan = _orphan_reason(path)
+            if orphan is not None:
+                record(ScrubIssue(path=relative, kind="orphaned", reason=orphan))
+                continue
+            if path.suffix != ".json":
+                continue
+            if file_limiter is not None:
+                file_limiter.acquire()
+            if byte_limiter is not None:
+                byte_limiter.acquire(size)
+            bytes_read += size
+            pending.append((relative, executor.submit(_check_payload, str(path))))
+            while len(pending) >= window:
+                complete()
+        while pending:
+            complete()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    if checkpoint is not None:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(checkpoint)
+
+    return ScrubReport(
+        scanned=scanned,
+        bytes_read=bytes_read,
+        issues=tuple(issues),
+        resumed_after=resume_after,
+    )
+
+
+def _check_payload(path: str) -> str | None:
+    """Reason the payload at path is corrupt, or None if it verifies."""
+    digest = digest_from_stem(Path(path).name[: -len(".json")])
+    try:
+        with open(path, "rb") as f:
+            stored = f.read()
+    except FileNotFoundError:
+        # Moved (e.g. by a migration) or replaced since it was listed.
+        return None
+    try:
+        content = decompress_payload(stored)
+        data = parse_payload(content)
+        response = deserialize_response(data)
+    except Exception as exc:
+        # Codec, JSON and schema errors alike mean the file is damaged.
+        return f"undecodable payload: {type(exc).__name__}: {exc}"
+
+    if not same_digest(response.provenance.inputs_digest, digest):
+        return f"inputs_digest {response.provenance.inputs_digest} does not match file name"
+    encoding: CanonicalEncoding = "binary" if is_canonical_binary(content) else "json"
+    if encode_canonical(data, encoding=encoding) != content:
+        return "payload is not canonically encoded"
+
+    provenance = response.provenance
+    if provenance.section_digests is None:
+        return None
+    expected = digest_sections(response.data, chunk_rows=provenance.chunk_rows)
+    mismatched = sorted(
+        key
+        for key in expected.sections.keys() | provenance.section_digests.keys()
+        if expected.sections.get(key) != provenance.section_digests.get(key)
+    )
+    if mismatched:
+        return f"section digest mismatch: {', '.join(mismatched)}"
+    if provenance.merkle_root != expected.root:
+        return "merkle_root does not match section digests"
+    return None
+
+
+def _orphan_reason(path: Path) -> str | None:
+    if path.name.startswith("tmp"):
+        # NamedTemporaryFile leftovers from interrupted writes. A write in
+        # progress can also show up here; rerun the scrub to confirm.
+        return "temporary file"
+    if path.suffix == ".idx" and not path.with_suffix(".json").exists():
+        return "section index without payload"
+    return None
+
+
+def _walk(base: Path, resume_after: str | None) -> Iterator[tuple[str, Path, int]]:
+    """
+    (relative path, path, size) of every file under base, in sorted path
+    order, skipping paths up to and including resume_after.
+    """
+    after = tuple(resume_after.split("/")) if resume_after is not None else None
+
+    def walk(directory: Path, prefix: tuple[str, ...]) -> Iterator[tuple[str, Path, int]]:
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            parts = (*prefix, entry.name)
+            if after is not None and parts < after[: len(parts)]:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                yield from walk(Path(entry.path), parts)
+            elif entry.is_file(follow_symlinks=False):
+                if after is not None and parts <= after:
+                    continue
+                try:
+                    size = entry.stat(follow_symlinks=False).st_size
+                except FileNotFoundError:
+                    continue
+                yield "/".join(parts), Path(entry.path), size
+
+    yield from walk(base, ())
+
+
+def _read_checkpoint(path: str) -> str | None:
+    try:
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None
+    if state.get("version") != _CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported scrub checkpoint: {path}")
+    last: str = state["last"]
+    return last
+
+
+def _write_checkpoint(path: str, last: str) -> None:
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=directory, delete=False
+    ) as tmp:
+        json.dump({"version": _CHECKPOINT_VERSION, "last": last}, tmp)
+    os.replace(tmp.name, path)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="rrpf-scrub",
+        description="Verify every payload of a FilesystemPayloadStore.",
+    )
+    parser.add_argument("root", help="store root directory")
+    parser.add_argument("--workers", type=int, default=4, help="parallel checks")
+    parser.add_argument(
+        "--processes", action="store_true", help="check in worker processes, not threads"
+    )
+    parser.add_argument("--max-files-per-second", type=float, help="pace file reads")
+    parser.add_argument("--max-bytes-per-second", type=float, help="pace bytes read")
+    parser.add_argument("--checkpoint", help="resume from / save progress to this file")
+    parser.add_argument(
+        "--checkpoint-every", type=int, default=1000, help="files between checkpoints"
+    )
+    args = parser.parse_args(argv)
+
+    def report(issue: ScrubIssue) -> None:
+        print(f"{issue.kind}\t{issue.path}\t{issue.reason}")
+
+    result = scrub_store(
+        args.root,
+        workers=args.workers,
+        pool="process" if args.processes else "thread",
+        max_files_per_second=args.max_files_per_second,
+        max_bytes_per_second=args.max_bytes_per_second,
+        checkpoint=args.checkpoint,
+        checkpoint_every=args.checkpoint_every,
+        on_issue=report,
+    )
+    print(
+        f"checked {result.scanned} payloads ({result.bytes_read} bytes): "
+        f"{result.corrupt} corrupt, {result.orphaned} orphaned",
+        file=sys.stderr,
+    )
+    return 0 if result.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,421 @@
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import zlib
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+
+from rrpf.hashing.canonical_binary import CanonicalEncoding
+from rrpf.hashing.digest import normalize_digest, same_digest
+from rrpf.schemas.common import Digest
+from rrpf.schemas.response import RRPResponse
+from rrpf.storage.codecs import decompress_payload, encode_payload, get_codec
+from rrpf.storage.serialization import check_encoding, decode_response, encode_response
+
+# Record: magic, digest length, payload length, crc32(digest + payload),
+# followed by the digest and the (optionally compressed) canonical JSON or
+# binary payload.
+_RECORD = struct.Struct(">4sHII")
+_RECORD_MAGIC = b"RRPS"
+
+# Index snapshot: magic, version, segment count; then (segment, end offset)
+# pairs, entry count and (digest length, digest, segment, offset, length)
+# entries. A trailing crc32 covers everything before it.
+_INDEX_HEADER = struct.Struct(">4sHI")
+_INDEX_MAGIC = b"RRPI"
+_INDEX_VERSION = 1
+_INDEX_SEGMENT = struct.Struct(">IQ")
+_INDEX_COUNT = struct.Struct(">Q")
+_INDEX_ENTRY = struct.Struct(">IQI")
+_INDEX_DIGEST_LEN = struct.Struct(">H")
+_CRC = struct.Struct(">I")
+
+_INDEX_FILE = "index.bin"
+
+
+@dataclass(frozen=True)
+class SegmentLocation:
+    """Where a payload lives: segment number, byte offset and length."""
+
+    segment: int
+    offset: int
+    length: int
+
+
+class SegmentPayloadStore:
+    """
+    Append-only PayloadStore that packs payloads into rolling segment files.
+
+    Each store appends one checksummed record to the active segment; a new
+    segment is started once it exceeds max_segment_bytes. An in-memory
+    digest -> (segment, offset, length) index makes lookups O(1), and loads
+    read the payload straight out of a memory-mapped segment.
+
+    The index is snapshotted to disk whenever a segment is sealed and on
+    close. On open, records written after the snapshot are recovered by
+    scanning the segment tails; a torn record left by a crash at the end of
+    the active segment is truncated. Damaged records anywhere else are
+    skipped, keeping the records after them, and reported by
+    damaged_ranges(); their bytes are left in place.
+    Payloads are immutable, so storing a digest that is already present is
+    a no-op. encoding="binary" stores new payloads in the canonical binary
+    encoding; loads accept either encoding.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        *,
+        max_segment_bytes: int = 64 * 1024 * 1024,
+        codec: str = "none",
+        fsync: bool = True,
+        encoding: CanonicalEncoding = "json",
+    ) -> None:
+        if max_segment_bytes <= 0:
+            raise ValueError("max_segment_bytes must be > 0")
+        check_encoding(encoding)
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_segment_bytes = max_segment_bytes
+        self.codec = get_codec(codec)
+        self.fsync = fsync
+        self.encoding = encoding
+
+        self._lock = threading.Lock()
+        self._index: dict[Digest, SegmentLocation] = {}
+        self._maps: dict[int, mmap.mmap] = {}
+        self._sealed: dict[int, int] = {}
+        self._damaged: list[SegmentLocation] = []
+        # Set by _open: the segment being appended to and its size in bytes.
+        self._active_id = 0
+        self._active_size = 0
+
+        self._open()
+
+    def store(self, *, digest: Digest, response: RRPResponse) -> None:
+        """
+        Append the response to the active segment.
+        The record is flushed (and fsynced if enabled) before it is indexed.
+        """
+        self.store_many(items=[(digest, response)])
+
+    def store_many(self, *, items: Iterable[tuple[Digest, RRPResponse]]) -> None:
+        """
+        Append many responses with a single flush (and fsync) per segment.
+        """
+        with self._lock:
+            pending = {
+                key: response
+                for key, response in ((normalize_digest(d), r) for d, r in items)
+                if key not in self._index
+            }
+        records = [
+            (digest, self._encode(digest, response)) for digest, response in pending.items()
+        ]
+
+        with self._lock:
+            written: list[tuple[Digest, SegmentLocation]] = []
+            for digest, (record, payload_length) in records:
+                if digest in self._index:
+                    continue
+                if self._active_size > 0 and (
+                    self._active_size + len(record) > self.max_segment_bytes
+                ):
+                    self._publish(written)
+                    written = []
+                    self._roll()
+
+                self._active.write(record)
+                self._active_size += len(record)
+                location = SegmentLocation(
+                    self._active_id, self._active_size - payload_length, payload_length
+                )
+                written.append((digest, location))
+            self._publish(written)
+
+    def load(self, *, digest: Digest) -> RRPResponse:
+        """
+        Load a previously stored response from its segment.
+        """
+        return self.load_many(digests=[digest])[0]
+
+    def load_many(self, *, digests: Sequence[Digest]) -> list[RRPResponse]:
+        """
+        Load many responses in order, slicing them all under one lock.
+        """
+        stored: list[bytes] = []
+        with self._lock:
+            for digest in digests:
+                location = self._index.get(normalize_digest(digest))
+                if location is None:
+                    raise KeyError(f"Payload not found: {digest}")
+                segment = self._map(location)
+                stored.append(segment[location.offset : location.offset + location.length])
+
+        responses: list[RRPResponse] = []
+        for digest, payload in zip(digests, stored, strict=True):
+            response = decode_response(decompress_payload(payload))
+            if not same_digest(response.provenance.inputs_digest, digest):
+                raise AssertionError(
+                    f"Integrity check failed: stored digest {response.provenance.inputs_digest} "
+                    f"does not match requested digest {digest}"
+                )
+            responses.append(response)
+        return responses
+
+    def locate(self, digest: Digest) -> SegmentLocation | None:
+        """Index entry for a digest, or None if it is not stored."""
+        with self._lock:
+            return self._index.get(normalize_digest(digest))
+
+    def recover(self) -> int:
+        """
+        Discard the index and rebuild it by scanning every segment.
+        Returns the number of payloads found; see damaged_ranges() for the
+        byte ranges that had to be skipped.
+        """
+        with self._lock:
+            for segment in self._maps.values():
+                segment.close()
+            self._maps.clear()
+            self._index.clear()
+            self._sealed.clear()
+            self._damaged.clear()
+            for segment_id in self._segment_ids():
+                self._scan(segment_id, 0, active=segment_id == self._active_id)
+            self._active_size = self._sealed.pop(self._active_id, 0)
+            self._write_index()
+            return len(self._index)
+
+    def damaged_ranges(self) -> list[SegmentLocation]:
+        """
+        Byte ranges (segment, offset, length) skipped as damaged by the scans
+        of open and recover(). Ranges before the index snapshot are only
+        scanned, and so only found, by recover().
+        """
+        with self._lock:
+            return list(self._damaged)
+
+    def flush(self) -> None:
+        """Snapshot the index so the next open does not need a tail scan."""
+        with self._lock:
+            self._write_index()
+
+    def close(self) -> None:
+        with self._lock:
+            self._write_index()
+            self._active.close()
+            for segment in self._maps.values():
+                segment.close()
+            self._maps.clear()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __enter__(self) -> "SegmentPayloadStore":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _open(self) -> None:
+        covered = self._read_index()
+        segment_ids = self._segment_ids()
+        for segment_id in segment_ids:
+            self._scan(
+                segment_id, covered.get(segment_id, 0), active=segment_id == segment_ids[-1]
+            )
+
+        self._active_id = segment_ids[-1] if segment_ids else 1
+        path = self._segment_path(self._active_id)
+        self._active = path.open("ab")
+        self._active_size = self._sealed.pop(self._active_id, 0)
+
+    def _encode(self, digest: Digest, response: RRPResponse) -> tuple[bytes, int]:
+        """A complete record and the length of its payload."""
+        payload = encode_payload(encode_response(response, encoding=self.encoding), self.codec)
+        key = digest.encode("utf-8")
+        header = _RECORD.pack(_RECORD_MAGIC, len(key), len(payload), zlib.crc32(key + payload))
+        return header + key + payload, len(payload)
+
+    def _publish(self, written: list[tuple[Digest, SegmentLocation]]) -> None:
+        """Make appended records durable, then visible in the index."""
+        if not written:
+            return
+        self._active.flush()
+        if self.fsync:
+            os.fsync(self._active.fileno())
+        self._index.update(written)
+
+    def _roll(self) -> None:
+        self._active.close()
+        self._sealed[self._active_id] = self._active_size
+        # The sealed segment may be mapped at an earlier, shorter size.
+        stale = self._maps.pop(self._active_id, None)
+        if stale is not None:
+            stale.close()
+        self._active_id += 1
+        self._active = self._segment_path(self._active_id).open("ab")
+        self._active_size = 0
+        self._write_index()
+
+    def _map(self, location: SegmentLocation) -> mmap.mmap:
+        segment = self._maps.get(location.segment)
+        if segment is None or len(segment) < location.offset + location.length:
+            # The active segment grew since it was mapped; remap it.
+            if segment is not None:
+                segment.close()
+            with self._segment_path(location.segment).open("rb") as f:
+                segment = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[location.segment] = segment
+        return segment
+
+    def _scan(self, segment_id: int, start: int, *, active: bool) -> None:
+        """
+        Index the records of a segment from `start`. A damaged record is
+        skipped up to the next valid one and recorded in _damaged. Bytes after
+        the last valid record are a torn tail if the segment is the active
+        one, and are truncated; in a sealed segment they are kept and recorded.
+        """
+        path = self._segment_path(segment_id)
+        with path.open("rb") as f:
+            f.seek(start)
+            data = f.read()
+
+        pos = 0
+        while pos < len(data):
+            record = _parse_record(data, pos)
+            if record is None:
+                resume = _find_record(data, pos + 1)
+                if resume is None:
+                    break
+                self._damaged.append(SegmentLocation(segment_id, start + pos, resume - pos))
+                pos = resume
+                continue
+            digest, payload_offset, payload_len = record
+            self._index.setdefault(
+                digest, SegmentLocation(segment_id, start + payload_offset, payload_len)
+            )
+            pos = payload_offset + payload_len
+
+        end = len(data)
+        if pos < end:
+            if active:
+                with path.open("r+b") as f:
+                    f.truncate(start + pos)
+                end = pos
+            else:
+                self._damaged.append(SegmentLocation(segment_id, start + pos, end - pos))
+        self._sealed[segment_id] = start + end
+
+    def _read_index(self) -> dict[int, int]:
+        """Load the index snapshot; returns the segment offsets it covers."""
+        try:
+            raw = (self.root / _INDEX_FILE).read_bytes()
+        except FileNotFoundError:
+            return {}
+        try:
+            return self._parse_index(raw)
+        except (struct.error, UnicodeDecodeError, ValueError):
+            # Corrupt snapshot: fall back to a full scan.
+            self._index.clear()
+            return {}
+
+    def _parse_index(self, raw: bytes) -> dict[int, int]:
+        (crc,) = _CRC.unpack_from(raw, len(raw) - _CRC.size)
+        body = raw[: -_CRC.size]
+        if zlib.crc32(body) != crc:
+            raise ValueError("index checksum mismatch")
+        magic, version, segment_count = _INDEX_HEADER.unpack_from(body, 0)
+        if magic != _INDEX_MAGIC or version != _INDEX_VERSION:
+            raise ValueError("unsupported index format")
+
+        pos = _INDEX_HEADER.size
+        covered: dict[int, int] = {}
+        for _ in range(segment_count):
+            segment_id, end = _INDEX_SEGMENT.unpack_from(body, pos)
+            pos += _INDEX_SEGMENT.size
+            path = self._segment_path(segment_id)
+            if not path.exists() or path.stat().st_size < end:
+                raise ValueError(f"segment {segment_id} is shorter than indexed")
+            covered[segment_id] = end
+
+        (entry_count,) = _INDEX_COUNT.unpack_from(body, pos)
+        pos += _INDEX_COUNT.size
+        for _ in range(entry_count):
+            (key_len,) = _INDEX_DIGEST_LEN.unpack_from(body, pos)
+            pos += _INDEX_DIGEST_LEN.size
+            digest = Digest(body[pos : pos + key_len].decode("utf-8"))
+            pos += key_len
+            segment_id, offset, length = _INDEX_ENTRY.unpack_from(body, pos)
+            pos += _INDEX_ENTRY.size
+            self._index[digest] = SegmentLocation(segment_id, offset, length)
+        return covered
+
+    def _write_index(self) -> None:
+        covered = dict(self._sealed)
+        if not self._active.closed:
+            covered[self._active_id] = self._active_size
+
+        parts = [_INDEX_HEADER.pack(_INDEX_MAGIC, _INDEX_VERSION, len(covered))]
+        parts.extend(_INDEX_SEGMENT.pack(s, end) for s, end in sorted(covered.items()))
+        parts.append(_INDEX_COUNT.pack(len(self._index)))
+        for digest, location in self._index.items():
+            key = digest.encode("utf-8")
+            parts.append(_INDEX_DIGEST_LEN.pack(len(key)))
+            parts.append(key)
+            parts.append(_INDEX_ENTRY.pack(location.segment, location.offset, location.length))
+        body = b"".join(parts)
+
+        with tempfile.NamedTemporaryFile(dir=str(self.root), delete=False) as tmp:
+            tmp.write(body + _CRC.pack(zlib.crc32(body)))
+            if self.fsync:
+                tmp.flush()
+                os.fsync(tmp.fileno())
+        os.replace(tmp.name, self.root / _INDEX_FILE)
+
+    def _segment_ids(self) -> list[int]:
+        return sorted(
+            int(path.stem.removeprefix("segment-")) for path in self.root.glob("segment-*.seg")
+        )
+
+    def _segment_path(self, segment_id: int) -> Path:
+        return self.root / f"segment-{segment_id:06d}.seg"
+
+
+def _parse_record(data: bytes, pos: int) -> tuple[Digest, int, int] | None:
+    """Digest, payload offset and payload length of a valid record at pos."""
+    if pos + _RECORD.size > len(data):
+        return None
+    magic, key_len, payload_len, crc = _RECORD.unpack_from(data, pos)
+    body_start = pos + _RECORD.size
+    body_end = body_start + key_len + payload_len
+    if magic != _RECORD_MAGIC or body_end > len(data):
+        return None
+    if zlib.crc32(data[body_start:body_end]) != crc:
+        return None
+    try:
+        digest = Digest(data[body_start : body_start + key_len].decode("utf-8"))
+    except UnicodeDecodeError:
+        return None
+    return digest, body_start + key_len, payload_len
+
+
+def _find_record(data: bytes, pos: int) -> int | None:
+    """Offset of the first valid record at or after pos."""
+    while True:
+        pos = data.find(_RECORD_MAGIC, pos)
+        if pos < 0:
+            return None
+        if _parse_record(data, pos) is not None:
+            return pos
+        pos += 1
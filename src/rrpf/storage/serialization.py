@@ -0,0 +1,115 @@
+import json
+from datetime import datetime
+from typing import Any, cast
+
+from rrpf.hashing.canonical_binary import (
+    CANONICAL_ENCODINGS,
+    CanonicalEncoding,
+    decode_canonical_binary,
+    encode_canonical,
+    is_canonical_binary,
+)
+from rrpf.schemas.common import Digest, RequestID
+from rrpf.schemas.errors import RRPError
+from rrpf.schemas.provenance import Provenance, QueryStats
+from rrpf.schemas.response import RRPResponse
+
+
+def encode_response(response: RRPResponse, *, encoding: CanonicalEncoding = "json") -> bytes:
+    """Canonical bytes of a response in the given encoding."""
+    return encode_canonical(serialize_response(response), encoding=encoding)
+
+
+def decode_response(raw: bytes) -> RRPResponse:
+    """Inverse of encode_response; the encoding is detected from raw."""
+    return deserialize_response(parse_payload(raw))
+
+
+def parse_payload(raw: bytes) -> Any:
+    """Decode a canonical JSON or canonical binary payload into plain data."""
+    if is_canonical_binary(raw):
+        return decode_canonical_binary(raw)
+    return json.loads(raw)
+
+
+def check_encoding(encoding: str) -> None:
+    """Raise ValueError unless encoding is one of CANONICAL_ENCODINGS."""
+    if encoding not in CANONICAL_ENCODINGS:
+        raise ValueError(
+            f"Unknown encoding {encoding!r}; expected one of: {', '.join(CANONICAL_ENCODINGS)}"
+        )
+
+
+def serialize_response(resp: RRPResponse) -> dict[str, Any]:
+    """JSON-compatible dict form of a response, as written by the payload stores."""
+    provenance: dict[str, Any] = {
+        "fulfilled_at": resp.provenance.fulfilled_at.isoformat().replace("+00:00", "Z"),
+        "inputs_digest": resp.provenance.inputs_digest,
+        "query_stats": {
+            k: {"rows": v.rows, "groups": v.groups}
+            for k, v in resp.provenance.query_stats.items()
+        },
+    }
+    # Section digests are written only when present, so payloads without
+    # them keep their original encoding.
+    if resp.provenance.section_digests is not None:
+        provenance["section_digests"] = dict(resp.provenance.section_digests)
+        provenance["merkle_root"] = resp.provenance.merkle_root
+    if resp.provenance.chunk_digests is not None:
+        provenance["chunk_rows"] = resp.provenance.chunk_rows
+        provenance["chunk_digests"] = {
+            k: list(v) for k, v in resp.provenance.chunk_digests.items()
+        }
+    return {
+        "ok": resp.ok,
+        "request_id": resp.request_id,
+        "as_of": resp.as_of,
+        "partial": resp.partial,
+        "data": dict(resp.data),
+        "errors": [
+            {"code": e.code, "message": e.message, "section": e.section}
+            for e in resp.errors
+        ],
+        "provenance": provenance,
+    }
+
+
+def deserialize_response(data: dict[str, Any]) -> RRPResponse:
+    """Inverse of serialize_response."""
+    # Provenance
+    prov_data = data["provenance"]
+    stats: dict[str, QueryStats] = {}
+    for k, v in prov_data["query_stats"].items():
+        stats[k] = QueryStats(rows=v["rows"], groups=v["groups"])
+
+    # Handle timestamp: ISO format potentially with Z
+    ts_str = prov_data["fulfilled_at"]
+    if ts_str.endswith("Z"):
+        ts_str = ts_str[:-1] + "+00:00"
+    fulfilled_at = datetime.fromisoformat(ts_str)
+
+    provenance = Provenance(
+        fulfilled_at=fulfilled_at,
+        inputs_digest=cast(Digest, prov_data["inputs_digest"]),
+        query_stats=stats,
+        section_digests=prov_data.get("section_digests"),
+        merkle_root=prov_data.get("merkle_root"),
+        chunk_rows=prov_data.get("chunk_rows"),
+        chunk_digests=prov_data.get("chunk_digests"),
+    )
+
+    # Errors
+    errors = [
+        RRPError(code=e["code"], message=e["message"], section=e["section"])
+        for e in data["errors"]
+    ]
+
+    return RRPResponse(
+        ok=data["ok"],
+        request_id=cast(RequestID, data["request_id"]),
+        as_of=data["as_of"],
+        partial=data["partial"],
+        data=data["data"],
+        errors=errors,
+        provenance=provenance,
+    )
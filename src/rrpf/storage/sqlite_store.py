@@ -0,0 +1,255 @@
+import sqlite3
+import threading
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import islice
+from types import TracebackType
+from typing import Any
+
+from rrpf.hashing.canonical_binary import CanonicalEncoding, encode_canonical
+from rrpf.hashing.digest import normalize_digest, same_digest
+from rrpf.schemas.common import Digest, RequestID
+from rrpf.schemas.response import RRPResponse
+from rrpf.storage.codecs import decompress_payload, encode_payload, get_codec
+from rrpf.storage.serialization import check_encoding, decode_response, serialize_response
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS payloads (
+    inputs_digest TEXT PRIMARY KEY,
+    request_id TEXT NOT NULL,
+    fulfilled_at TEXT NOT NULL,
+    ok INTEGER NOT NULL,
+    partial INTEGER NOT NULL,
+    payload BLOB NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS payloads_request_id ON payloads (request_id);
+CREATE INDEX IF NOT EXISTS payloads_fulfilled_at ON payloads (fulfilled_at);
+"""
+
+_INSERT = (
+    "INSERT OR REPLACE INTO payloads "
+    "(inputs_digest, request_id, fulfilled_at, ok, partial, payload) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+# Stay well under SQLite's default limit on bound parameters.
+_LOAD_CHUNK = 500
+
+
+@dataclass(frozen=True)
+class PayloadMetadata:
+    """Indexed columns of a stored payload, readable without decoding it."""
+
+    inputs_digest: Digest
+    request_id: RequestID
+    fulfilled_at: str
+    ok: bool
+    partial: bool
+
+
+class SQLitePayloadStore:
+    """
+    SQLite-backed implementation of PayloadStore.
+
+    Payloads are stored as (optionally compressed) canonical JSON blobs in a
+    single database file, next to indexed request_id, inputs_digest and
+    fulfilled_at columns for metadata queries that never decode a payload.
+    With encoding="binary", new blobs use the canonical binary encoding;
+    loads accept either encoding.
+
+    The database runs in WAL mode so readers never block the writer, and
+    each thread gets its own connection. store_many and load_many work in
+    batches, committing once per batch.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        codec: str = "none",
+        batch_size: int = 500,
+        busy_timeout_ms: int = 5000,
+        encoding: CanonicalEncoding = "json",
+    ) -> None:
+        if batch_size <= 0:
+            raise ValueError("batch_size must be > 0")
+        check_encoding(encoding)
+        self.path = path
+        self.codec = get_codec(codec)
+        self.encoding = encoding
+        self.batch_size = batch_size
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+        self._connection().executescript(_SCHEMA)
+
+    def store(self, *, digest: Digest, response: RRPResponse) -> None:
+        """
+        Persist the response under its digest, replacing any existing row.
+        """
+        self.store_many(items=[(digest, response)])
+
+    def store_many(self, *, items: Iterable[tuple[Digest, RRPResponse]]) -> None:
+        """
+        Persist many responses, committing once per batch_size items.
+        """
+        rows = (self._row(digest, response) for digest, response in items)
+        while batch := list(islice(rows, self.batch_size)):
+            with self._transaction() as conn:
+                conn.executemany(_INSERT, batch)
+
+    def load(self, *, digest: Digest) -> RRPResponse:
+        """
+        Load a previously stored response.
+        """
+        return self.load_many(digests=[digest])[0]
+
+    def load_many(self, *, digests: Sequence[Digest]) -> list[RRPResponse]:
+        """
+        Load many responses, in the order of `digests`.
+        Raises KeyError if any digest is not stored.
+        """
+        blobs: dict[str, bytes] = {}
+        conn = self._connection()
+        keys = [normalize_digest(digest) for digest in digests]
+        unique = list(dict.fromkeys(keys))
+        for start in range(0, len(unique), _LOAD_CHUNK):
+            chunk = unique[start : start + _LOAD_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            blobs.update(
+                conn.execute(
+                    f"SELECT inputs_digest, payload FROM payloads "
+                    f"WHERE inputs_digest IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+            )
+
+        responses: list[RRPResponse] = []
+        for digest, key in zip(digests, keys, strict=True):
+            blob = blobs.get(key)
+            if blob is None:
+                raise KeyError(f"Payload not found: {digest}")
+            response = decode_response(decompress_payload(blob))
+            if not same_digest(response.provenance.inputs_digest, digest):
+                raise AssertionError(
+                    "Integrity check failed: stored digest "
+                    f"{response.provenance.inputs_digest} "
+                    f"does not match requested digest {digest}"
+                )
+            responses.append(response)
+        return responses
+
+    def find(
+        self,
+        *,
+        request_id: RequestID | None = None,
+        fulfilled_from: str | None = None,
+        fulfilled_until: str | None = None,
+        limit: int | None = None,
+    ) -> list[PayloadMetadata]:
+        """
+        Metadata of stored payloads matching all given filters, oldest first.
+        fulfilled_from / fulfilled_until bound fulfilled_at (inclusive /
+        exclusive) as ISO 8601 UTC strings ending in "Z", as stored.
+        """
+        clauses: list[str] = []
+        params: list[Any] = []
+        if request_id is not None:
+            clauses.append("request_id = ?")
+            params.append(request_id)
+        if fulfilled_from is not None:
+            clauses.append("fulfilled_at >= ?")
+            params.append(fulfilled_from)
+        if fulfilled_until is not None:
+            clauses.append("fulfilled_at < ?")
+            params.append(fulfilled_until)
+
+        query = "SELECT inputs_digest, request_id, fulfilled_at, ok, partial FROM payloads"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY fulfilled_at, inputs_digest"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        return [
+            PayloadMetadata(
+                inputs_digest=Digest(digest),
+                request_id=RequestID(req_id),
+                fulfilled_at=fulfilled_at,
+                ok=bool(ok),
+                partial=bool(partial),
+            )
+            for digest, req_id, fulfilled_at, ok, partial in self._connection().execute(
+                query, params
+            )
+        ]
+
+    def __len__(self) -> int:
+        (count,) = self._connection().execute("SELECT COUNT(*) FROM payloads").fetchone()
+        return int(count)
+
+    def close(self) -> None:
+        """Close every thread's connection."""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def __enter__(self) -> "SQLitePayloadStore":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _row(self, digest: Digest, response: RRPResponse) -> tuple[Any, ...]:
+        data = serialize_response(response)
+        payload = encode_payload(encode_canonical(data, encoding=self.encoding), self.codec)
+        return (
+            normalize_digest(digest),
+            response.request_id,
+            data["provenance"]["fulfilled_at"],
+            int(response.ok),
+            int(response.partial),
+            payload,
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread is off only so close() can close every
+            # connection; each one is otherwise used by its own thread.
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout_ms / 1000,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connection()
+        # Take the write lock up front so concurrent writers wait on
+        # busy_timeout instead of failing on a lock upgrade.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Point-in-time counters for an in-process cache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache (0.0 when unused)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass(frozen=True)
+class CompressionStats:
+    """Bytes written by a payload store since it was opened."""
+
+    payloads: int
+    raw_bytes: int
+    stored_bytes: int
+
+    @property
+    def ratio(self) -> float:
+        """raw_bytes / stored_bytes (1.0 when nothing was written)."""
+        return self.raw_bytes / self.stored_bytes if self.stored_bytes else 1.0
+
+
+@dataclass(frozen=True)
+class TieredStats:
+    """Per-tier lookup counters for a tiered payload store."""
+
+    hot: CacheStats
+    cold: CacheStats
+    pending_writes: int = 0
+    write_errors: int = 0
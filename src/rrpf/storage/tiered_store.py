@@ -0,0 +1,255 @@
+import queue
+import threading
+from collections.abc import Iterable, Sequence
+from types import TracebackType
+from typing import Protocol, runtime_checkable
+
+from rrpf.hashing.digest import normalize_digest
+from rrpf.schemas.common import Digest
+from rrpf.schemas.response import RRPResponse
+from rrpf.storage.payload_store import PayloadStore, load_many, store_many
+from rrpf.storage.stats import CacheStats, TieredStats
+
+
+@runtime_checkable
+class _StatsStore(Protocol):
+    def stats(self) -> object: ...
+
+
+class TieredPayloadStore:
+    """
+    PayloadStore composed of a fast hot tier in front of a durable cold tier.
+
+    Loads try the hot tier first; a hot miss is served from the cold tier
+    and promoted into the hot tier, so repeated replays never reach the cold
+    tier. A bounded store such as MemoryPayloadStore(max_entries=...) makes
+    a good hot tier.
+
+    Writes go to both tiers. Write-through (the default) stores into the
+    cold tier before the hot one and returns once both are written. With
+    write_behind=True, store returns after the hot write; a background
+    thread drains up to max_pending queued writes into the cold tier (store
+    blocks when the queue is full). Payloads still queued are served from
+    memory. flush() waits for the queue to drain and re-raises the first
+    cold-tier error since the previous flush; close() flushes and stops the
+    writer. Stores after close() raise ValueError.
+
+    stats() reports the hot tier's own evictions when it keeps CacheStats
+    (as MemoryPayloadStore does).
+    """
+
+    def __init__(
+        self,
+        *,
+        hot: PayloadStore,
+        cold: PayloadStore,
+        write_behind: bool = False,
+        max_pending: int = 1000,
+    ) -> None:
+        if max_pending <= 0:
+            raise ValueError("max_pending must be > 0")
+        self.hot = hot
+        self.cold = cold
+        self.write_behind = write_behind
+
+        self._lock = threading.Lock()
+        self._hot_hits = 0
+        self._hot_misses = 0
+        self._cold_hits = 0
+        self._cold_misses = 0
+        self._write_errors = 0
+        self._first_error: BaseException | None = None
+        # Held while checking for close() and queueing, so no write is
+        # queued after the writer has stopped.
+        self._writes = threading.Lock()
+        self._closed = False
+
+        self._pending: dict[Digest, RRPResponse] = {}
+        self._queue: queue.Queue[tuple[Digest, RRPResponse] | None] = queue.Queue(max_pending)
+        self._writer: threading.Thread | None = None
+        if write_behind:
+            self._writer = threading.Thread(
+                target=self._drain, name="rrpf-write-behind", daemon=True
+            )
+            self._writer.start()
+
+    def store(self, *, digest: Digest, response: RRPResponse) -> None:
+        """
+        Persist the response in both tiers (the cold tier possibly later).
+        """
+        digest = normalize_digest(digest)
+        self._check_open()
+        if not self.write_behind:
+            self.cold.store(digest=digest, response=response)
+            self.hot.store(digest=digest, response=response)
+            return
+
+        self.hot.store(digest=digest, response=response)
+        self._enqueue([(digest, response)])
+
+    def store_many(self, *, items: Iterable[tuple[Digest, RRPResponse]]) -> None:
+        """
+        Persist many responses, using each tier's bulk path where available.
+        """
+        batch = [(normalize_digest(digest), response) for digest, response in items]
+        self._check_open()
+        if not self.write_behind:
+            store_many(self.cold, items=batch)
+            store_many(self.hot, items=batch)
+            return
+
+        store_many(self.hot, items=batch)
+        self._enqueue(batch)
+
+    def load(self, *, digest: Digest) -> RRPResponse:
+        """
+        Load from the hot tier, falling back to (and promoting from) the cold tier.
+        """
+        digest = normalize_digest(digest)
+        try:
+            response = self.hot.load(digest=digest)
+        except KeyError:
+            pass
+        else:
+            with self._lock:
+                self._hot_hits += 1
+            return response
+
+        with self._lock:
+            self._hot_misses += 1
+            # Evicted from the hot tier before its cold write landed.
+            pending = self._pending.get(digest)
+        if pending is not None:
+            return pending
+
+        try:
+            response = self.cold.load(digest=digest)
+        except KeyError:
+            with self._lock:
+                self._cold_misses += 1
+            raise
+
+        with self._lock:
+            self._cold_hits += 1
+        self.hot.store(digest=digest, response=response)
+        return response
+
+    def load_many(self, *, digests: Sequence[Digest]) -> list[RRPResponse]:
+        """
+        Load many responses in order. Hot misses are fetched from the cold
+        tier in one bulk load and promoted together.
+        """
+        digests = [normalize_digest(digest) for digest in digests]
+        found: dict[Digest, RRPResponse] = {}
+        misses: list[Digest] = []
+        for digest in dict.fromkeys(digests):
+            try:
+                found[digest] = self.hot.load(digest=digest)
+            except KeyError:
+                misses.append(digest)
+
+        with self._lock:
+            self._hot_hits += len(found)
+            self._hot_misses += len(misses)
+            for digest in misses:
+                pending = self._pending.get(digest)
+                if pending is not None:
+                    found[digest] = pending
+            cold_digests = [digest for digest in misses if digest not in found]
+
+        if cold_digests:
+            try:
+                promoted = load_many(self.cold, digests=cold_digests)
+            except KeyError:
+                with self._lock:
+                    self._cold_misses += 1
+                raise
+            with self._lock:
+                self._cold_hits += len(promoted)
+            store_many(self.hot, items=zip(cold_digests, promoted, strict=True))
+            found.update(zip(cold_digests, promoted, strict=True))
+
+        return [found[digest] for digest in digests]
+
+    def stats(self) -> TieredStats:
+        hot_stats = self.hot.stats() if isinstance(self.hot, _StatsStore) else None
+        evictions = hot_stats.evictions if isinstance(hot_stats, CacheStats) else 0
+        with self._lock:
+            return TieredStats(
+                hot=CacheStats(
+                    hits=self._hot_hits, misses=self._hot_misses, evictions=evictions
+                ),
+                cold=CacheStats(hits=self._cold_hits, misses=self._cold_misses, evictions=0),
+                pending_writes=len(self._pending),
+                write_errors=self._write_errors,
+            )
+
+    def flush(self) -> None:
+        """
+        Wait until every queued write has reached the cold tier.
+        Re-raises the first cold-tier write error since the previous flush.
+        Once closed, there is nothing left to wait for.
+        """
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.join()
+        with self._lock:
+            error, self._first_error = self._first_error, None
+        if error is not None:
+            raise error
+
+    def close(self) -> None:
+        """Flush pending writes and stop the write-behind thread."""
+        with self._writes:
+            self._closed = True
+        try:
+            self.flush()
+        finally:
+            if self._writer is not None and self._writer.is_alive():
+                self._queue.put(None)
+                self._writer.join()
+
+    def __enter__(self) -> "TieredPayloadStore":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise ValueError("TieredPayloadStore is closed")
+
+    def _enqueue(self, batch: list[tuple[Digest, RRPResponse]]) -> None:
+        # put() may block on a full queue; the writer drains it without
+        # taking _writes, so holding it here cannot deadlock.
+        with self._writes:
+            self._check_open()
+            with self._lock:
+                self._pending.update(batch)
+            for item in batch:
+                self._queue.put(item)
+
+    def _drain(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:  # close()
+                self._queue.task_done()
+                return
+            digest, response = item
+            try:
+                self.cold.store(digest=digest, response=response)
+            except Exception as exc:
+                with self._lock:
+                    self._write_errors += 1
+                    if self._first_error is None:
+                        self._first_error = exc
+            finally:
+                with self._lock:
+                    # Keep a newer pending write for the same digest.
+                    if self._pending.get(digest) is response:
+                        del self._pending[digest]
+                self._queue.task_done()
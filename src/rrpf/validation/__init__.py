@@ -1,4 +1,28 @@
 from .errors import ValidationError
-from .validator import validate_request
+from .rules import BUILTIN_RULES, ValidationRule
+from .validator import (
+    CompiledValidator,
+    RuleStats,
+    compile_validator,
+    default_validator,
+    register_rule,
+    unregister_rule,
+    validate_many,
+    validate_request,
+    validation_rules,
+)
 
-__all__ = ["ValidationError", "validate_request"]
+__all__ = [
+    "BUILTIN_RULES",
+    "CompiledValidator",
+    "RuleStats",
+    "ValidationError",
+    "ValidationRule",
+    "compile_validator",
+    "default_validator",
+    "register_rule",
+    "unregister_rule",
+    "validate_many",
+    "validate_request",
+    "validation_rules",
+]
@@ -1,8 +1,16 @@
 
+from collections.abc import Callable
+
 from rrpf.schemas import RRPRequest
 from rrpf.schemas.as_of import AsOfMode
 from rrpf.validation.errors import ValidationError
 
+ValidationRule = Callable[[RRPRequest], list[ValidationError]]
+
+# Enum member lookups go through the metaclass; resolve them once.
+_LATEST = AsOfMode.LATEST
+_TIMESTAMP = AsOfMode.TIMESTAMP
+
 
 def validate_version(request: RRPRequest) -> list[ValidationError]:
     if request.rrp_version != "1.0":
@@ -18,8 +26,9 @@ def validate_version(request: RRPRequest) -> list[ValidationError]:
 
 def validate_as_of(request: RRPRequest) -> list[ValidationError]:
     errors = []
-    if request.as_of.mode == AsOfMode.TIMESTAMP:
-        if request.as_of.timestamp is None:
+    as_of = request.as_of
+    if as_of.mode == _TIMESTAMP:
+        if as_of.timestamp is None:
             errors.append(
                 ValidationError(
                     code="missing_timestamp",
@@ -27,7 +36,7 @@ def validate_as_of(request: RRPRequest) -> list[ValidationError]:
                     path="as_of.timestamp",
                 )
             )
-    elif request.as_of.mode == AsOfMode.LATEST and request.as_of.timestamp is not None:
+    elif as_of.mode == _LATEST and as_of.timestamp is not None:
         errors.append(
             ValidationError(
                 code="unexpected_timestamp",
@@ -56,12 +65,22 @@ def validate_constraints(request: RRPRequest) -> list[ValidationError]:
                 path="constraints.max_groups",
             )
         )
+    if request.constraints.deadline_ms is not None and request.constraints.deadline_ms <= 0:
+        errors.append(
+            ValidationError(
+                code="invalid_deadline_ms",
+                message="deadline_ms must be > 0 when set",
+                path="constraints.deadline_ms",
+            )
+        )
     return errors
 
 
 def validate_tables(request: RRPRequest) -> list[ValidationError]:
     errors = []
     for i, table in enumerate(request.data.tables):
+        if table.table and table.fields and table.limit > 0:
+            continue
         path_prefix = f"data.tables[{i}]"
         if not table.table:
             errors.append(
@@ -93,6 +112,8 @@ def validate_tables(request: RRPRequest) -> list[ValidationError]:
 def validate_events(request: RRPRequest) -> list[ValidationError]:
     errors = []
     for i, event in enumerate(request.data.events):
+        if event.types and event.fields and event.limit > 0:
+            continue
         path_prefix = f"data.events[{i}]"
         if not event.types:
             errors.append(
@@ -144,3 +165,15 @@ def validate_no_empty_request(request: RRPRequest) -> list[ValidationError]:
             )
         ]
     return []
+
+
+# Built-in rules in the order validate_request has always applied them.
+BUILTIN_RULES: dict[str, ValidationRule] = {
+    "version": validate_version,
+    "as_of": validate_as_of,
+    "constraints": validate_constraints,
+    "tables": validate_tables,
+    "events": validate_events,
+    "groups_count": validate_groups_count,
+    "no_empty_request": validate_no_empty_request,
+}
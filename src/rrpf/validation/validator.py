@@ -1,30 +1,183 @@
+import threading
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
 
 from rrpf.schemas.request import RRPRequest
 from rrpf.validation.errors import ValidationError
-from rrpf.validation.rules import (
-    validate_as_of,
-    validate_constraints,
-    validate_events,
-    validate_groups_count,
-    validate_no_empty_request,
-    validate_tables,
-    validate_version,
-)
+from rrpf.validation.rules import BUILTIN_RULES, ValidationRule
 
+_RULES: dict[str, ValidationRule] = dict(BUILTIN_RULES)
+_default_validator: "CompiledValidator | None" = None
 
-def validate_request(request: RRPRequest) -> list[ValidationError]:
+
+@dataclass(frozen=True)
+class RuleStats:
+    """Counters for one rule of a timed CompiledValidator."""
+
+    calls: int
+    failures: int
+    total_ns: int
+
+    @property
+    def mean_us(self) -> float:
+        """Mean time per call in microseconds (0.0 when never called)."""
+        return self.total_ns / self.calls / 1e3 if self.calls else 0.0
+
+
+class CompiledValidator:
+    """
+    A fixed, ordered set of validation rules.
+
+    validate() runs every rule and returns all errors, in rule order. With
+    fail_fast=True it stops at the first rule that reports errors and returns
+    only that rule's errors, which is enough to reject a request.
+
+    With timed=True, per-rule call, failure and time counters are kept
+    (thread-safe) and reported by rule_stats(). Timing adds two clock reads
+    per rule, so it is off by default.
+    """
+
+    def __init__(self, rules: Mapping[str, ValidationRule], *, timed: bool = False) -> None:
+        self.rule_names = tuple(rules)
+        self.timed = timed
+        self._rules = tuple(rules.values())
+        self._lock = threading.Lock()
+        self._calls = [0] * len(self._rules)
+        self._failures = [0] * len(self._rules)
+        self._total_ns = [0] * len(self._rules)
+
+    def validate(self, request: RRPRequest, *, fail_fast: bool = False) -> list[ValidationError]:
+        if self.timed:
+            return self._validate_timed(request, fail_fast)
+        errors: list[ValidationError] = []
+        for rule in self._rules:
+            found = rule(request)
+            if found:
+                if fail_fast:
+                    return found
+                errors.extend(found)
+        return errors
+
+    __call__ = validate
+
+    def validate_many(
+        self, requests: Iterable[RRPRequest], *, fail_fast: bool = False
+    ) -> list[list[ValidationError]]:
+        """Errors for each request, in input order."""
+        if self.timed:
+            return [self._validate_timed(request, fail_fast) for request in requests]
+        rules = self._rules
+        results: list[list[ValidationError]] = []
+        for request in requests:
+            errors: list[ValidationError] = []
+            for rule in rules:
+                found = rule(request)
+                if found:
+                    if fail_fast:
+                        errors = found
+                        break
+                    errors.extend(found)
+            results.append(errors)
+        return results
+
+    def is_valid(self, request: RRPRequest) -> bool:
+        return not self.validate(request, fail_fast=True)
+
+    def rule_stats(self) -> dict[str, RuleStats]:
+        """Per-rule counters, in rule order (all zero unless timed)."""
+        with self._lock:
+            return {
+                name: RuleStats(calls=calls, failures=failures, total_ns=total_ns)
+                for name, calls, failures, total_ns in zip(
+                    self.rule_names, self._calls, self._failures, self._total_ns, strict=True
+                )
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for counters in (self._calls, self._failures, self._total_ns):
+                counters[:] = [0] * len(counters)
+
+    def _validate_timed(self, request: RRPRequest, fail_fast: bool) -> list[ValidationError]:
+        errors: list[ValidationError] = []
+        # Time outside the lock, then merge the request's samples at once.
+        samples: list[tuple[int, bool, int]] = []
+        clock = time.perf_counter_ns
+        for index, rule in enumerate(self._rules):
+            start = clock()
+            found = rule(request)
+            samples.append((index, bool(found), clock() - start))
+            if found:
+                if fail_fast:
+                    errors = found
+                    break
+                errors.extend(found)
+        with self._lock:
+            for index, failed, elapsed in samples:
+                self._calls[index] += 1
+                self._failures[index] += failed
+                self._total_ns[index] += elapsed
+        return errors
+
+
+def register_rule(name: str, rule: ValidationRule) -> None:
+    """
+    Register (or replace) a validation rule under name. New rules run after
+    the existing ones. Validators compiled before the call are unaffected;
+    validate_request picks the change up.
+    """
+    global _default_validator
+    if not name:
+        raise ValueError("Rule name must be non-empty")
+    _RULES[name] = rule
+    _default_validator = None
+
+
+def unregister_rule(name: str) -> None:
+    """Remove a registered rule; built-in rules cannot be removed."""
+    global _default_validator
+    if name in BUILTIN_RULES:
+        raise ValueError(f"Cannot unregister built-in rule: {name}")
+    if name not in _RULES:
+        raise ValueError(f"Unknown validation rule: {name}")
+    del _RULES[name]
+    _default_validator = None
+
+
+def validation_rules() -> list[str]:
+    """Names of the registered rules, in the order they run."""
+    return list(_RULES)
+
+
+def compile_validator(
+    rules: Mapping[str, ValidationRule] | None = None, *, timed: bool = False
+) -> CompiledValidator:
+    """
+    Build a validator from rules (default: the built-in and registered
+    rules, as currently registered).
+    """
+    return CompiledValidator(_RULES if rules is None else rules, timed=timed)
+
+
+def default_validator() -> CompiledValidator:
+    """The untimed validator behind validate_request, rebuilt on registration."""
+    global _default_validator
+    validator = _default_validator
+    if validator is None:
+        validator = _default_validator = compile_validator()
+    return validator
+
+
+def validate_request(request: RRPRequest, *, fail_fast: bool = False) -> list[ValidationError]:
     """
-    Run all protocol validation rules.
+    Run all protocol validation rules (built-in and registered).
     """
-    errors: list[ValidationError] = []
+    return default_validator().validate(request, fail_fast=fail_fast)
 
-    # Aggregate errors from all rules
-    errors.extend(validate_version(request))
-    errors.extend(validate_as_of(request))
-    errors.extend(validate_constraints(request))
-    errors.extend(validate_tables(request))
-    errors.extend(validate_events(request))
-    errors.extend(validate_groups_count(request))
-    errors.extend(validate_no_empty_request(request))
 
-    return errors
+def validate_many(
+    requests: Iterable[RRPRequest], *, fail_fast: bool = False
+) -> list[list[ValidationError]]:
+    """validate_request for many requests, in input order."""
+    return default_validator().validate_many(requests, fail_fast=fail_fast)
@@ -0,0 +1,39 @@
+"""Request and result factories shared by the payload store tests."""
+
+from datetime import UTC, datetime
+from typing import cast
+
+from rrpf import run_fulfillment
+from rrpf.examples import InMemoryEngine
+from rrpf.fulfillment import FulfillmentEngine, RunResult
+from rrpf.schemas.as_of import AsOf, AsOfMode
+from rrpf.schemas.common import CorrelationID, RequestID
+from rrpf.schemas.constraints import Constraints
+from rrpf.schemas.data_requests import DataRequests, TableRequest
+from rrpf.schemas.intent import Intent, IntentMode
+from rrpf.schemas.request import RRPRequest
+
+
+def create_request(i: int = 0, *, limit: int = 5) -> RRPRequest:
+    """A valid single-table request; request_id is f"req-{i}"."""
+    return RRPRequest(
+        rrp_version="1.0",
+        request_id=cast(RequestID, f"req-{i}"),
+        correlation_id=cast(CorrelationID, "corr-store"),
+        requested_at=datetime(2023, 1, 1, 12, 0, 0, tzinfo=UTC),
+        intent=Intent(name="test_store", mode=IntentMode.SNAPSHOT),
+        as_of=AsOf(mode=AsOfMode.LATEST, timestamp=None),
+        constraints=Constraints(max_total_rows=1000, max_groups=10, fail_on_partial=True),
+        data=DataRequests(
+            tables=[TableRequest(table="t1", fields=["id"], limit=limit, derived=None)],
+            events=[],
+        ),
+    )
+
+
+def fulfilled(
+    count: int, *, engine: FulfillmentEngine | None = None, limit: int = 5
+) -> list[RunResult]:
+    """Results of create_request(0..count-1), fulfilled by engine (InMemoryEngine)."""
+    engine = engine if engine is not None else InMemoryEngine()
+    return [run_fulfillment(create_request(i, limit=limit), engine) for i in range(count)]
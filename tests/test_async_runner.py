@@ -0,0 +1,93 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from typing import cast
+
+import rrpf
+from rrpf.examples import InMemoryEngine
+from rrpf.fulfillment import (
+    FulfillmentResult,
+    SyncEngineAdapter,
+    run_and_store_async,
+    run_fulfillment_async,
+)
+from rrpf.schemas.as_of import AsOf, AsOfMode
+from rrpf.schemas.common import CorrelationID, Digest, RequestID
+from rrpf.schemas.constraints import Constraints
+from rrpf.schemas.data_requests import DataRequests, TableRequest
+from rrpf.schemas.intent import Intent, IntentMode
+from rrpf.schemas.request import RRPRequest
+from rrpf.storage import MemoryPayloadStore
+
+
+class AsyncInMemoryEngine:
+    def __init__(self) -> None:
+        self.inner = InMemoryEngine()
+
+    async def fulfill(self, request: RRPRequest) -> FulfillmentResult:
+        await asyncio.sleep(0)
+        return self.inner.fulfill(request)
+
+
+def _create_request(request_id: str = "req-async") -> RRPRequest:
+    return RRPRequest(
+        rrp_version="1.0",
+        request_id=cast(RequestID, request_id),
+        correlation_id=cast(CorrelationID, "corr-async"),
+        requested_at=datetime(2023, 1, 1, 12, 0, 0, tzinfo=UTC),
+        intent=Intent(name="test_async", mode=IntentMode.SNAPSHOT),
+        as_of=AsOf(mode=AsOfMode.LATEST, timestamp=None),
+        constraints=Constraints(max_total_rows=100, max_groups=10, fail_on_partial=True),
+        data=DataRequests(
+            tables=[TableRequest(table="t1", fields=["id"], limit=5, derived=None)],
+            events=[],
+        ),
+    )
+
+
+def test_async_matches_sync() -> None:
+    req = _create_request()
+    sync_result = rrpf.run_fulfillment(req, InMemoryEngine())
+    async_result = asyncio.run(run_fulfillment_async(req, AsyncInMemoryEngine()))
+
+    assert async_result.digest == sync_result.digest
+    assert async_result.canonical_json == sync_result.canonical_json
+    assert async_result.response.ok is True
+    assert async_result.response.data == sync_result.response.data
+
+
+def test_async_validation_failure() -> None:
+    req = _create_request()
+    object.__setattr__(req, "rrp_version", "2.0")
+
+    result = asyncio.run(run_fulfillment_async(req, AsyncInMemoryEngine()))
+
+    assert result.response.ok is False
+    assert result.response.errors[0].code == "invalid_version"
+    assert result.digest == Digest("")
+
+
+def test_sync_engine_adapter_concurrent_requests() -> None:
+    requests = [_create_request(f"req-{i}") for i in range(20)]
+
+    async def run_all() -> list[rrpf.RunResult]:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            engine = SyncEngineAdapter(InMemoryEngine(), executor=executor)
+            return await asyncio.gather(*(run_fulfillment_async(r, engine) for r in requests))
+
+    results = asyncio.run(run_all())
+
+    assert [r.response.request_id for r in results] == [r.request_id for r in requests]
+    assert all(r.response.ok for r in results)
+
+
+def test_run_and_store_async_roundtrip() -> None:
+    req = _create_request()
+    store = MemoryPayloadStore()
+
+    result = asyncio.run(
+        run_and_store_async(request=req, engine=AsyncInMemoryEngine(), store=store)
+    )
+
+    replayed = rrpf.replay_from_store(digest=result.digest, store=store)
+    assert replayed.data == result.response.data
@@ -0,0 +1,112 @@
+import threading
+import time
+from datetime import UTC, datetime
+from typing import cast
+
+import pytest
+
+import rrpf
+from rrpf.examples import InMemoryEngine
+from rrpf.fulfillment import FulfillmentResult, run_and_store_many, run_fulfillment_many
+from rrpf.schemas.as_of import AsOf, AsOfMode
+from rrpf.schemas.common import CorrelationID, Digest, RequestID
+from rrpf.schemas.constraints import Constraints
+from rrpf.schemas.data_requests import DataRequests, TableRequest
+from rrpf.schemas.intent import Intent, IntentMode
+from rrpf.schemas.request import RRPRequest
+from rrpf.storage import MemoryPayloadStore
+
+
+class SlowFirstEngine:
+    """Delays the first request so completion order differs from input order."""
+
+    def __init__(self) -> None:
+        self.inner = InMemoryEngine()
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def fulfill(self, request: RRPRequest) -> FulfillmentResult:
+        with self.lock:
+            self.calls += 1
+        if request.request_id == "req-0":
+            time.sleep(0.05)
+        return self.inner.fulfill(request)
+
+
+def _create_request(index: int) -> RRPRequest:
+    return RRPRequest(
+        rrp_version="1.0",
+        request_id=cast(RequestID, f"req-{index}"),
+        correlation_id=cast(CorrelationID, "corr-batch"),
+        requested_at=datetime(2023, 1, 1, 12, 0, 0, tzinfo=UTC),
+        intent=Intent(name="test_batch", mode=IntentMode.SNAPSHOT),
+        as_of=AsOf(mode=AsOfMode.LATEST, timestamp=None),
+        constraints=Constraints(max_total_rows=100, max_groups=10, fail_on_partial=True),
+        data=DataRequests(
+            tables=[TableRequest(table=f"t{index}", fields=["id"], limit=5, derived=None)],
+            events=[],
+        ),
+    )
+
+
+def test_ordered_results_match_sequential_runs() -> None:
+    requests = [_create_request(i) for i in range(25)]
+    engine = SlowFirstEngine()
+
+    results = list(run_fulfillment_many(requests, engine, max_workers=4))
+
+    assert [r.response.request_id for r in results] == [r.request_id for r in requests]
+    for req, result in zip(requests, results, strict=True):
+        expected = rrpf.run_fulfillment(req, InMemoryEngine())
+        assert result.digest == expected.digest
+        assert result.response.data == expected.response.data
+
+
+def test_unordered_yields_every_result() -> None:
+    requests = [_create_request(i) for i in range(10)]
+
+    results = list(run_fulfillment_many(requests, SlowFirstEngine(), max_workers=4, ordered=False))
+
+    assert sorted(r.response.request_id for r in results) == sorted(r.request_id for r in requests)
+    # The delayed first request should not hold back the others.
+    assert results[0].response.request_id != "req-0"
+
+
+def test_invalid_requests_skip_engine() -> None:
+    requests = [_create_request(i) for i in range(3)]
+    object.__setattr__(requests[1], "rrp_version", "2.0")
+    engine = SlowFirstEngine()
+
+    results = list(run_fulfillment_many(requests, engine, max_workers=2))
+
+    assert engine.calls == 2
+    assert results[1].response.ok is False
+    assert results[1].digest == Digest("")
+
+
+def test_run_and_store_many_persists_valid_results() -> None:
+    requests = [_create_request(i) for i in range(7)]
+    object.__setattr__(requests[3], "rrp_version", "2.0")
+    store = MemoryPayloadStore()
+
+    results = list(
+        run_and_store_many(
+            requests=requests, engine=InMemoryEngine(), store=store, max_workers=3, batch_size=2
+        )
+    )
+
+    assert len(results) == 7
+    for result in results:
+        if result.digest:
+            assert rrpf.replay_from_store(digest=result.digest, store=store).data == (
+                result.response.data
+            )
+
+
+def test_run_and_store_many_rejects_bad_batch_size() -> None:
+    with pytest.raises(ValueError):
+        list(
+            run_and_store_many(
+                requests=[], engine=InMemoryEngine(), store=MemoryPayloadStore(), batch_size=0
+            )
+        )
@@ -0,0 +1,91 @@
+from collections.abc import Iterable
+from pathlib import Path
+
+import pytest
+
+from rrpf.examples import InMemoryEngine
+from rrpf.fulfillment import run_and_store_many
+from rrpf.schemas.common import Digest
+from rrpf.schemas.response import RRPResponse
+from rrpf.storage import (
+    BatchPayloadStore,
+    FilesystemPayloadStore,
+    MemoryPayloadStore,
+    PayloadStore,
+    SegmentPayloadStore,
+    SQLitePayloadStore,
+    TieredPayloadStore,
+    replay_many_from_store,
+    store_many,
+)
+from tests.helpers import create_request, fulfilled
+
+
+class SingleItemStore:
+    """Implements only the base PayloadStore protocol."""
+
+    def __init__(self) -> None:
+        self._payloads: dict[Digest, RRPResponse] = {}
+
+    def store(self, *, digest: Digest, response: RRPResponse) -> None:
+        self._payloads[digest] = response
+
+    def load(self, *, digest: Digest) -> RRPResponse:
+        return self._payloads[digest]
+
+
+class RecordingStore(MemoryPayloadStore):
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: list[int] = []
+
+    def store_many(self, *, items: Iterable[tuple[Digest, RRPResponse]]) -> None:
+        batch = list(items)
+        self.batches.append(len(batch))
+        super().store_many(items=batch)
+
+
+def _stores(tmp_path: Path) -> list[PayloadStore]:
+    return [
+        SingleItemStore(),
+        MemoryPayloadStore(),
+        FilesystemPayloadStore(str(tmp_path / "fs"), shard_depth=1),
+        SegmentPayloadStore(str(tmp_path / "segments"), max_segment_bytes=4096, fsync=False),
+        SQLitePayloadStore(str(tmp_path / "payloads.db"), batch_size=4),
+        TieredPayloadStore(
+            hot=MemoryPayloadStore(max_entries=3),
+            cold=FilesystemPayloadStore(str(tmp_path / "cold")),
+        ),
+    ]
+
+
+def test_bulk_roundtrip_on_every_store(tmp_path: Path) -> None:
+    results = fulfilled(10)
+    digests = [r.digest for r in reversed(results)] + [results[0].digest]
+
+    for store in _stores(tmp_path):
+        store_many(store, items=((r.digest, r.response) for r in results))
+        replayed = replay_many_from_store(digests=digests, store=store)
+
+        assert [r.request_id for r in replayed] == [
+            f"req-{i}" for i in [*range(9, -1, -1), 0]
+        ], type(store).__name__
+        assert replayed[0].data == results[-1].response.data
+        with pytest.raises(KeyError):
+            replay_many_from_store(digests=[results[0].digest, Digest("missing")], store=store)
+
+
+def test_batch_protocol_detection() -> None:
+    assert isinstance(MemoryPayloadStore(), BatchPayloadStore)
+    assert not isinstance(SingleItemStore(), BatchPayloadStore)
+
+
+def test_run_and_store_many_writes_in_bulk() -> None:
+    store = RecordingStore()
+    requests = [create_request(i) for i in range(7)]
+    results = list(
+        run_and_store_many(requests=requests, engine=InMemoryEngine(), store=store, batch_size=3)
+    )
+
+    assert store.batches == [3, 3, 1]
+    assert len(replay_many_from_store(digests=[r.digest for r in results], store=store)) == 7
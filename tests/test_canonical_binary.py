@@ -0,0 +1,212 @@
+import math
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, cast
+
+import pytest
+
+from rrpf import run_fulfillment
+from rrpf.examples import InMemoryEngine
+from rrpf.fulfillment import compute_content_digest, run_or_replay
+from rrpf.hashing import (
+    BINARY_MAGIC,
+    canonical_digest,
+    compute_binary_digest,
+    compute_digest,
+    decode_canonical_binary,
+    encode_canonical,
+    encode_canonical_binary,
+    to_canonical_json,
+)
+from rrpf.schemas.as_of import AsOf, AsOfMode
+from rrpf.schemas.common import CorrelationID, RequestID
+from rrpf.schemas.constraints import Constraints
+from rrpf.schemas.data_requests import DataRequests, EventRequest, TableRequest
+from rrpf.schemas.intent import Intent, IntentMode
+from rrpf.schemas.request import RRPRequest
+from rrpf.storage import (
+    FilesystemPayloadStore,
+    MemoryPayloadStore,
+    PayloadStore,
+    SegmentPayloadStore,
+    SQLitePayloadStore,
+    decode_response,
+    encode_response,
+    scrub_store,
+)
+
+
+def _create_request(pinned: bool = False) -> RRPRequest:
+    return RRPRequest(
+        rrp_version="1.0",
+        request_id=cast(RequestID, "req-binary"),
+        correlation_id=cast(CorrelationID, "corr-binary"),
+        requested_at=datetime(2023, 1, 1, 12, 0, 0, tzinfo=UTC),
+        intent=Intent(name="test_binary", mode=IntentMode.SNAPSHOT),
+        as_of=(
+            AsOf(mode=AsOfMode.TIMESTAMP, timestamp=datetime(2023, 1, 1, tzinfo=UTC))
+            if pinned
+            else AsOf(mode=AsOfMode.LATEST, timestamp=None)
+        ),
+        constraints=Constraints(max_total_rows=100, max_groups=10, fail_on_partial=True),
+        data=DataRequests(
+            tables=[TableRequest(table="users", fields=["id", "name"], limit=10, derived=None)],
+            events=[EventRequest(types=["login"], fields=["ts"], limit=10)],
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    ("value", "encoded"),
+    [
+        (0, "00"),
+        (23, "17"),
+        (24, "1818"),
+        (256, "190100"),
+        (2**32, "1b0000000100000000"),
+        (-1, "20"),
+        (-25, "3818"),
+        (2**64, "c249010000000000000000"),
+        (-(2**64) - 1, "c349010000000000000000"),
+        (1.5, "f93e00"),
+        (-0.0, "f98000"),
+        (100000.0, "fa47c35000"),
+        (0.1, "fb3fb999999999999a"),
+        (float("inf"), "f97c00"),
+        (False, "f4"),
+        (True, "f5"),
+        (None, "f6"),
+        ("", "60"),
+        ("é", "62c3a9"),
+        ([1, [2]], "82018102"),
+        # Keys sort by encoded bytes: shorter first, then bytewise.
+        ({"b": 1, "aa": 2, "a": 3}, "a361610361620162616102"),
+    ],
+)
+def test_byte_layout(value: Any, encoded: str) -> None:
+    raw = encode_canonical_binary(value)
+    assert raw == BINARY_MAGIC + bytes.fromhex(encoded)
+    decoded = decode_canonical_binary(raw)
+    assert decoded == value and type(decoded) is type(value)
+
+
+def test_nan_has_one_encoding() -> None:
+    raw = encode_canonical_binary(float("nan"))
+    assert raw == BINARY_MAGIC + bytes.fromhex("f97e00")
+    assert math.isnan(decode_canonical_binary(raw))
+
+
+def test_deterministic_and_json_compatible() -> None:
+    rows = [{"z": i, "name": f"é{i}", "score": i / 3, "tags": ("a", None)} for i in range(300)]
+    left = {"table:t": {"rows": rows}, "meta": {"b": 1, "a": [True, 2**70]}}
+    right = {
+        "meta": {"a": [True, 2**70], "b": 1},
+        "table:t": {"rows": [dict(reversed(row.items())) for row in rows]},
+    }
+    assert encode_canonical_binary(left) == encode_canonical_binary(right)
+    # Tuples decode as lists, as in JSON.
+    assert decode_canonical_binary(encode_canonical_binary(left)) == {
+        "table:t": {"rows": [{**row, "tags": ["a", None]} for row in rows]},
+        "meta": {"b": 1, "a": [True, 2**70]},
+    }
+    assert len(encode_canonical_binary(left)) < len(to_canonical_json(left).encode("utf-8"))
+
+
+@pytest.mark.parametrize(
+    "cell",
+    [0, 23, 24, 255, 256, 65535, 65536, -1, "", "é" * 11, "x" * 24, "x" * 255, "x" * 256]
+    + ["x" * 70_000, None, True, 1.5, [1], {"k": "v"}],
+)
+def test_row_cells_round_trip(cell: Any) -> None:
+    data = {"rows": [{"a": i, "z": cell} for i in range(3)]}
+    raw = encode_canonical_binary(data)
+    assert decode_canonical_binary(raw) == data
+    with pytest.raises(ValueError, match="Truncated"):
+        decode_canonical_binary(raw[:-1])
+
+
+def test_rejects_invalid_input() -> None:
+    with pytest.raises(TypeError):
+        encode_canonical_binary({1: "x"})
+    with pytest.raises(TypeError):
+        encode_canonical_binary({"x": object()})
+    with pytest.raises(ValueError, match="Not a canonical binary"):
+        decode_canonical_binary(b'{"a":1}')
+    raw = encode_canonical_binary({"a": "hello"})
+    with pytest.raises(ValueError, match="Truncated"):
+        decode_canonical_binary(raw[:-2])
+    with pytest.raises(ValueError, match="Trailing"):
+        decode_canonical_binary(raw + b"\x00")
+
+
+def test_digests() -> None:
+    data = {"b": [1, 2], "a": "x"}
+    digest = compute_binary_digest(data)
+    assert digest == "cbor-sha256:" + compute_digest(encode_canonical_binary(data))
+    assert compute_binary_digest(data, algorithm="blake2b").startswith("cbor-blake2b:")
+    assert canonical_digest(data) == compute_digest(to_canonical_json(data))
+    assert canonical_digest(data, encoding="binary") == digest
+    assert encode_canonical(data, encoding="json") == to_canonical_json(data).encode("utf-8")
+    with pytest.raises(ValueError, match="Unknown canonical encoding"):
+        canonical_digest(data, encoding="xml")  # type: ignore[arg-type]
+
+
+def test_response_round_trip() -> None:
+    response = run_fulfillment(_create_request(), InMemoryEngine()).response
+    raw = encode_response(response, encoding="binary")
+    assert raw.startswith(BINARY_MAGIC)
+    assert decode_response(raw) == response
+    assert decode_response(encode_response(response)) == response
+    assert len(raw) < len(encode_response(response))
+
+
+@pytest.mark.parametrize("kind", ["filesystem", "segment", "sqlite"])
+def test_stores_with_binary_encoding(tmp_path: Path, kind: str) -> None:
+    result = run_fulfillment(_create_request(), InMemoryEngine())
+    store: PayloadStore
+    if kind == "filesystem":
+        store = FilesystemPayloadStore(str(tmp_path), codec="zlib", encoding="binary")
+    elif kind == "segment":
+        store = SegmentPayloadStore(str(tmp_path), encoding="binary")
+    else:
+        store = SQLitePayloadStore(str(tmp_path / "payloads.db"), encoding="binary")
+    store.store(digest=result.digest, response=result.response)
+    assert store.load(digest=result.digest) == result.response
+
+
+def test_filesystem_mixed_encodings(tmp_path: Path) -> None:
+    json_result = run_fulfillment(_create_request(), InMemoryEngine())
+    binary_result = run_fulfillment(_create_request(pinned=True), InMemoryEngine())
+    FilesystemPayloadStore(str(tmp_path)).store(
+        digest=json_result.digest, response=json_result.response
+    )
+    store = FilesystemPayloadStore(str(tmp_path), encoding="binary")
+    store.store(digest=binary_result.digest, response=binary_result.response)
+
+    path = tmp_path / f"{binary_result.digest}.json"
+    assert path.read_bytes().startswith(BINARY_MAGIC)
+    assert not path.with_suffix(".idx").exists()
+    assert store.load(digest=json_result.digest) == json_result.response
+    assert store.load(digest=binary_result.digest) == binary_result.response
+    with store.open_payload(digest=binary_result.digest) as reader:
+        assert reader.rows("table:users") == binary_result.response.data["table:users"]["rows"]
+
+    assert scrub_store(str(tmp_path), workers=1).ok
+    path.write_bytes(path.read_bytes().replace(b"login", b"logim"))
+    report = scrub_store(str(tmp_path), workers=1)
+    assert [issue.digest for issue in report.issues] == [binary_result.digest]
+
+
+def test_invalid_store_encoding(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="Unknown encoding"):
+        FilesystemPayloadStore(str(tmp_path), encoding="xml")  # type: ignore[arg-type]
+
+
+def test_run_or_replay_with_binary_content_digests() -> None:
+    request = _create_request(pinned=True)
+    content_digest = compute_content_digest(request, encoding="binary")
+    assert content_digest.startswith("cbor-sha256:")
+
+    store = MemoryPayloadStore()
+    result = run_or_replay(request, InMemoryEngine(), store=store, digest_encoding="binary")
+    assert store.load(digest=content_digest).data == result.response.data
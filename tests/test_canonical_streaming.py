@@ -0,0 +1,103 @@
+import dataclasses
+import io
+from datetime import UTC, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, cast
+
+import pytest
+
+import rrpf
+from rrpf.examples import InMemoryEngine
+from rrpf.hashing import iter_canonical_json, write_canonical_json
+from rrpf.hashing.canonical_binary import CanonicalEncoding
+from rrpf.schemas.as_of import AsOf, AsOfMode
+from rrpf.schemas.common import CorrelationID, RequestID
+from rrpf.schemas.constraints import Constraints
+from rrpf.schemas.data_requests import DataRequests, EventRequest, TableRequest
+from rrpf.schemas.intent import Intent, IntentMode
+from rrpf.schemas.request import RRPRequest
+from rrpf.storage import FilesystemPayloadStore
+from rrpf.storage.serialization import serialize_response
+
+DOCUMENTS: list[dict[str, Any]] = [
+    {},
+    {"empty": {}, "list": [], "tuple": (1, 2)},
+    {"b": 1, "a": [1, 2.5, -0.0, 1e300, None, True, False, "x"], "é": "☃ \"quoted\"\n"},
+    {"rows": [{"id": i, "name": f"n{i}", "tags": ["a", "b"]} for i in range(600)]},
+    {"rows": [{"id": i} for i in range(1000)] + [[1, [2, [3]]], "tail", {"x": {"y": {}}}]},
+    {"nested": [[{"a": [{"b": [1]}]}] * 3, {2: "int key", 1: [{"c": 1}]}]},
+    {"big": [{"id": i, "v": i * 1.5} for i in range(10_000)], "z": 1},
+]
+
+
+def _create_request() -> RRPRequest:
+    return RRPRequest(
+        rrp_version="1.0",
+        request_id=cast(RequestID, "req-stream-json"),
+        correlation_id=cast(CorrelationID, "corr-stream-json"),
+        requested_at=datetime(2023, 1, 1, 12, 0, 0, tzinfo=UTC),
+        intent=Intent(name="test_stream_json", mode=IntentMode.SNAPSHOT),
+        as_of=AsOf(mode=AsOfMode.LATEST, timestamp=None),
+        constraints=Constraints(max_total_rows=100, max_groups=10, fail_on_partial=True),
+        data=DataRequests(
+            tables=[TableRequest(table="t1", fields=["id"], limit=5, derived=None)],
+            events=[EventRequest(types=["click"], fields=["id"], limit=5)],
+        ),
+    )
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+def test_stream_is_byte_identical(document: dict[str, Any], chunk_size: int) -> None:
+    expected = rrpf.to_canonical_json(document).encode("utf-8")
+    assert b"".join(iter_canonical_json(document, chunk_size=chunk_size)) == expected
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_write_hashes_and_writes_in_one_pass(document: dict[str, Any]) -> None:
+    sink = io.BytesIO()
+    streamed = write_canonical_json(document, sink)
+
+    canonical = rrpf.to_canonical_json(document)
+    assert sink.getvalue() == canonical.encode("utf-8")
+    assert streamed.digest == rrpf.compute_digest(canonical)
+    assert streamed.size_bytes == len(sink.getvalue())
+
+
+def test_request_digest_matches() -> None:
+    canonical = rrpf.canonicalize_request(_create_request())
+    assert write_canonical_json(canonical).digest == rrpf.compute_digest(
+        rrpf.to_canonical_json(canonical)
+    )
+
+
+def test_chunks_are_bounded() -> None:
+    document = {"rows": [{"id": i, "name": "x" * 20} for i in range(20_000)]}
+    chunks = list(iter_canonical_json(document, chunk_size=4096))
+    assert len(chunks) > 50
+    assert max(len(chunk) for chunk in chunks) < 64 * 1024
+
+
+def test_filesystem_store_writes_canonical_bytes(tmp_path: Path) -> None:
+    result = rrpf.run_fulfillment(_create_request(), InMemoryEngine())
+    store = FilesystemPayloadStore(str(tmp_path))
+    store.store(digest=result.digest, response=result.response)
+
+    written = (tmp_path / f"{result.digest}.json").read_bytes()
+    expected = rrpf.to_canonical_json(serialize_response(result.response)).encode("utf-8")
+    assert written == expected
+    assert store.compression_stats().raw_bytes == len(expected)
+
+
+@pytest.mark.parametrize("encoding", ["json", "binary"])
+def test_failed_store_leaves_no_temp_file(tmp_path: Path, encoding: CanonicalEncoding) -> None:
+    result = rrpf.run_fulfillment(_create_request(), InMemoryEngine())
+    response = dataclasses.replace(result.response, data={"t1": [{"id": Decimal("1.5")}]})
+    store = FilesystemPayloadStore(str(tmp_path), encoding=encoding)
+
+    with pytest.raises(TypeError):
+        store.store(digest=result.digest, response=response)
+
+    assert list(tmp_path.rglob("*")) == []
+    assert store.compression_stats().payloads == 0
@@ -1,9 +1,18 @@
-from datetime import UTC, datetime
+import dataclasses
+from datetime import UTC, datetime, timedelta, timezone
 from typing import cast
+from zoneinfo import ZoneInfo
 
 import pytest
 
 import rrpf
+from rrpf.normalization import (
+    canonical_request_content_json,
+    canonical_request_json,
+    canonicalization_cache_stats,
+    canonicalize_request_content,
+    clear_canonicalization_cache,
+)
 from rrpf.schemas.as_of import AsOfMode
 from rrpf.schemas.common import CorrelationID, RequestID
 from rrpf.schemas.intent import IntentMode
@@ -208,3 +217,87 @@ def test_no_mutation() -> None:
     # Verify strict equality
     assert req.data.tables == original_tables
     assert req.data.tables[0].fields == original_fields_0
+
+
+def _spliced_matches(req: rrpf.RRPRequest) -> None:
+    assert canonical_request_json(req) == rrpf.to_canonical_json(rrpf.canonicalize_request(req))
+    assert canonical_request_content_json(req) == rrpf.to_canonical_json(
+        canonicalize_request_content(req)
+    )
+
+
+def test_spliced_json_matches_full_encoding() -> None:
+    req = _create_sample_request()
+    _spliced_matches(req)
+    _spliced_matches(req)  # now from cache
+
+    _spliced_matches(
+        dataclasses.replace(
+            req,
+            correlation_id=None,
+            requested_at=datetime(2023, 1, 1, 12, 0, 0),  # naive, taken as UTC
+            intent=rrpf.Intent(name="é \"quoted\"", mode=IntentMode.ANALYSIS),
+            as_of=rrpf.AsOf(
+                mode=AsOfMode.TIMESTAMP,
+                timestamp=datetime(2023, 6, 1, 12, 0, tzinfo=timezone(timedelta(hours=2))),
+            ),
+            constraints=rrpf.Constraints(100, 10, False, deadline_ms=250),
+            data=rrpf.DataRequests([], []),
+        )
+    )
+
+
+def test_memo_keeps_differently_typed_values_apart() -> None:
+    req = _create_sample_request()
+    as_float = dataclasses.replace(
+        req,
+        constraints=rrpf.Constraints(100.0, 10, 1),  # type: ignore[arg-type]
+    )
+    assert canonical_request_json(req) != canonical_request_json(as_float)
+    _spliced_matches(as_float)
+
+
+def test_memo_keeps_fold_apart() -> None:
+    # 01:30 happens twice in New York on 2024-11-03: first EDT, then EST.
+    new_york = ZoneInfo("America/New_York")
+    req = _create_sample_request()
+    expected = {0: "2024-11-03T05:30:00Z", 1: "2024-11-03T06:30:00Z"}
+    for fold, instant in expected.items():
+        ts = datetime(2024, 11, 3, 1, 30, tzinfo=new_york, fold=fold)
+        folded = dataclasses.replace(
+            req, requested_at=ts, as_of=rrpf.AsOf(mode=AsOfMode.TIMESTAMP, timestamp=ts)
+        )
+        canonical = rrpf.canonicalize_request(folded)
+        assert canonical["as_of"]["timestamp"] == instant
+        assert canonical["requested_at"] == instant
+        _spliced_matches(folded)
+
+
+def test_cached_sub_forms_are_not_shared() -> None:
+    req = _create_sample_request()
+    first = rrpf.canonicalize_request(req)
+    first["data"]["tables"][0]["fields"].append("mutated")
+    first["intent"]["name"] = "mutated"
+    first["as_of"]["mode"] = "mutated"
+
+    second = rrpf.canonicalize_request(req)
+    assert "mutated" not in second["data"]["tables"][0]["fields"]
+    assert second["intent"]["name"] == "audit"
+    assert second["as_of"]["mode"] == "latest"
+    _spliced_matches(req)
+
+
+def test_canonicalization_cache_stats() -> None:
+    clear_canonicalization_cache()
+    req = _create_sample_request()
+    canonical_request_json(req)
+    canonical_request_json(req)
+
+    stats = canonicalization_cache_stats()
+    assert stats["table"].misses == 2 and stats["table"].hits == 2
+    assert stats["event"].misses == 1 and stats["event"].hits == 1
+    assert stats["intent"].hit_rate == 0.5
+    assert all(s.evictions == 0 for s in stats.values())
+
+    clear_canonicalization_cache()
+    assert canonicalization_cache_stats()["table"].misses == 0
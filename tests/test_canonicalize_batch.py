@@ -0,0 +1,101 @@
+from datetime import UTC, datetime
+from typing import cast
+
+import pytest
+
+import rrpf
+from rrpf.hashing import canonical_digest
+from rrpf.normalization import canonicalize_many, digest_many
+from rrpf.schemas.as_of import AsOfMode
+from rrpf.schemas.common import CorrelationID, RequestID
+from rrpf.schemas.intent import IntentMode
+
+
+def _create_requests(count: int) -> list[rrpf.RRPRequest]:
+    tables = [
+        rrpf.TableRequest(table="users", fields=["id", "email"], limit=10, derived=None),
+        rrpf.TableRequest(table="accounts", fields=["id", "balance"], limit=5, derived=["t"]),
+    ]
+    events = [rrpf.EventRequest(types=["logout", "login"], fields=["ts"], limit=50)]
+    return [
+        rrpf.RRPRequest(
+            rrp_version="1.0",
+            request_id=cast(RequestID, f"req-{i}"),
+            correlation_id=cast(CorrelationID, "corr-batch"),
+            requested_at=datetime(2023, 1, 1, 12, i % 60, 0, tzinfo=UTC),
+            intent=rrpf.Intent(name=f"intent-{i % 3}", mode=IntentMode.SNAPSHOT),
+            as_of=rrpf.AsOf(mode=AsOfMode.LATEST, timestamp=None),
+            constraints=rrpf.Constraints(100, 10, i % 2 == 0),
+            data=rrpf.DataRequests(tables=tables[: 1 + i % 2], events=events[: i % 2]),
+        )
+        for i in range(count)
+    ]
+
+
+def _expected_digest(request: rrpf.RRPRequest) -> str:
+    return rrpf.compute_digest(rrpf.to_canonical_json(rrpf.canonicalize_request(request)))
+
+
+def test_digest_many_matches_single_requests() -> None:
+    requests = _create_requests(50)
+    assert digest_many(requests) == [_expected_digest(r) for r in requests]
+    # Any iterable, consumed once.
+    assert digest_many(iter(requests)) == [_expected_digest(r) for r in requests]
+    assert digest_many([]) == []
+
+
+def test_canonicalize_many_matches_single_requests() -> None:
+    requests = _create_requests(20)
+    assert canonicalize_many(requests) == [rrpf.canonicalize_request(r) for r in requests]
+
+
+def test_algorithm_and_encoding() -> None:
+    requests = _create_requests(5)
+    assert digest_many(requests, algorithm="blake2b") == [
+        rrpf.compute_digest(
+            rrpf.to_canonical_json(rrpf.canonicalize_request(r)), algorithm="blake2b"
+        )
+        for r in requests
+    ]
+    assert digest_many(requests, encoding="binary") == [
+        canonical_digest(rrpf.canonicalize_request(r), encoding="binary") for r in requests
+    ]
+
+
+def test_process_pool_keeps_input_order() -> None:
+    requests = _create_requests(120)
+    expected = [_expected_digest(r) for r in requests]
+    assert digest_many(requests, workers=2, parallel_threshold=10, chunk_size=7) == expected
+    assert canonicalize_many(
+        requests, workers=2, parallel_threshold=10, chunk_size=50
+    ) == [rrpf.canonicalize_request(r) for r in requests]
+
+
+def test_small_batches_stay_in_process(monkeypatch: pytest.MonkeyPatch) -> None:
+    import rrpf.normalization.batch as batch
+
+    def fail(*args: object, **kwargs: object) -> None:
+        raise AssertionError("process pool used")
+
+    monkeypatch.setattr(batch, "ProcessPoolExecutor", fail)
+    requests = _create_requests(9)
+    assert digest_many(requests, workers=4, parallel_threshold=10) == [
+        _expected_digest(r) for r in requests
+    ]
+
+
+def test_invalid_arguments() -> None:
+    requests = _create_requests(1)
+    with pytest.raises(ValueError, match="workers"):
+        digest_many(requests, workers=0)
+    with pytest.raises(ValueError, match="chunk_size"):
+        digest_many(requests, chunk_size=0)
+    with pytest.raises(ValueError, match="parallel_threshold"):
+        canonicalize_many(requests, parallel_threshold=-1)
+
+
+def test_mutating_results_does_not_leak() -> None:
+    requests = _create_requests(2)
+    first = canonicalize_many(requests)
+    first[0]["data"]["tables"][0]["fields"].append("x")
+    assert canonicalize_many(requests) == [rrpf.canonicalize_request(r) for r in requests]
@@ -0,0 +1,150 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from typing import cast
+
+import pytest
+
+from rrpf.examples import InMemoryEngine
+from rrpf.fulfillment import (
+    AsyncCoalescingEngine,
+    CoalescingEngine,
+    FulfillmentResult,
+    RunResult,
+    run_fulfillment,
+    run_fulfillment_async,
+)
+from rrpf.hashing import verify_sections
+from rrpf.schemas.as_of import AsOf, AsOfMode
+from rrpf.schemas.common import CorrelationID, RequestID
+from rrpf.schemas.constraints import Constraints
+from rrpf.schemas.data_requests import DataRequests, TableRequest
+from rrpf.schemas.intent import Intent, IntentMode
+from rrpf.schemas.request import RRPRequest
+
+
+class SlowEngine:
+    def __init__(self, fail: bool = False) -> None:
+        self.inner = InMemoryEngine()
+        self.calls = 0
+        self.fail = fail
+        self.lock = threading.Lock()
+
+    def fulfill(self, request: RRPRequest) -> FulfillmentResult:
+        with self.lock:
+            self.calls += 1
+        time.sleep(0.2)
+        if self.fail:
+            raise RuntimeError("backend down")
+        return self.inner.fulfill(request)
+
+
+class AsyncSlowEngine:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def fulfill(self, request: RRPRequest) -> FulfillmentResult:
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return InMemoryEngine().fulfill(request)
+
+
+def _create_request(request_id: str, table: str = "t1") -> RRPRequest:
+    return RRPRequest(
+        rrp_version="1.0",
+        request_id=cast(RequestID, request_id),
+        correlation_id=cast(CorrelationID, "corr-coalesce"),
+        requested_at=datetime.now(UTC),
+        intent=Intent(name="test_coalesce", mode=IntentMode.SNAPSHOT),
+        as_of=AsOf(mode=AsOfMode.LATEST, timestamp=None),
+        constraints=Constraints(max_total_rows=100, max_groups=10, fail_on_partial=True),
+        data=DataRequests(
+            tables=[TableRequest(table=table, fields=["id"], limit=5, derived=None)],
+            events=[],
+        ),
+    )
+
+
+def _run_concurrently(engine: CoalescingEngine, requests: list[RRPRequest]) -> list[RunResult]:
+    barrier = threading.Barrier(len(requests))
+
+    def call(request: RRPRequest) -> RunResult:
+        barrier.wait()
+        return run_fulfillment(request, engine)
+
+    with ThreadPoolExecutor(max_workers=len(requests)) as executor:
+        return list(executor.map(call, requests))
+
+
+def test_identical_requests_share_one_engine_call() -> None:
+    inner = SlowEngine()
+    engine = CoalescingEngine(inner)
+    requests = [_create_request(f"req-{i}") for i in range(8)]
+
+    results = _run_concurrently(engine, requests)
+
+    assert inner.calls == 1
+    assert [r.response.request_id for r in results] == [r.request_id for r in requests]
+    assert len({r.digest for r in results}) == len(requests)
+    assert all(r.response.provenance.inputs_digest == r.digest for r in results)
+    stats = engine.stats()
+    assert stats.calls == 8
+    assert stats.coalesced == 7
+    assert stats.engine_calls == 1
+
+
+def _assert_independent(results: list[RunResult]) -> None:
+    # Emptying one caller's rows leaves the others' data and digests intact.
+    first, *others = results
+    first.response.data["table:t1"]["rows"].clear()
+    for other in others:
+        assert other.response.data["table:t1"]["rows"]
+        digests = other.response.provenance.section_digests
+        assert digests is not None
+        assert verify_sections(other.response.data, digests) == []
+
+
+def test_coalesced_callers_get_independent_data() -> None:
+    engine = CoalescingEngine(SlowEngine())
+    results = _run_concurrently(engine, [_create_request(f"req-{i}") for i in range(4)])
+    assert engine.stats().coalesced == 3
+    _assert_independent(results)
+
+
+def test_distinct_content_is_not_coalesced() -> None:
+    inner = SlowEngine()
+    engine = CoalescingEngine(inner)
+
+    _run_concurrently(engine, [_create_request("a", "t1"), _create_request("b", "t2")])
+
+    assert inner.calls == 2
+    assert engine.stats().coalesced == 0
+
+
+def test_errors_reach_every_waiter_and_are_not_cached() -> None:
+    inner = SlowEngine(fail=True)
+    engine = CoalescingEngine(inner)
+
+    with pytest.raises(RuntimeError, match="backend down"):
+        _run_concurrently(engine, [_create_request(f"req-{i}") for i in range(3)])
+
+    inner.fail = False
+    assert run_fulfillment(_create_request("later"), engine).response.ok is True
+
+
+def test_async_coalescing() -> None:
+    inner = AsyncSlowEngine()
+    engine = AsyncCoalescingEngine(inner)
+    requests = [_create_request(f"req-{i}") for i in range(5)]
+
+    async def run_all() -> list[RunResult]:
+        return await asyncio.gather(*(run_fulfillment_async(r, engine) for r in requests))
+
+    results = asyncio.run(run_all())
+
+    assert inner.calls == 1
+    assert engine.stats().coalesced == 4
+    assert [r.response.request_id for r in results] == [r.request_id for r in requests]
+    _assert_independent(results)
@@ -0,0 +1,173 @@
+from collections.abc import Iterator
+from dataclasses import replace
+from datetime import UTC, datetime
+from typing import cast
+
+import pytest
+
+from rrpf.schemas import (
+    AsOf,
+    Constraints,
+    DataRequests,
+    EventRequest,
+    Intent,
+    RRPRequest,
+    TableRequest,
+)
+from rrpf.schemas.as_of import AsOfMode
+from rrpf.schemas.common import CorrelationID, RequestID
+from rrpf.schemas.intent import IntentMode
+from rrpf.validation import (
+    BUILTIN_RULES,
+    ValidationError,
+    compile_validator,
+    register_rule,
+    unregister_rule,
+    validate_many,
+    validate_request,
+    validation_rules,
+)
+
+
+def _create_valid_request() -> RRPRequest:
+    return RRPRequest(
+        rrp_version="1.0",
+        request_id=cast(RequestID, "req-compiled"),
+        correlation_id=cast(CorrelationID, "corr-compiled"),
+        requested_at=datetime(2023, 1, 1, 12, 0, 0, tzinfo=UTC),
+        intent=Intent(name="test", mode=IntentMode.SNAPSHOT),
+        as_of=AsOf(mode=AsOfMode.LATEST, timestamp=None),
+        constraints=Constraints(max_total_rows=100, max_groups=10, fail_on_partial=True),
+        data=DataRequests(
+            tables=[TableRequest(table="t1", fields=["f1"], limit=10, derived=None)],
+            events=[EventRequest(types=["login"], fields=["ts"], limit=5)],
+        ),
+    )
+
+
+def _create_invalid_request() -> RRPRequest:
+    # Fails the version, as_of and tables rules, in that order.
+    request = _create_valid_request()
+    return replace(
+        request,
+        rrp_version="2.0",
+        as_of=AsOf(mode=AsOfMode.TIMESTAMP, timestamp=None),
+        data=DataRequests(
+            tables=[TableRequest(table="", fields=[], limit=0, derived=None)], events=[]
+        ),
+    )
+
+
+def _create_forbidden_request() -> RRPRequest:
+    intent = Intent(name="forbidden", mode=IntentMode.SNAPSHOT)
+    return replace(_create_valid_request(), intent=intent)
+
+
+def _forbid_intent(request: RRPRequest) -> list[ValidationError]:
+    if request.intent.name == "forbidden":
+        return [ValidationError(code="forbidden_intent", message="no", path="intent.name")]
+    return []
+
+
+@pytest.fixture
+def registered_rule() -> Iterator[str]:
+    register_rule("forbidden_intent", _forbid_intent)
+    yield "forbidden_intent"
+    unregister_rule("forbidden_intent")
+
+
+def test_collect_all_matches_rule_order() -> None:
+    request = _create_invalid_request()
+    expected = [error for rule in BUILTIN_RULES.values() for error in rule(request)]
+    assert [e.code for e in validate_request(request)] == [
+        "invalid_version",
+        "missing_timestamp",
+        "empty_table_name",
+        "empty_fields",
+        "invalid_limit",
+    ]
+    assert validate_request(request) == expected
+    assert validate_request(_create_valid_request()) == []
+
+
+def test_fail_fast_stops_at_first_failing_rule() -> None:
+    request = _create_invalid_request()
+    assert [e.code for e in validate_request(request, fail_fast=True)] == ["invalid_version"]
+
+    validator = compile_validator()
+    tables_only = replace(_create_valid_request(), data=request.data)
+    assert [e.code for e in validator.validate(tables_only, fail_fast=True)] == [
+        "empty_table_name",
+        "empty_fields",
+        "invalid_limit",
+    ]
+    assert validator.is_valid(_create_valid_request())
+    assert not validator.is_valid(tables_only)
+
+
+def test_validate_many() -> None:
+    valid, invalid = _create_valid_request(), _create_invalid_request()
+    requests = [valid, invalid, valid]
+    assert validate_many(requests) == [validate_request(r) for r in requests]
+    assert validate_many(iter(requests), fail_fast=True) == [
+        validate_request(r, fail_fast=True) for r in requests
+    ]
+    assert validate_many([]) == []
+
+
+def test_registered_rules_run_after_builtins(registered_rule: str) -> None:
+    assert validation_rules() == [*BUILTIN_RULES, registered_rule]
+    request = _create_forbidden_request()
+    assert [e.code for e in validate_request(request)] == ["forbidden_intent"]
+
+    invalid = replace(_create_invalid_request(), intent=request.intent)
+    assert validate_request(invalid)[-1].code == "forbidden_intent"
+    assert validate_request(invalid, fail_fast=True)[0].code == "invalid_version"
+
+
+def test_compiled_validators_are_fixed() -> None:
+    validator = compile_validator()
+    request = _create_forbidden_request()
+    register_rule("forbidden_intent", _forbid_intent)
+    try:
+        assert validator.validate(request) == []
+        assert validate_request(request) != []
+    finally:
+        unregister_rule("forbidden_intent")
+    assert validate_request(request) == []
+
+    custom = compile_validator({"forbidden_intent": _forbid_intent})
+    assert custom.rule_names == ("forbidden_intent",)
+    assert custom.validate(_create_invalid_request()) == []
+
+
+def test_rule_registry_errors() -> None:
+    with pytest.raises(ValueError, match="built-in"):
+        unregister_rule("version")
+    with pytest.raises(ValueError, match="Unknown"):
+        unregister_rule("missing")
+    with pytest.raises(ValueError, match="non-empty"):
+        register_rule("", _forbid_intent)
+
+
+def test_timed_rule_stats() -> None:
+    validator = compile_validator(timed=True)
+    valid, invalid = _create_valid_request(), _create_invalid_request()
+    assert validator.validate_many([valid, invalid, valid]) == validate_many(
+        [valid, invalid, valid]
+    )
+    # Fail-fast stops after the version rule.
+    assert validator.validate(invalid, fail_fast=True)[0].code == "invalid_version"
+
+    stats = validator.rule_stats()
+    assert list(stats) == list(BUILTIN_RULES)
+    assert stats["version"].calls == 4
+    assert stats["version"].failures == 2
+    assert stats["tables"].calls == 3
+    assert stats["tables"].failures == 1
+    assert stats["events"].failures == 0
+    assert all(s.total_ns > 0 and s.mean_us > 0 for s in stats.values())
+
+    validator.reset_stats()
+    assert all(s.calls == 0 and s.mean_us == 0.0 for s in validator.rule_stats().values())
+    assert compile_validator().rule_stats()["version"].calls == 0
@@ -0,0 +1,65 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from rrpf.fulfillment.sections import SectionFanoutResult
+from rrpf.schemas.provenance import QueryStats
+from rrpf.schemas.request import RRPRequest
+from rrpf.storage import FilesystemPayloadStore
+from rrpf.storage.codecs import CODECS
+from tests.helpers import fulfilled
+
+
+class WideRowsEngine:
+    def fulfill(self, request: RRPRequest) -> SectionFanoutResult:
+        rows: list[dict[str, Any]] = [
+            {"id": i, "customer_name": "customer", "region": "north"} for i in range(200)
+        ]
+        return SectionFanoutResult(
+            data={"table:t1": {"rows": rows}},
+            query_stats={"table:t1": QueryStats(rows=len(rows), groups=1)},
+        )
+
+
+@pytest.mark.parametrize("codec", sorted(CODECS))
+def test_compressed_roundtrip(tmp_path: Path, codec: str) -> None:
+    [result] = fulfilled(1, engine=WideRowsEngine(), limit=500)
+    store = FilesystemPayloadStore(str(tmp_path), codec=codec)
+    store.store(digest=result.digest, response=result.response)
+
+    stored = (tmp_path / f"{result.digest}.json").read_bytes()
+    assert stored.startswith(CODECS[codec].magic)
+    assert store.load(digest=result.digest).data == result.response.data
+
+    stats = store.compression_stats()
+    assert stats.payloads == 1
+    assert stats.stored_bytes == len(stored)
+    assert stats.ratio > 5
+
+
+def test_mixed_codecs_are_detected_on_load(tmp_path: Path) -> None:
+    [result] = fulfilled(1, engine=WideRowsEngine(), limit=500)
+    FilesystemPayloadStore(str(tmp_path)).store(digest=result.digest, response=result.response)
+
+    store = FilesystemPayloadStore(str(tmp_path), codec="lzma")
+    assert store.load(digest=result.digest).data == result.response.data
+
+    store.store(digest=result.digest, response=result.response)
+    assert FilesystemPayloadStore(str(tmp_path)).load(digest=result.digest).ok is True
+
+
+def test_uncompressed_stats(tmp_path: Path) -> None:
+    store = FilesystemPayloadStore(str(tmp_path))
+    assert store.compression_stats().ratio == 1.0
+
+    [result] = fulfilled(1, engine=WideRowsEngine(), limit=500)
+    store.store(digest=result.digest, response=result.response)
+    stats = store.compression_stats()
+    assert stats.raw_bytes == stats.stored_bytes
+    assert stats.ratio == 1.0
+
+
+def test_unknown_codec(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="Unknown codec"):
+        FilesystemPayloadStore(str(tmp_path), codec="zstd")
@@ -0,0 +1,245 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from typing import Any, cast
+
+import pytest
+
+import rrpf
+from rrpf.examples import InMemoryEngine, SQLiteEngine
+from rrpf.fulfillment import (
+    AsyncSectionFanoutEngine,
+    FulfillmentResult,
+    SectionFanoutEngine,
+    SectionResult,
+    run_fulfillment_async,
+    run_fulfillment_many,
+    run_fulfillment_streaming,
+)
+from rrpf.schemas.as_of import AsOf, AsOfMode
+from rrpf.schemas.common import CorrelationID, RequestID
+from rrpf.schemas.constraints import Constraints
+from rrpf.schemas.data_requests import DataRequests, EventRequest, TableRequest
+from rrpf.schemas.intent import Intent, IntentMode
+from rrpf.schemas.provenance import QueryStats
+from rrpf.schemas.request import RRPRequest
+
+
+class SlowEngine:
+    def fulfill(self, request: RRPRequest) -> FulfillmentResult:
+        time.sleep(1.0)
+        return InMemoryEngine().fulfill(request)
+
+
+class ThreadRecordingEngine:
+    def __init__(self) -> None:
+        self.threads: list[threading.Thread] = []
+
+    def fulfill(self, request: RRPRequest) -> FulfillmentResult:
+        self.threads.append(threading.current_thread())
+        return InMemoryEngine().fulfill(request)
+
+
+class AsyncSlowEngine:
+    async def fulfill(self, request: RRPRequest) -> FulfillmentResult:
+        await asyncio.sleep(1.0)
+        return InMemoryEngine().fulfill(request)
+
+
+class OneSlowSectionEngine:
+    """Table t1 takes a second; everything else is immediate."""
+
+    def fulfill_table(self, request: RRPRequest, table: TableRequest) -> SectionResult | None:
+        if table.table == "t1":
+            time.sleep(1.0)
+        return SectionResult(data={"rows": [{"id": 0}]}, stats=QueryStats(rows=1, groups=1))
+
+    def fulfill_event(self, request: RRPRequest, event: EventRequest) -> SectionResult | None:
+        return None
+
+
+class AsyncOneSlowSectionEngine:
+    async def fulfill_table(self, request: RRPRequest, table: TableRequest) -> SectionResult | None:
+        if table.table == "t1":
+            await asyncio.sleep(1.0)
+        return SectionResult(data={"rows": [{"id": 0}]}, stats=QueryStats(rows=1, groups=1))
+
+    async def fulfill_event(self, request: RRPRequest, event: EventRequest) -> SectionResult | None:
+        return None
+
+
+class SlowStreamEngine:
+    def stream_table(self, request: RRPRequest, table: TableRequest) -> Iterator[dict[str, Any]]:
+        for i in range(100):
+            time.sleep(0.02)
+            yield {"id": i}
+
+    def stream_event(self, request: RRPRequest, event: EventRequest) -> None:
+        return None
+
+
+def _create_request(
+    *, deadline_ms: int | None = 100, fail_on_partial: bool = False, tables: int = 2
+) -> RRPRequest:
+    return RRPRequest(
+        rrp_version="1.0",
+        request_id=cast(RequestID, "req-deadline"),
+        correlation_id=cast(CorrelationID, "corr-deadline"),
+        requested_at=datetime(2023, 1, 1, 12, 0, 0, tzinfo=UTC),
+        intent=Intent(name="test_deadline", mode=IntentMode.SNAPSHOT),
+        as_of=AsOf(mode=AsOfMode.LATEST, timestamp=None),
+        constraints=Constraints(
+            max_total_rows=1000,
+            max_groups=10,
+            fail_on_partial=fail_on_partial,
+            deadline_ms=deadline_ms,
+        ),
+        data=DataRequests(
+            tables=[
+                TableRequest(table=f"t{i}", fields=["id"], limit=100, derived=None)
+                for i in range(tables)
+            ],
+            events=[],
+        ),
+    )
+
+
+def test_deadline_is_canonical_only_when_set() -> None:
+    unset = rrpf.to_canonical_json(rrpf.canonicalize_request(_create_request(deadline_ms=None)))
+    legacy = _create_request(deadline_ms=None)
+    object.__setattr__(legacy, "constraints", Constraints(1000, 10, False))
+
+    assert "deadline_ms" not in unset
+    assert unset == rrpf.to_canonical_json(rrpf.canonicalize_request(legacy))
+    assert '"deadline_ms":100' in rrpf.to_canonical_json(
+        rrpf.canonicalize_request(_create_request())
+    )
+
+
+def test_invalid_deadline_rejected() -> None:
+    errors = rrpf.validate_request(_create_request(deadline_ms=0))
+    assert [e.code for e in errors] == ["invalid_deadline_ms"]
+
+
+def test_opaque_engine_times_out_whole_request() -> None:
+    start = time.monotonic()
+    result = rrpf.run_fulfillment(_create_request(), SlowEngine())
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 0.5
+    assert result.response.ok is True
+    assert result.response.partial is True
+    assert result.response.data == {}
+    assert [(e.code, e.section) for e in result.response.errors] == [
+        ("deadline_exceeded", "table:t0"),
+        ("deadline_exceeded", "table:t1"),
+    ]
+
+
+def test_deadline_failure_with_fail_on_partial() -> None:
+    result = rrpf.run_fulfillment(_create_request(fail_on_partial=True), SlowEngine())
+
+    assert result.response.ok is False
+    assert {e.code for e in result.response.errors} == {"deadline_exceeded"}
+
+
+def test_fanout_keeps_sections_that_finished() -> None:
+    with SectionFanoutEngine(OneSlowSectionEngine(), max_workers=4) as engine:
+        start = time.monotonic()
+        result = rrpf.run_fulfillment(_create_request(tables=3), engine)
+        elapsed = time.monotonic() - start
+
+    assert elapsed < 0.5
+    assert result.response.partial is True
+    assert set(result.response.data) == {"table:t0", "table:t2"}
+    assert [(e.code, e.section) for e in result.response.errors] == [
+        ("deadline_exceeded", "table:t1")
+    ]
+
+
+def test_async_deadlines() -> None:
+    whole = asyncio.run(run_fulfillment_async(_create_request(), AsyncSlowEngine()))
+    assert [e.code for e in whole.response.errors] == ["deadline_exceeded", "deadline_exceeded"]
+
+    engine = AsyncSectionFanoutEngine(AsyncOneSlowSectionEngine())
+    sections = asyncio.run(run_fulfillment_async(_create_request(tables=3), engine))
+    assert set(sections.response.data) == {"table:t0", "table:t2"}
+    assert [e.section for e in sections.response.errors] == ["table:t1"]
+
+
+def test_streaming_deadline_keeps_rows_received() -> None:
+    result = run_fulfillment_streaming(_create_request(deadline_ms=150), SlowStreamEngine())
+
+    rows = result.response.data["table:t0"]["rows"]
+    assert 0 < len(rows) < 100
+    assert "table:t1" not in result.response.data
+    assert [(e.code, e.section) for e in result.response.errors] == [
+        ("deadline_exceeded", "table:t0"),
+        ("deadline_exceeded", "table:t1"),
+    ]
+
+
+def test_opaque_engine_threads_are_reused() -> None:
+    engine = ThreadRecordingEngine()
+    for _ in range(20):
+        assert rrpf.run_fulfillment(_create_request(deadline_ms=5000), engine).response.ok
+
+    assert all(t.name.startswith("rrpf-deadline") for t in engine.threads)
+    assert len(set(engine.threads)) < 10
+
+
+def test_batch_runs_deadline_calls_on_its_own_workers() -> None:
+    engine = ThreadRecordingEngine()
+    requests = [_create_request(deadline_ms=5000) for _ in range(8)]
+
+    results = list(run_fulfillment_many(requests, engine, max_workers=2))
+
+    assert all(r.response.ok for r in results)
+    assert not any(t.name.startswith("rrpf-deadline") for t in engine.threads)
+    assert len(set(engine.threads)) <= 2
+
+
+def _sqlite_connection() -> sqlite3.Connection:
+    # Created on this thread and bound to it (check_same_thread defaults on).
+    conn = sqlite3.connect(":memory:")
+    conn.create_function("nap", 1, lambda x: (time.sleep(0.002), x)[1], deterministic=True)
+    conn.execute("CREATE TABLE t0 (id INTEGER)")
+    conn.execute("INSERT INTO t0 VALUES (1)")
+    # Reading t1 takes about 10 s: every row computes nap().
+    conn.execute("CREATE TABLE t1 (id INTEGER, slow AS (nap(id)))")
+    conn.executemany("INSERT INTO t1 (id) VALUES (?)", [(i,) for i in range(5000)])
+    return conn
+
+
+def test_sqlite_engine_deadline_runs_on_calling_thread() -> None:
+    engine = SQLiteEngine(_sqlite_connection())
+
+    result = rrpf.run_fulfillment(_create_request(deadline_ms=5000, tables=1), engine)
+
+    assert result.response.ok is True
+    assert result.response.data == {"table:t0": {"rows": [{"id": 1}]}}
+
+
+def test_sqlite_engine_interrupts_query_at_deadline() -> None:
+    engine = SQLiteEngine(_sqlite_connection())
+
+    start = time.monotonic()
+    result = rrpf.run_fulfillment(_create_request(deadline_ms=100), engine)
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 1.0
+    assert set(result.response.data) == {"table:t0"}
+    assert [(e.code, e.section) for e in result.response.errors] == [
+        ("deadline_exceeded", "table:t1")
+    ]
+
+
+def test_sqlite_engine_misuse_is_raised() -> None:
+    conn = _sqlite_connection()
+    conn.close()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        rrpf.run_fulfillment(_create_request(tables=1), SQLiteEngine(conn))
@@ -0,0 +1,213 @@
+import dataclasses
+import hashlib
+import io
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import cast
+
+import pytest
+
+from rrpf import run_fulfillment
+from rrpf.examples import InMemoryEngine
+from rrpf.fulfillment import FulfillmentResult, ResultCache, compute_content_digest, run_or_replay
+from rrpf.hashing import (
+    compute_digest,
+    digest_algorithms,
+    get_digest_algorithm,
+    normalize_digest,
+    parse_digest,
+    register_digest_algorithm,
+    same_digest,
+    to_canonical_json,
+    write_canonical_json,
+)
+from rrpf.schemas.as_of import AsOf, AsOfMode
+from rrpf.schemas.common import CorrelationID, Digest, RequestID
+from rrpf.schemas.constraints import Constraints
+from rrpf.schemas.data_requests import DataRequests, TableRequest
+from rrpf.schemas.intent import Intent, IntentMode
+from rrpf.schemas.request import RRPRequest
+from rrpf.schemas.response import RRPResponse
+from rrpf.storage import (
+    FilesystemPayloadStore,
+    MemoryPayloadStore,
+    PayloadStore,
+    SegmentPayloadStore,
+    SQLitePayloadStore,
+    TieredPayloadStore,
+    migrate_to_sharded,
+    replay_from_store,
+    scrub_store,
+)
+
+
+def _create_request(pinned: bool = False) -> RRPRequest:
+    return RRPRequest(
+        rrp_version="1.0",
+        request_id=cast(RequestID, "req-digest"),
+        correlation_id=cast(CorrelationID, "corr-digest"),
+        requested_at=datetime(2023, 1, 1, 12, 0, 0, tzinfo=UTC),
+        intent=Intent(name="test_digest", mode=IntentMode.SNAPSHOT),
+        as_of=(
+            AsOf(mode=AsOfMode.TIMESTAMP, timestamp=datetime(2023, 1, 1, tzinfo=UTC))
+            if pinned
+            else AsOf(mode=AsOfMode.LATEST, timestamp=None)
+        ),
+        constraints=Constraints(max_total_rows=100, max_groups=10, fail_on_partial=True),
+        data=DataRequests(
+            tables=[TableRequest(table="users", fields=["id", "name"], limit=10, derived=None)],
+            events=[],
+        ),
+    )
+
+
+class _UnusedEngine:
+    def fulfill(self, request: RRPRequest) -> FulfillmentResult:
+        raise AssertionError("engine should not be called on a cache hit")
+
+
+def _readdressed(response: RRPResponse, digest: Digest) -> RRPResponse:
+    provenance = dataclasses.replace(response.provenance, inputs_digest=digest)
+    return dataclasses.replace(response, provenance=provenance)
+
+
+def test_registry() -> None:
+    assert {"sha256", "blake2b"} <= set(digest_algorithms())
+    with pytest.raises(ValueError, match="Unknown digest algorithm"):
+        get_digest_algorithm("md4")
+    with pytest.raises(ValueError):
+        register_digest_algorithm("bad:name", hashlib.sha256)
+
+    register_digest_algorithm("sha512-256", lambda: hashlib.new("sha512_256"))
+    try:
+        digest = compute_digest("{}", algorithm="sha512-256")
+        assert digest == "sha512-256:" + hashlib.new("sha512_256", b"{}").hexdigest()
+    finally:
+        from rrpf.hashing import digest as digest_module
+
+        del digest_module._ALGORITHMS["sha512-256"]
+
+
+def test_tagged_and_bare_digests() -> None:
+    bare = compute_digest('{"a":1}')
+    assert bare == hashlib.sha256(b'{"a":1}').hexdigest()
+    assert compute_digest(b'{"a":1}') == bare
+    assert compute_digest('{"a":1}', algorithm="sha256") == f"sha256:{bare}"
+
+    blake = compute_digest('{"a":1}', algorithm="blake2b")
+    expected = hashlib.blake2b(b'{"a":1}', digest_size=32).hexdigest()
+    assert blake == f"blake2b:{expected}"
+    assert len(parse_digest(blake)[1]) == 64
+
+    assert parse_digest(bare) == ("sha256", bare)
+    assert parse_digest(blake) == ("blake2b", expected)
+    assert normalize_digest(f"sha256:{bare}") == bare
+    assert normalize_digest(blake) == blake
+    assert same_digest(f"sha256:{bare}", bare)
+    assert not same_digest(blake, expected)
+
+
+def test_streaming_writer_with_algorithm() -> None:
+    value = {"rows": [{"id": i, "v": f"é{i}"} for i in range(1000)]}
+    sink = io.BytesIO()
+    digest = write_canonical_json(value, sink, algorithm="blake2b")
+    assert sink.getvalue() == to_canonical_json(value).encode("utf-8")
+    assert digest.digest == compute_digest(to_canonical_json(value), algorithm="blake2b")
+
+
+@pytest.mark.parametrize("kind", ["memory", "flat", "sharded", "segment", "sqlite", "tiered"])
+def test_stores_resolve_either_form(tmp_path: Path, kind: str) -> None:
+    store: PayloadStore
+    if kind == "memory":
+        store = MemoryPayloadStore()
+    elif kind == "flat":
+        store = FilesystemPayloadStore(str(tmp_path))
+    elif kind == "sharded":
+        store = FilesystemPayloadStore(str(tmp_path), shard_depth=2)
+    elif kind == "segment":
+        store = SegmentPayloadStore(str(tmp_path))
+    elif kind == "sqlite":
+        store = SQLitePayloadStore(str(tmp_path / "payloads.db"))
+    else:
+        store = TieredPayloadStore(
+            hot=MemoryPayloadStore(), cold=FilesystemPayloadStore(str(tmp_path))
+        )
+
+    result = run_fulfillment(_create_request(), InMemoryEngine())
+    # Legacy bare digest stored, looked up in both forms.
+    store.store(digest=result.digest, response=result.response)
+    assert store.load(digest=result.digest) == result.response
+    assert store.load(digest=Digest(f"sha256:{result.digest}")) == result.response
+    assert replay_from_store(digest=Digest(f"sha256:{result.digest}"), store=store, verify=True)
+
+    # Tagged digest of another algorithm.
+    blake = compute_digest(result.canonical_json, algorithm="blake2b")
+    store.store(digest=blake, response=_readdressed(result.response, blake))
+    assert store.load(digest=blake).provenance.inputs_digest == blake
+    with pytest.raises(KeyError):
+        store.load(digest=Digest(parse_digest(blake)[1]))
+
+
+def test_filesystem_file_names(tmp_path: Path) -> None:
+    result = run_fulfillment(_create_request(), InMemoryEngine())
+    blake = compute_digest(result.canonical_json, algorithm="blake2b")
+    hexdigest = parse_digest(blake)[1]
+
+    flat = FilesystemPayloadStore(str(tmp_path / "flat"))
+    flat.store(digest=blake, response=_readdressed(result.response, blake))
+    assert (tmp_path / "flat" / f"blake2b-{hexdigest}.json").exists()
+    with flat.open_payload(digest=blake) as reader:
+        assert reader.row_count("table:users") == 3
+
+    sharded = FilesystemPayloadStore(str(tmp_path / "sharded"), shard_depth=2)
+    sharded.store(digest=Digest(f"sha256:{result.digest}"), response=result.response)
+    sharded.store(digest=blake, response=_readdressed(result.response, blake))
+    root = tmp_path / "sharded"
+    assert (root / result.digest[:2] / result.digest[2:4] / f"{result.digest}.json").exists()
+    assert (root / hexdigest[:2] / hexdigest[2:4] / f"blake2b-{hexdigest}.json").exists()
+
+
+def test_migration_and_scrub_with_tagged_digests(tmp_path: Path) -> None:
+    result = run_fulfillment(_create_request(), InMemoryEngine())
+    blake = compute_digest(result.canonical_json, algorithm="blake2b")
+    hexdigest = parse_digest(blake)[1]
+    FilesystemPayloadStore(str(tmp_path), index_sections=True).store(
+        digest=blake, response=_readdressed(result.response, blake)
+    )
+
+    stats = migrate_to_sharded(str(tmp_path))
+    assert stats.moved == 1
+    shard = tmp_path / hexdigest[:2] / hexdigest[2:4]
+    assert (shard / f"blake2b-{hexdigest}.json").exists()
+    assert (shard / f"blake2b-{hexdigest}.idx").exists()
+    assert FilesystemPayloadStore(str(tmp_path), shard_depth=2).load(digest=blake)
+
+    report = scrub_store(str(tmp_path), workers=1)
+    assert report.ok and report.scanned == 1
+
+    (shard / f"blake2b-{hexdigest}.json").rename(shard / f"blake2b-{'0' * 64}.json")
+    report = scrub_store(str(tmp_path), workers=1)
+    assert [issue.digest for issue in report.issues if issue.kind == "corrupt"] == [
+        f"blake2b:{'0' * 64}"
+    ]
+
+
+def test_run_or_replay_with_blake2b_keys() -> None:
+    store = MemoryPayloadStore()
+    cache = ResultCache()
+    request = _create_request(pinned=True)
+    content_digest = compute_content_digest(request, algorithm="blake2b")
+    assert content_digest.startswith("blake2b:")
+
+    first = run_or_replay(
+        request, InMemoryEngine(), store=store, cache=cache, digest_algorithm="blake2b"
+    )
+    assert cache.get(content_digest) is not None
+    assert store.load(digest=content_digest).provenance.inputs_digest == content_digest
+
+    second = run_or_replay(
+        request, _UnusedEngine(), store=store, cache=cache, digest_algorithm="blake2b"
+    )
+    # The inputs digest stays bare SHA-256.
+    assert second.digest == first.digest == compute_digest(first.canonical_json)
+    assert second.response.provenance.inputs_digest == first.digest
@@ -0,0 +1,76 @@
+from pathlib import Path
+
+import pytest
+
+from rrpf.storage import FilesystemPayloadStore, MigrationStats, migrate_to_sharded
+from tests.helpers import fulfilled
+
+
+def test_sharded_layout(tmp_path: Path) -> None:
+    store = FilesystemPayloadStore(str(tmp_path), shard_depth=2, shard_width=2)
+    result = fulfilled(1)[0]
+    store.store(digest=result.digest, response=result.response)
+
+    digest = result.digest
+    assert (tmp_path / digest[:2] / digest[2:4] / f"{digest}.json").is_file()
+    assert not (tmp_path / f"{digest}.json").exists()
+    assert store.load(digest=digest).data == result.response.data
+
+
+def test_default_layout_is_flat(tmp_path: Path) -> None:
+    store = FilesystemPayloadStore(str(tmp_path))
+    result = fulfilled(1)[0]
+    store.store(digest=result.digest, response=result.response)
+
+    assert [p.name for p in tmp_path.iterdir()] == [f"{result.digest}.json"]
+
+    indexed = FilesystemPayloadStore(str(tmp_path / "indexed"), index_sections=True)
+    indexed.store(digest=result.digest, response=result.response)
+    assert sorted(p.name for p in (tmp_path / "indexed").iterdir()) == [
+        f"{result.digest}.idx",
+        f"{result.digest}.json",
+    ]
+
+
+def test_sharded_store_reads_flat_payloads(tmp_path: Path) -> None:
+    result = fulfilled(1)[0]
+    FilesystemPayloadStore(str(tmp_path)).store(digest=result.digest, response=result.response)
+
+    sharded = FilesystemPayloadStore(str(tmp_path), shard_depth=2)
+    assert sharded.load(digest=result.digest).data == result.response.data
+    with pytest.raises(KeyError):
+        sharded.load(digest=fulfilled(2)[1].digest)
+
+
+def test_migrate_to_sharded(tmp_path: Path) -> None:
+    flat = FilesystemPayloadStore(str(tmp_path))
+    results = fulfilled(5)
+    for result in results:
+        flat.store(digest=result.digest, response=result.response)
+    # A payload already written in the sharded layout during the migration window.
+    sharded = FilesystemPayloadStore(str(tmp_path), shard_depth=2, shard_width=2)
+    sharded.store(digest=results[0].digest, response=results[0].response)
+    (tmp_path / "notes.txt").write_text("untouched")
+
+    moved: list[str] = []
+    stats = migrate_to_sharded(str(tmp_path), on_moved=moved.append)
+
+    assert (stats.moved, stats.duplicates) == (4, 1)
+    assert sorted(moved) == sorted(r.digest for r in results[1:])
+    assert not list(tmp_path.glob("*.json"))
+    assert not list(tmp_path.glob("*.idx"))
+    assert (tmp_path / "notes.txt").exists()
+    for result in results:
+        assert sharded.load(digest=result.digest).data == result.response.data
+
+    # Resuming a finished migration is a no-op.
+    assert migrate_to_sharded(str(tmp_path)) == MigrationStats(moved=0, duplicates=0)
+
+
+def test_invalid_shard_settings(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        FilesystemPayloadStore(str(tmp_path), shard_depth=-1)
+    with pytest.raises(ValueError):
+        FilesystemPayloadStore(str(tmp_path), shard_width=0)
+    with pytest.raises(ValueError):
+        migrate_to_sharded(str(tmp_path), shard_depth=0)
@@ -0,0 +1,115 @@
+from datetime import UTC, datetime
+from typing import cast
+
+import pytest
+
+import rrpf
+from rrpf.examples import InMemoryEngine
+from rrpf.fulfillment import run_fulfillment_many, run_fulfillment_streaming
+from rrpf.instrumentation import Stage, StageEvent, StageTimingCollector
+from rrpf.schemas.as_of import AsOf, AsOfMode
+from rrpf.schemas.common import CorrelationID, RequestID
+from rrpf.schemas.constraints import Constraints
+from rrpf.schemas.data_requests import DataRequests, TableRequest
+from rrpf.schemas.intent import Intent, IntentMode
+from rrpf.schemas.request import RRPRequest
+from rrpf.storage import MemoryPayloadStore
+
+
+class RecordingObserver:
+    def __init__(self) -> None:
+        self.events: list[StageEvent] = []
+
+    def on_stage(self, event: StageEvent) -> None:
+        self.events.append(event)
+
+
+def _create_request(request_id: str = "req-timing", *, rrp_version: str = "1.0") -> RRPRequest:
+    return RRPRequest(
+        rrp_version=rrp_version,
+        request_id=cast(RequestID, request_id),
+        correlation_id=cast(CorrelationID, "corr-timing"),
+        requested_at=datetime(2023, 1, 1, 12, 0, 0, tzinfo=UTC),
+        intent=Intent(name="test_timing", mode=IntentMode.SNAPSHOT),
+        as_of=AsOf(mode=AsOfMode.LATEST, timestamp=None),
+        constraints=Constraints(max_total_rows=1000, max_groups=10, fail_on_partial=False),
+        data=DataRequests(
+            tables=[TableRequest(table="t1", fields=["id"], limit=10, derived=None)],
+            events=[],
+        ),
+    )
+
+
+def test_run_and_store_reports_every_stage_in_order() -> None:
+    observer = RecordingObserver()
+    result = rrpf.run_and_store(
+        request=_create_request(),
+        engine=InMemoryEngine(),
+        store=MemoryPayloadStore(),
+        observer=observer,
+    )
+
+    assert [e.stage for e in observer.events] == list(Stage)
+    assert all(e.request_id == "req-timing" for e in observer.events)
+    assert all(e.duration_ns >= 0 for e in observer.events)
+
+    by_stage = {e.stage: e for e in observer.events}
+    assert by_stage[Stage.ENCODE].size_bytes == len(result.canonical_json.encode("utf-8"))
+    assert by_stage[Stage.ENGINE].rows == 3
+    assert by_stage[Stage.CONSTRAINTS].rows == 3
+
+
+def test_invalid_request_only_reports_validation() -> None:
+    observer = RecordingObserver()
+    rrpf.run_fulfillment(_create_request(rrp_version="0.9"), InMemoryEngine(), observer=observer)
+
+    assert [e.stage for e in observer.events] == [Stage.VALIDATE]
+
+
+def test_observer_does_not_change_response() -> None:
+    request = _create_request()
+    plain = rrpf.run_fulfillment(request, InMemoryEngine())
+    observed = rrpf.run_fulfillment(request, InMemoryEngine(), observer=RecordingObserver())
+
+    assert observed.digest == plain.digest
+    assert observed.response.data == plain.response.data
+
+
+def test_batch_and_streaming_runners_report_stages() -> None:
+    collector = StageTimingCollector()
+    requests = [_create_request(f"req-{i}") for i in range(5)]
+    list(run_fulfillment_many(requests, InMemoryEngine(), observer=collector))
+    run_fulfillment_streaming(_create_request(), InMemoryEngine(), observer=collector)
+
+    summary = collector.summary()
+    assert list(summary) == [s for s in Stage if s != Stage.STORE]
+    assert summary[Stage.ENGINE].count == 6
+    assert summary[Stage.ENGINE].rows == 18
+
+
+def test_collector_percentiles() -> None:
+    collector = StageTimingCollector()
+    for ms in range(1, 101):
+        collector.on_stage(
+            StageEvent(stage=Stage.DIGEST, request_id=cast(RequestID, "r"), duration_ns=ms * 10**6)
+        )
+
+    summary = collector.summary()[Stage.DIGEST]
+    assert summary.count == 100
+    assert summary.total_ms == pytest.approx(5050.0)
+    assert (summary.p50_ms, summary.p95_ms, summary.p99_ms) == (50.0, 95.0, 99.0)
+
+    collector.reset()
+    assert collector.summary() == {}
+
+
+def test_collector_bounds_samples_but_not_counts() -> None:
+    collector = StageTimingCollector(max_samples=10)
+    for ms in range(1, 101):
+        collector.on_stage(
+            StageEvent(stage=Stage.SHAPE, request_id=cast(RequestID, "r"), duration_ns=ms * 10**6)
+        )
+
+    summary = collector.summary()[Stage.SHAPE]
+    assert summary.count == 100
+    assert summary.p50_ms == 95.0
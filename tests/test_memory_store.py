@@ -0,0 +1,110 @@
+import copy
+
+import pytest
+
+from rrpf.storage import MemoryPayloadStore
+from rrpf.storage.frozen import FrozenDict, FrozenList, freeze
+from tests.helpers import fulfilled
+
+
+def test_load_shares_frozen_data() -> None:
+    [result] = fulfilled(1)
+    store = MemoryPayloadStore()
+    store.store(digest=result.digest, response=result.response)
+
+    first = store.load(digest=result.digest)
+    second = store.load(digest=result.digest)
+    assert first is not second
+    assert first == result.response
+    assert first.data is second.data
+
+    rows = first.data["table:t1"]["rows"]
+    with pytest.raises(TypeError):
+        rows.append({"id": 99})
+    with pytest.raises(TypeError):
+        rows[0]["id"] = 99
+    with pytest.raises(TypeError):
+        first.data["table:t1"].clear()  # type: ignore[attr-defined]
+    assert store.load(digest=result.digest).data == result.response.data
+
+    # The first load froze a copy; the caller's response stays mutable.
+    result.response.data["table:t1"]["rows"].append({"id": 99})
+    assert len(store.load(digest=result.digest).data["table:t1"]["rows"]) == 3
+
+
+def test_store_defers_freezing_and_sizing() -> None:
+    [result] = fulfilled(1)
+    store = MemoryPayloadStore()
+    store.store(digest=result.digest, response=result.response)
+    # Storing is an insert: nothing is copied or measured yet.
+    [entry] = store._store.values()
+    assert entry.frozen is None and entry.size is None
+
+    bounded = MemoryPayloadStore(max_bytes=1 << 20)
+    bounded.store(digest=result.digest, response=result.response)
+    assert store.size_bytes == bounded.size_bytes > 0
+
+
+def test_frozen_values_behave_like_json() -> None:
+    frozen, size = freeze({"rows": [{"id": 1, "name": "a"}], "n": None})
+    assert isinstance(frozen, FrozenDict)
+    assert isinstance(frozen["rows"], FrozenList)
+    assert frozen == {"rows": [{"id": 1, "name": "a"}], "n": None}
+    assert copy.deepcopy(frozen) is frozen
+    assert size > 0
+
+
+def test_lru_eviction_by_entries() -> None:
+    results = fulfilled(3)
+    store = MemoryPayloadStore(max_entries=2)
+    store.store(digest=results[0].digest, response=results[0].response)
+    store.store(digest=results[1].digest, response=results[1].response)
+    store.load(digest=results[0].digest)
+    store.store(digest=results[2].digest, response=results[2].response)
+
+    assert len(store) == 2
+    with pytest.raises(KeyError):
+        store.load(digest=results[1].digest)
+    assert store.load(digest=results[0].digest).ok is True
+
+    stats = store.stats()
+    assert (stats.hits, stats.misses, stats.evictions) == (2, 1, 1)
+
+
+def test_lfu_eviction() -> None:
+    results = fulfilled(3)
+    store = MemoryPayloadStore(max_entries=2, eviction="lfu")
+    store.store(digest=results[0].digest, response=results[0].response)
+    store.store(digest=results[1].digest, response=results[1].response)
+    for _ in range(3):
+        store.load(digest=results[0].digest)
+    store.load(digest=results[1].digest)
+    store.store(digest=results[2].digest, response=results[2].response)
+
+    assert store.load(digest=results[0].digest).ok is True
+    with pytest.raises(KeyError):
+        store.load(digest=results[1].digest)
+
+
+def test_eviction_by_bytes() -> None:
+    results = fulfilled(4)
+    store = MemoryPayloadStore()
+    store.store(digest=results[0].digest, response=results[0].response)
+    one_entry = store.size_bytes
+
+    bounded = MemoryPayloadStore(max_bytes=one_entry * 2)
+    for result in results:
+        bounded.store(digest=result.digest, response=result.response)
+
+    assert len(bounded) == 2
+    assert bounded.size_bytes <= one_entry * 2
+    assert bounded.stats().evictions == 2
+
+
+def test_invalid_settings() -> None:
+    with pytest.raises(ValueError):
+        MemoryPayloadStore(max_entries=0)
+    with pytest.raises(ValueError):
+        MemoryPayloadStore(max_bytes=0)
+    with pytest.raises(ValueError):
+        MemoryPayloadStore(eviction="fifo")  # type: ignore[arg-type]
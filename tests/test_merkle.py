@@ -0,0 +1,234 @@
+import asyncio
+import hashlib
+import sqlite3
+from dataclasses import replace
+from datetime import UTC, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, cast
+
+import pytest
+
+from rrpf import run_fulfillment
+from rrpf.examples import InMemoryEngine, SQLiteEngine
+from rrpf.fulfillment import (
+    FulfillmentResult,
+    SyncEngineAdapter,
+    run_fulfillment_async,
+    run_fulfillment_many,
+    run_or_replay,
+)
+from rrpf.fulfillment.sections import SectionFanoutResult
+from rrpf.hashing import (
+    chunk_digests,
+    content_digest,
+    diff_sections,
+    digest_sections,
+    merkle_root,
+    to_canonical_json,
+    verify_sections,
+)
+from rrpf.normalization.canonicalize import canonical_request_json
+from rrpf.schemas.as_of import AsOf, AsOfMode
+from rrpf.schemas.common import CorrelationID, RequestID
+from rrpf.schemas.constraints import Constraints
+from rrpf.schemas.data_requests import DataRequests, EventRequest, TableRequest
+from rrpf.schemas.intent import Intent, IntentMode
+from rrpf.schemas.provenance import QueryStats
+from rrpf.schemas.request import RRPRequest
+from rrpf.storage import FilesystemPayloadStore, MemoryPayloadStore, replay_from_store
+
+DATA: dict[str, Any] = {
+    "table:a": {"rows": [{"id": i, "v": f"é{i}"} for i in range(10)]},
+    "table:b": {"rows": []},
+    "event:x": {"rows": [{"type": "x", "n": [1, {"k": 2}]}], "cursor": 1},
+    "table:c": [1, 2],
+}
+
+
+def _create_request() -> RRPRequest:
+    return RRPRequest(
+        rrp_version="1.0",
+        request_id=cast(RequestID, "req-merkle"),
+        correlation_id=cast(CorrelationID, "corr-merkle"),
+        requested_at=datetime(2023, 1, 1, 12, 0, 0, tzinfo=UTC),
+        intent=Intent(name="test_merkle", mode=IntentMode.SNAPSHOT),
+        as_of=AsOf(mode=AsOfMode.LATEST, timestamp=None),
+        constraints=Constraints(max_total_rows=100, max_groups=10, fail_on_partial=True),
+        data=DataRequests(
+            tables=[TableRequest(table="users", fields=["id", "name"], limit=10, derived=None)],
+            events=[EventRequest(types=["login"], fields=["ts"], limit=10)],
+        ),
+    )
+
+
+def test_content_digest_matches_canonical_json() -> None:
+    for value in DATA.values():
+        expected = hashlib.sha256(
+            to_canonical_json({"v": value})[len('{"v":') : -1].encode("utf-8")
+        ).hexdigest()
+        assert content_digest(value) == expected
+
+
+def test_merkle_root_shape() -> None:
+    def h(data: bytes) -> bytes:
+        return hashlib.sha256(data).digest()
+
+    a, b, c = b"a", b"b", b"c"
+    assert merkle_root([]) == hashlib.sha256(b"").hexdigest()
+    assert merkle_root([a]) == h(b"\x00a").hex()
+    assert merkle_root([a, b]) == h(b"\x01" + h(b"\x00a") + h(b"\x00b")).hex()
+    # Three leaves split 2 + 1.
+    left = h(b"\x01" + h(b"\x00a") + h(b"\x00b"))
+    assert merkle_root([a, b, c]) == h(b"\x01" + left + h(b"\x00c")).hex()
+
+
+def test_digest_sections_and_chunks() -> None:
+    digests = digest_sections(DATA)
+    assert list(digests.sections) == sorted(DATA)
+    assert digests.chunks is None
+    assert digest_sections(dict(reversed(DATA.items()))).root == digests.root
+
+    chunked = digest_sections(DATA, chunk_rows=4)
+    assert chunked.sections == digests.sections
+    assert chunked.root != digests.root
+    assert chunked.chunks is not None
+    assert set(chunked.chunks) == {"table:a", "table:b", "event:x"}
+    assert chunked.chunks["table:a"] == chunk_digests(DATA["table:a"]["rows"], chunk_rows=4)
+    assert len(chunked.chunks["table:a"]) == 3
+    assert chunked.chunks["table:b"] == []
+
+    with pytest.raises(ValueError, match="chunk_rows must be > 0"):
+        digest_sections(DATA, chunk_rows=0)
+
+
+def test_verify_and_diff() -> None:
+    expected = digest_sections(DATA).sections
+    assert verify_sections(DATA, expected) == []
+
+    tampered = {**DATA, "table:b": {"rows": [{"id": 1}]}}
+    assert verify_sections(tampered, expected) == ["table:b"]
+    assert verify_sections(tampered, expected, keys=["table:a"]) == []
+    assert verify_sections({}, expected, keys=["table:a"]) == ["table:a"]
+
+    other = digest_sections({**tampered, "table:d": {"rows": []}}).sections
+    assert diff_sections(expected, other) == ["table:b", "table:d"]
+
+
+def test_runner_records_section_digests(tmp_path: Path) -> None:
+    result = run_fulfillment(_create_request(), InMemoryEngine(), chunk_rows=1)
+    provenance = result.response.provenance
+    digests = digest_sections(result.response.data, chunk_rows=1)
+    assert provenance.section_digests == digests.sections
+    assert provenance.merkle_root == digests.root
+    assert provenance.chunk_rows == 1
+    assert provenance.chunk_digests == digests.chunks
+
+    unchunked = run_fulfillment(_create_request(), InMemoryEngine()).response.provenance
+    assert unchunked.section_digests == provenance.section_digests
+    assert unchunked.chunk_digests is None
+
+    for store in (FilesystemPayloadStore(str(tmp_path)), MemoryPayloadStore()):
+        store.store(digest=result.digest, response=result.response)
+        replayed = replay_from_store(digest=result.digest, store=store, verify=True)
+        assert replayed.provenance == provenance
+
+
+def test_replay_verification_detects_tampering(tmp_path: Path) -> None:
+    result = run_fulfillment(_create_request(), InMemoryEngine())
+    store = FilesystemPayloadStore(str(tmp_path))
+    store.store(digest=result.digest, response=result.response)
+
+    path = tmp_path / f"{result.digest}.json"
+    content = path.read_text(encoding="utf-8")
+    path.write_text(content.replace('[{"id":0},', '[{"id":9},'), encoding="utf-8")
+
+    with pytest.raises(AssertionError, match="table:users"):
+        replay_from_store(digest=result.digest, store=store, verify=True)
+    # Only the requested sections are checked.
+    replay_from_store(digest=result.digest, store=store, verify=["event:login"])
+
+    with store.open_payload(digest=result.digest) as reader:
+        assert reader.verify_section("event:login")
+        assert not reader.verify_section("table:users")
+
+
+class _DriverTypesEngine:
+    def fulfill(self, request: RRPRequest) -> SectionFanoutResult:
+        rows = [{"id": 1, "amount": Decimal("9.99"), "at": datetime(2023, 1, 1, tzinfo=UTC)}]
+        return SectionFanoutResult(
+            data={"table:users": {"rows": rows}, "event:login": {"rows": []}},
+            query_stats={
+                "table:users": QueryStats(rows=1, groups=1),
+                "event:login": QueryStats(rows=0, groups=1),
+            },
+        )
+
+
+def test_non_json_values_skip_section_digests() -> None:
+    conn = sqlite3.connect(":memory:")
+    conn.execute('CREATE TABLE "users" (id INTEGER, avatar BLOB)')
+    conn.execute('INSERT INTO "users" VALUES (1, ?)', (b"\x89PNG",))
+    request = replace(
+        _create_request(),
+        data=DataRequests(
+            tables=[TableRequest(table="users", fields=["id", "avatar"], limit=10, derived=None)],
+            events=[],
+        ),
+    )
+
+    for req, engine in ((request, SQLiteEngine(conn)), (_create_request(), _DriverTypesEngine())):
+        result = run_fulfillment(req, engine)
+        assert result.response.ok is True
+        assert result.response.provenance.section_digests is None
+        assert result.response.provenance.merkle_root is None
+
+        store = MemoryPayloadStore()
+        store.store(digest=result.digest, response=result.response)
+        assert store.load(digest=result.digest).data == result.response.data
+        with pytest.raises(AssertionError, match="no section digests"):
+            replay_from_store(digest=result.digest, store=store, verify=True)
+
+
+def test_section_digests_can_be_turned_off() -> None:
+    request = _create_request()
+    off = replace(request, constraints=replace(request.constraints, section_digests=False))
+    result = run_fulfillment(off, InMemoryEngine(), chunk_rows=1)
+    provenance = result.response.provenance
+    assert result.response.ok is True
+    assert provenance.section_digests is None
+    assert provenance.merkle_root is None
+    assert provenance.chunk_digests is None
+
+    # Only requests that turn digests off canonicalize differently.
+    assert '"section_digests"' not in canonical_request_json(request)
+    assert '"section_digests":false' in canonical_request_json(off)
+    assert result.digest != run_fulfillment(request, InMemoryEngine()).digest
+
+
+class _CountingEngine(InMemoryEngine):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    def fulfill(self, request: RRPRequest) -> FulfillmentResult:
+        self.calls += 1
+        return super().fulfill(request)
+
+
+@pytest.mark.parametrize("chunk_rows", [0, -1])
+def test_bad_chunk_rows_rejected_before_engine(chunk_rows: int) -> None:
+    engine = _CountingEngine()
+    request = _create_request()
+
+    with pytest.raises(ValueError, match="chunk_rows must be > 0"):
+        run_fulfillment(request, engine, chunk_rows=chunk_rows)
+    with pytest.raises(ValueError, match="chunk_rows must be > 0"):
+        run_or_replay(request, engine, chunk_rows=chunk_rows)
+    with pytest.raises(ValueError, match="chunk_rows must be > 0"):
+        list(run_fulfillment_many([request], engine, chunk_rows=chunk_rows))
+    with pytest.raises(ValueError, match="chunk_rows must be > 0"):
+        asyncio.run(
+            run_fulfillment_async(request, SyncEngineAdapter(engine), chunk_rows=chunk_rows)
+        )
+    assert engine.calls == 0
@@ -0,0 +1,192 @@
+import io
+import json
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, cast
+
+import pytest
+
+from rrpf.hashing import to_canonical_json
+from rrpf.schemas.common import Digest, RequestID
+from rrpf.schemas.errors import RRPError
+from rrpf.schemas.provenance import Provenance, QueryStats
+from rrpf.schemas.response import RRPResponse
+from rrpf.storage import FilesystemPayloadStore, PayloadReader, filesystem_store
+from rrpf.storage.payload_reader import index_payload, write_indexed_payload
+from rrpf.storage.serialization import serialize_response
+
+DIGEST = cast(Digest, "ab" * 32)
+
+
+def _response(digest: Digest = DIGEST) -> RRPResponse:
+    data: dict[str, Any] = {
+        "table:big": {"rows": [{"id": i, "name": f"n{i}"} for i in range(1000)]},
+        "table:nested": {"rows": [{"id": i, "tags": ["a", {"b": i}]} for i in range(300)]},
+        "table:empty": {"rows": []},
+        "event:click": {"rows": [{"type": "click", "ts": "é☃"}], "cursor": 3},
+        "table:odd": [1, 2, 3],
+    }
+    return RRPResponse(
+        ok=True,
+        request_id=cast(RequestID, "req-reader"),
+        as_of="latest",
+        data=data,
+        partial=True,
+        errors=[RRPError(code="LIMIT", message="truncated", section="table:big")],
+        provenance=Provenance(
+            fulfilled_at=datetime(2024, 1, 1, 12, 0, 0, tzinfo=UTC),
+            inputs_digest=digest,
+            query_stats={"table:big": QueryStats(rows=1000, groups=1)},
+        ),
+    )
+
+
+@pytest.mark.parametrize("codec", ["none", "zlib"])
+def test_open_payload_reads_sections_lazily(tmp_path: Path, codec: str) -> None:
+    response = _response()
+    store = FilesystemPayloadStore(str(tmp_path), codec=codec)
+    store.store(digest=DIGEST, response=response)
+
+    with store.open_payload(digest=DIGEST) as reader:
+        assert isinstance(reader, PayloadReader)
+        assert (reader.ok, reader.request_id, reader.as_of, reader.partial) == (
+            True,
+            "req-reader",
+            "latest",
+            True,
+        )
+        assert reader.errors == list(response.errors)
+        assert reader.provenance == response.provenance
+        assert reader.sections == sorted(response.data)
+        for key in reader.sections:
+            assert reader.section(key) == response.data[key]
+        assert reader.to_response() == store.load(digest=DIGEST)
+
+
+def test_row_slices(tmp_path: Path) -> None:
+    response = _response()
+    store = FilesystemPayloadStore(str(tmp_path))
+    store.store(digest=DIGEST, response=response)
+    big = response.data["table:big"]["rows"]
+    nested = response.data["table:nested"]["rows"]
+
+    with store.open_payload(digest=DIGEST) as reader:
+        assert reader.row_count("table:big") == 1000
+        assert reader.rows("table:big") == big
+        assert reader.rows("table:big", offset=250, count=10) == big[250:260]
+        assert reader.rows("table:big", offset=990, count=50) == big[990:]
+        assert reader.rows("table:big", offset=5000) == []
+        assert reader.rows("table:big", count=0) == []
+        assert reader.rows("table:nested", offset=255, count=3) == nested[255:258]
+        assert reader.rows("table:empty") == []
+        assert reader.rows("event:click") == [{"type": "click", "ts": "é☃"}]
+
+        assert reader.row_count("table:odd") is None
+        with pytest.raises(ValueError, match="no rows"):
+            reader.rows("table:odd")
+        with pytest.raises(KeyError, match="Section not found"):
+            reader.section("table:missing")
+        with pytest.raises(ValueError, match="offset must be >= 0"):
+            reader.rows("table:big", offset=-1)
+
+
+def test_indexed_writer_matches_canonical_json() -> None:
+    data = serialize_response(_response())
+    buffer = io.BytesIO()
+    index = write_indexed_payload(data, buffer)
+
+    content = buffer.getvalue()
+    assert content == to_canonical_json(data).encode("utf-8")
+    assert index["size"] == len(content)
+    start, end = index["sections"]["table:big"]["span"]
+    assert json.loads(content[start:end]) == data["data"]["table:big"]
+
+
+def test_scanned_index_matches_written_index() -> None:
+    data = serialize_response(_response())
+    data["data"]["table:deep"] = {"rows": [{"a": [[[[{"b": [i]}]]]]} for i in range(600)]}
+    data["data"]["table:escaped"] = {"rows": ['x"]},{', "\\", {"k\"}": "[\u00e9]"}] * 300}
+    data["data"]["table:scalars"] = {"cursor": {"rows": 1}, "rows": [1, -2.5e-7, None, True]}
+    data["data"]["table:not_rows"] = {"rows": 5}
+    buffer = io.BytesIO()
+    index = write_indexed_payload(data, buffer)
+
+    assert index_payload(buffer.getvalue()) == index
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b'{"data": {}}',
+        b'{"data":{"t":{"rows":[1, 2]}}}',
+        b'{"data":{"t":{"rows":[1,2,]}}}',
+        b'{"data":{}',
+        b'{"data":{}}\n',
+        b'{"ok":true}',
+    ],
+)
+def test_scan_rejects_non_canonical_json(content: bytes) -> None:
+    assert index_payload(content) is None
+
+
+@pytest.mark.parametrize("codec", ["none", "zlib"])
+def test_open_payload_scans_instead_of_decoding(
+    tmp_path: Path, codec: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    response = _response()
+    store = FilesystemPayloadStore(str(tmp_path), codec=codec)
+    store.store(digest=DIGEST, response=response)
+
+    def fail(raw: bytes) -> Any:
+        raise AssertionError("payload was decoded")
+
+    monkeypatch.setattr(filesystem_store, "parse_payload", fail)
+    with store.open_payload(digest=DIGEST) as reader:
+        assert reader.rows("table:nested", offset=255, count=3) == (
+            response.data["table:nested"]["rows"][255:258]
+        )
+
+
+def test_open_payload_rebuilds_index_of_non_canonical_json(tmp_path: Path) -> None:
+    response = _response()
+    store = FilesystemPayloadStore(str(tmp_path), index_sections=True)
+    (tmp_path / f"{DIGEST}.json").write_text(json.dumps(serialize_response(response), indent=2))
+
+    with store.open_payload(digest=DIGEST) as reader:
+        assert reader.rows("table:big", offset=998) == response.data["table:big"]["rows"][998:]
+    assert not (tmp_path / f"{DIGEST}.idx").exists()
+
+
+def test_open_payload_without_or_with_stale_index(tmp_path: Path) -> None:
+    response = _response()
+    FilesystemPayloadStore(str(tmp_path), shard_depth=1).store(digest=DIGEST, response=response)
+    index_path = tmp_path / DIGEST[:2] / f"{DIGEST}.idx"
+    assert not index_path.exists()
+
+    # The index is rebuilt, and with index_sections saved on first open.
+    store = FilesystemPayloadStore(str(tmp_path), shard_depth=1, index_sections=True)
+    for _ in range(2):
+        with store.open_payload(digest=DIGEST) as reader:
+            assert reader.rows("table:big", offset=3, count=2) == [
+                {"id": 3, "name": "n3"},
+                {"id": 4, "name": "n4"},
+            ]
+        assert index_path.exists()
+
+    # An index describing a different payload is ignored.
+    other = FilesystemPayloadStore(str(tmp_path / "other"), index_sections=True)
+    shrunk = RRPResponse(**{**vars(response), "data": {"table:big": {"rows": []}}})
+    other.store(digest=DIGEST, response=shrunk)
+    index_path.write_bytes((tmp_path / "other" / f"{DIGEST}.idx").read_bytes())
+    with store.open_payload(digest=DIGEST) as reader:
+        assert reader.row_count("table:big") == 1000
+
+
+def test_open_payload_missing_and_mismatched(tmp_path: Path) -> None:
+    store = FilesystemPayloadStore(str(tmp_path))
+    with pytest.raises(KeyError, match="Payload not found"):
+        store.open_payload(digest=DIGEST)
+
+    store.store(digest=DIGEST, response=_response(cast(Digest, "cd" * 32)))
+    with pytest.raises(AssertionError, match="Integrity check failed"):
+        store.open_payload(digest=DIGEST)
@@ -0,0 +1,129 @@
+import tempfile
+import threading
+from datetime import UTC, datetime
+from typing import cast
+
+from rrpf.examples import InMemoryEngine
+from rrpf.fulfillment import (
+    FulfillmentResult,
+    ResultCache,
+    compute_content_digest,
+    run_fulfillment,
+    run_or_replay,
+)
+from rrpf.schemas.as_of import AsOf, AsOfMode
+from rrpf.schemas.common import CorrelationID, Digest, RequestID
+from rrpf.schemas.constraints import Constraints
+from rrpf.schemas.data_requests import DataRequests, TableRequest
+from rrpf.schemas.intent import Intent, IntentMode
+from rrpf.schemas.request import RRPRequest
+from rrpf.storage import FilesystemPayloadStore, MemoryPayloadStore
+
+
+class CountingEngine:
+    def __init__(self) -> None:
+        self.inner = InMemoryEngine()
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def fulfill(self, request: RRPRequest) -> FulfillmentResult:
+        with self.lock:
+            self.calls += 1
+        return self.inner.fulfill(request)
+
+
+def _create_request(
+    request_id: str = "req-cache",
+    *,
+    pinned: bool = True,
+    requested_at: datetime = datetime(2023, 1, 1, 12, 0, 0, tzinfo=UTC),
+) -> RRPRequest:
+    as_of = (
+        AsOf(mode=AsOfMode.TIMESTAMP, timestamp=datetime(2023, 1, 1, tzinfo=UTC))
+        if pinned
+        else AsOf(mode=AsOfMode.LATEST, timestamp=None)
+    )
+    return RRPRequest(
+        rrp_version="1.0",
+        request_id=cast(RequestID, request_id),
+        correlation_id=cast(CorrelationID, "corr-cache"),
+        requested_at=requested_at,
+        intent=Intent(name="test_cache", mode=IntentMode.AUDIT),
+        as_of=as_of,
+        constraints=Constraints(max_total_rows=100, max_groups=10, fail_on_partial=True),
+        data=DataRequests(
+            tables=[TableRequest(table="t1", fields=["id"], limit=5, derived=None)],
+            events=[],
+        ),
+    )
+
+
+def test_content_digest_ignores_envelope() -> None:
+    a = _create_request("req-a")
+    b = _create_request("req-b", requested_at=datetime(2024, 6, 1, tzinfo=UTC))
+
+    assert compute_content_digest(a) == compute_content_digest(b)
+    assert run_fulfillment(a, InMemoryEngine()).digest != run_fulfillment(b, InMemoryEngine()).digest
+
+
+def test_cache_hit_skips_engine() -> None:
+    engine = CountingEngine()
+    cache = ResultCache(max_entries=8)
+
+    first = run_or_replay(_create_request("req-a"), engine, cache=cache)
+    second = run_or_replay(_create_request("req-b"), engine, cache=cache)
+
+    assert engine.calls == 1
+    assert second.response.request_id == "req-b"
+    assert second.response.provenance.inputs_digest == second.digest
+    assert second.digest != first.digest
+    assert second.response.data == first.response.data
+    assert cache.stats().hits == 1
+    assert cache.stats().misses == 1
+
+
+def test_store_hit_across_processes() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = CountingEngine()
+        run_or_replay(_create_request("req-a"), engine, store=FilesystemPayloadStore(tmp_dir))
+
+        # A fresh store instance stands in for another process.
+        result = run_or_replay(
+            _create_request("req-b"), engine, store=FilesystemPayloadStore(tmp_dir)
+        )
+
+    assert engine.calls == 1
+    assert result.response.ok is True
+    assert result.response.request_id == "req-b"
+
+
+def test_latest_requests_always_reach_engine() -> None:
+    engine = CountingEngine()
+    cache = ResultCache()
+    store = MemoryPayloadStore()
+
+    result = run_or_replay(_create_request(pinned=False), engine, store=store, cache=cache)
+    run_or_replay(_create_request(pinned=False), engine, store=store, cache=cache)
+
+    assert engine.calls == 2
+    assert len(cache) == 0
+    assert store.load(digest=result.digest).data == result.response.data
+
+
+def test_lru_eviction_and_ttl() -> None:
+    now = [0.0]
+    cache = ResultCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+    response = run_fulfillment(_create_request(), InMemoryEngine()).response
+
+    cache.put(compute_content_digest(_create_request()), response)
+    digests = [Digest(f"d{i}") for i in range(3)]
+    for d in digests:
+        cache.put(d, response)
+
+    assert len(cache) == 2
+    assert cache.stats().evictions == 2
+    assert cache.get(digests[2]) is response
+
+    now[0] = 11.0
+    assert cache.get(digests[2]) is None
+    assert cache.stats().expirations == 1
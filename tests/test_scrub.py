@@ -0,0 +1,144 @@
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from rrpf.fulfillment import RunResult
+from rrpf.storage import FilesystemPayloadStore, ScrubReport, scrub_store
+from rrpf.storage.scrub import RateLimiter, main
+from tests.helpers import fulfilled
+
+
+def _populate(root: Path, count: int, **kwargs: int | str | bool) -> list[RunResult]:
+    store = FilesystemPayloadStore(str(root), **kwargs)  # type: ignore[arg-type]
+    results = fulfilled(count)
+    for result in results:
+        store.store(digest=result.digest, response=result.response)
+    return results
+
+
+@pytest.mark.parametrize("pool", ["thread", "process"])
+def test_clean_store(tmp_path: Path, pool: str) -> None:
+    _populate(tmp_path, 5, shard_depth=2, codec="zlib")
+    report = scrub_store(str(tmp_path), workers=2, pool=pool)  # type: ignore[arg-type]
+    assert report == ScrubReport(scanned=5, bytes_read=report.bytes_read)
+    assert report.ok and report.bytes_read > 0
+
+
+def test_reports_corrupt_and_orphaned_files(tmp_path: Path) -> None:
+    results = _populate(tmp_path, 4, index_sections=True)
+    paths = [tmp_path / f"{r.digest}.json" for r in results]
+
+    # Flipped bytes in a section.
+    paths[0].write_text(
+        paths[0].read_text(encoding="utf-8").replace('{"id":0}', '{"id":7}'), encoding="utf-8"
+    )
+    # Valid JSON, but not canonically encoded.
+    paths[1].write_text(json.dumps(json.loads(paths[1].read_text(encoding="utf-8"))))
+    # Truncated.
+    paths[2].write_bytes(paths[2].read_bytes()[:40])
+    # Orphans: a sidecar without its payload and an interrupted write.
+    paths[3].unlink()
+    (tmp_path / "tmpabc123").write_bytes(b"{")
+
+    seen: list[str] = []
+    report = scrub_store(str(tmp_path), on_issue=lambda issue: seen.append(issue.path))
+
+    reasons = {issue.path: (issue.kind, issue.reason) for issue in report.issues}
+    assert reasons[paths[0].name] == ("corrupt", "section digest mismatch: table:t1")
+    assert reasons[paths[1].name] == ("corrupt", "payload is not canonically encoded")
+    assert reasons[paths[2].name][1].startswith("undecodable payload")
+    assert reasons[f"{results[3].digest}.idx"] == ("orphaned", "section index without payload")
+    assert reasons["tmpabc123"] == ("orphaned", "temporary file")
+    assert (report.corrupt, report.orphaned) == (3, 2)
+    assert sorted(seen) == sorted(reasons)
+    corrupt = {issue.digest for issue in report.issues if issue.kind == "corrupt"}
+    assert corrupt == {r.digest for r in results[:3]}
+
+
+def test_digest_mismatch(tmp_path: Path) -> None:
+    results = _populate(tmp_path, 2)
+    first = tmp_path / f"{results[0].digest}.json"
+    first.rename(tmp_path / f"{results[1].digest[:-1]}0.json")
+    report = scrub_store(str(tmp_path))
+    assert [i.reason for i in report.issues if i.kind == "corrupt"] == [
+        f"inputs_digest {results[0].digest} does not match file name"
+    ]
+
+
+def test_resumes_from_checkpoint(tmp_path: Path) -> None:
+    root = tmp_path / "store"
+    _populate(root, 6, shard_depth=1)
+    checkpoint = tmp_path / "scrub.json"
+
+    payloads = sorted(p.relative_to(root).as_posix() for p in root.rglob("*.json"))
+    checkpoint.write_text(json.dumps({"version": 1, "last": payloads[1]}))
+
+    report = scrub_store(str(root), checkpoint=str(checkpoint), checkpoint_every=1)
+    assert report.resumed_after == payloads[1]
+    assert report.scanned == 4
+    # A completed run removes its checkpoint, so the next one starts over.
+    assert not checkpoint.exists()
+    assert scrub_store(str(root), checkpoint=str(checkpoint)).scanned == 6
+
+
+def test_checkpoint_inside_store_is_skipped(tmp_path: Path) -> None:
+    _populate(tmp_path, 1)
+    checkpoint = tmp_path / "scrub.checkpoint"
+    checkpoint.write_text(json.dumps({"version": 1, "last": ""}))
+    assert scrub_store(str(tmp_path), checkpoint=str(checkpoint)).ok
+
+
+def test_rate_limiter_paces_calls() -> None:
+    now = [0.0]
+    sleeps: list[float] = []
+
+    def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(10, clock=lambda: now[0], sleep=sleep)
+    for _ in range(3):
+        limiter.acquire()
+    limiter.acquire(5)
+    limiter.acquire()
+    assert sleeps == pytest.approx([0.1, 0.1, 0.1, 0.5])
+
+    with pytest.raises(ValueError, match="rate must be > 0"):
+        RateLimiter(0)
+
+
+def test_rate_limited_scrub(tmp_path: Path) -> None:
+    _populate(tmp_path, 5)
+    start = time.monotonic()
+    scrub_store(str(tmp_path), max_files_per_second=50)
+    # Five payloads at 50/s: the last starts at least 80 ms after the first.
+    assert time.monotonic() - start >= 0.08
+
+
+def test_cli(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    results = _populate(tmp_path, 2)
+    assert main([str(tmp_path), "--workers", "1"]) == 0
+    (tmp_path / f"{results[0].digest}.json").write_bytes(b"garbage")
+    assert main([str(tmp_path)]) == 1
+    assert f"corrupt\t{results[0].digest}.json" in capsys.readouterr().out
+
+
+def test_interrupted_run_leaves_checkpoint(tmp_path: Path) -> None:
+    root = tmp_path / "store"
+    _populate(root, 6)
+    payloads = sorted(p.name for p in root.glob("*.json"))
+    (root / payloads[3]).write_bytes(b"garbage")
+    checkpoint = tmp_path / "scrub.json"
+
+    def abort(_: object) -> None:
+        raise RuntimeError("stop")
+
+    with pytest.raises(RuntimeError):
+        scrub_store(str(root), checkpoint=str(checkpoint), checkpoint_every=1, on_issue=abort)
+    assert json.loads(checkpoint.read_text())["last"] == payloads[2]
+
+    report = scrub_store(str(root), checkpoint=str(checkpoint))
+    assert report.scanned == 3
+    assert [issue.path for issue in report.issues] == [payloads[3]]
@@ -0,0 +1,210 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import cast
+
+import pytest
+
+import rrpf
+from rrpf.examples import InMemoryEngine, SQLiteEngine
+from rrpf.fulfillment import (
+    AsyncSectionFanoutEngine,
+    SectionFanoutEngine,
+    SectionResult,
+    run_fulfillment_async,
+)
+from rrpf.schemas.as_of import AsOf, AsOfMode
+from rrpf.schemas.common import CorrelationID, RequestID
+from rrpf.schemas.constraints import Constraints
+from rrpf.schemas.data_requests import DataRequests, EventRequest, TableRequest
+from rrpf.schemas.intent import Intent, IntentMode
+from rrpf.schemas.provenance import QueryStats
+from rrpf.schemas.request import RRPRequest
+
+
+class SleepySectionEngine:
+    """Each section sleeps; skipped sections return None."""
+
+    def __init__(self, delay: float, skip: set[str] | None = None) -> None:
+        self.delay = delay
+        self.skip = skip or set()
+        self.threads: set[int] = set()
+        self.lock = threading.Lock()
+
+    def fulfill_table(self, request: RRPRequest, table: TableRequest) -> SectionResult | None:
+        with self.lock:
+            self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        if table.table in self.skip:
+            return None
+        return SectionResult(data={"rows": [{"id": 0}]}, stats=QueryStats(rows=1, groups=1))
+
+    def fulfill_event(self, request: RRPRequest, event: EventRequest) -> SectionResult | None:
+        time.sleep(self.delay)
+        return SectionResult(data={"rows": []}, stats=QueryStats(rows=0, groups=1))
+
+
+class AsyncSleepySectionEngine:
+    async def fulfill_table(self, request: RRPRequest, table: TableRequest) -> SectionResult | None:
+        await asyncio.sleep(0.05)
+        return SectionResult(data={"rows": [{"id": 0}]}, stats=QueryStats(rows=1, groups=1))
+
+    async def fulfill_event(self, request: RRPRequest, event: EventRequest) -> SectionResult | None:
+        await asyncio.sleep(0.05)
+        return None
+
+
+class AsyncFailingSectionEngine:
+    """Table t0 fails at once; every other section waits to be cancelled."""
+
+    def __init__(self) -> None:
+        self.cancelled: list[str] = []
+
+    async def fulfill_table(self, request: RRPRequest, table: TableRequest) -> SectionResult | None:
+        if table.table == "t0":
+            raise RuntimeError("t0 failed")
+        return await self._wait(table.table)
+
+    async def fulfill_event(self, request: RRPRequest, event: EventRequest) -> SectionResult | None:
+        return await self._wait("event")
+
+    async def _wait(self, name: str) -> SectionResult | None:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            self.cancelled.append(name)
+            raise
+        return None
+
+
+def _create_request(fail_on_partial: bool = True) -> RRPRequest:
+    return RRPRequest(
+        rrp_version="1.0",
+        request_id=cast(RequestID, "req-sections"),
+        correlation_id=cast(CorrelationID, "corr-sections"),
+        requested_at=datetime(2023, 1, 1, 12, 0, 0, tzinfo=UTC),
+        intent=Intent(name="test_sections", mode=IntentMode.SNAPSHOT),
+        as_of=AsOf(mode=AsOfMode.LATEST, timestamp=None),
+        constraints=Constraints(
+            max_total_rows=100, max_groups=10, fail_on_partial=fail_on_partial
+        ),
+        data=DataRequests(
+            tables=[
+                TableRequest(table=f"t{i}", fields=["id"], limit=5, derived=None)
+                for i in range(4)
+            ],
+            events=[EventRequest(types=["view", "click"], fields=["ts"], limit=5)],
+        ),
+    )
+
+
+def test_sections_run_concurrently() -> None:
+    section_engine = SleepySectionEngine(delay=0.1)
+
+    with SectionFanoutEngine(section_engine, max_workers=5) as engine:
+        start = time.monotonic()
+        result = rrpf.run_fulfillment(_create_request(), engine)
+        elapsed = time.monotonic() - start
+
+    assert result.response.ok is True
+    assert set(result.response.data) == {
+        "table:t0",
+        "table:t1",
+        "table:t2",
+        "table:t3",
+        "event:click+view",
+    }
+    assert result.response.provenance.query_stats["table:t0"].rows == 1
+    # Five 100ms sections in parallel, well under the 500ms sequential sum.
+    assert elapsed < 0.4
+    assert len(section_engine.threads) > 1
+
+
+def test_omitted_section_reported_missing() -> None:
+    with SectionFanoutEngine(SleepySectionEngine(delay=0, skip={"t2"})) as engine:
+        result = rrpf.run_fulfillment(_create_request(fail_on_partial=False), engine)
+
+    assert result.response.ok is True
+    assert result.response.partial is True
+    assert [e.section for e in result.response.errors] == ["table:t2"]
+    assert result.response.errors[0].code == "missing_section"
+
+
+def test_in_memory_engine_sections_match_fulfill() -> None:
+    req = _create_request()
+
+    sequential = rrpf.run_fulfillment(req, InMemoryEngine())
+    with SectionFanoutEngine(InMemoryEngine()) as engine:
+        fanned_out = rrpf.run_fulfillment(req, engine)
+
+    assert fanned_out.response.data == sequential.response.data
+    assert fanned_out.response.provenance.query_stats == sequential.response.provenance.query_stats
+
+
+def test_sqlite_engine_sections_match_fulfill(tmp_path: Path) -> None:
+    database = str(tmp_path / "engine.db")
+    with sqlite3.connect(database) as conn:
+        for i in range(3):
+            conn.execute(f'CREATE TABLE "t{i}" (id INTEGER, name TEXT)')
+            conn.executemany(
+                f'INSERT INTO "t{i}" VALUES (?, ?)', [(n, f"row-{n}") for n in range(10)]
+            )
+    conn.close()
+    req = _create_request(fail_on_partial=False)
+
+    shared = sqlite3.connect(database, check_same_thread=False)
+    sequential = rrpf.run_fulfillment(req, SQLiteEngine(shared))
+    with SectionFanoutEngine(SQLiteEngine(shared), max_workers=4) as engine:
+        fanned_shared = rrpf.run_fulfillment(req, engine)
+    per_thread = SQLiteEngine(database=database)
+    with SectionFanoutEngine(per_thread, max_workers=4) as engine:
+        fanned_out = rrpf.run_fulfillment(req, engine)
+    per_thread.close()
+    shared.close()
+
+    # t3 does not exist and events are unsupported: both are reported missing.
+    assert sorted(e.section for e in sequential.response.errors if e.section) == [
+        "event:click+view",
+        "table:t3",
+    ]
+    assert sequential.response.data["table:t0"]["rows"][:2] == [
+        {"id": 0, "name": "row-0"},
+        {"id": 1, "name": "row-1"},
+    ]
+    for result in (fanned_shared, fanned_out):
+        assert result.response.data == sequential.response.data
+        assert result.response.errors == sequential.response.errors
+    with pytest.raises(ValueError, match="exactly one"):
+        SQLiteEngine()
+
+
+def test_async_fanout() -> None:
+    engine = AsyncSectionFanoutEngine(AsyncSleepySectionEngine())
+
+    result = asyncio.run(run_fulfillment_async(_create_request(fail_on_partial=False), engine))
+
+    assert result.response.partial is True
+    assert "table:t3" in result.response.data
+    assert [e.section for e in result.response.errors] == ["event:click+view"]
+
+
+@pytest.mark.parametrize("deadline_s", [None, 0.1])
+def test_async_fanout_cancels_siblings_on_failure(deadline_s: float | None) -> None:
+    sections = AsyncFailingSectionEngine()
+    engine = AsyncSectionFanoutEngine(sections)
+
+    async def run() -> list[str]:
+        request = _create_request()
+        with pytest.raises(RuntimeError, match="t0 failed"):
+            if deadline_s is None:
+                await engine.fulfill(request)
+            else:
+                await engine.fulfill_before(request, time.monotonic() + deadline_s)
+        # Let requested cancellations land, but not asyncio.run's own cleanup.
+        await asyncio.sleep(0)
+        return sorted(sections.cancelled)
+
+    assert asyncio.run(run()) == ["event", "t1", "t2", "t3"]
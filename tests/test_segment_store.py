@@ -0,0 +1,117 @@
+from pathlib import Path
+
+import pytest
+
+from rrpf import run_and_store
+from rrpf.examples import InMemoryEngine
+from rrpf.storage import SegmentPayloadStore, replay_from_store
+from tests.helpers import create_request, fulfilled
+
+
+def test_run_and_store_and_replay(tmp_path: Path) -> None:
+    with SegmentPayloadStore(str(tmp_path)) as store:
+        result = run_and_store(request=create_request(), engine=InMemoryEngine(), store=store)
+        replayed = replay_from_store(digest=result.digest, store=store)
+
+        assert replayed.data == result.response.data
+        assert replayed.provenance.inputs_digest == result.digest
+        assert replayed is not replay_from_store(digest=result.digest, store=store)
+        with pytest.raises(KeyError):
+            store.load(digest=fulfilled(2)[1].digest)
+
+
+def test_segments_roll_and_reopen_from_index(tmp_path: Path) -> None:
+    results = fulfilled(20)
+    with SegmentPayloadStore(str(tmp_path), max_segment_bytes=2048, fsync=False) as store:
+        for result in results:
+            store.store(digest=result.digest, response=result.response)
+        # Storing an existing digest is a no-op.
+        store.store(digest=results[0].digest, response=results[0].response)
+        segments = {store.locate(r.digest).segment for r in results}  # type: ignore[union-attr]
+
+    assert len(segments) > 1
+    assert len(list(tmp_path.glob("segment-*.seg"))) == len(segments)
+
+    reopened = SegmentPayloadStore(str(tmp_path))
+    assert len(reopened) == 20
+    for result in results:
+        assert reopened.load(digest=result.digest).data == result.response.data
+    reopened.close()
+
+
+def test_recovers_records_written_after_index_and_torn_tail(tmp_path: Path) -> None:
+    results = fulfilled(3)
+    store = SegmentPayloadStore(str(tmp_path))
+    store.store(digest=results[0].digest, response=results[0].response)
+    store.flush()
+    store.store(digest=results[1].digest, response=results[1].response)
+    store.store(digest=results[2].digest, response=results[2].response)
+    # Simulate a crash: no close(), and the last record is only half written.
+    segment = store.locate(results[2].digest).segment  # type: ignore[union-attr]
+    path = tmp_path / f"segment-{segment:06d}.seg"
+    size = path.stat().st_size
+    store._active.close()
+    with path.open("r+b") as f:
+        f.truncate(size - 10)
+
+    recovered = SegmentPayloadStore(str(tmp_path))
+    assert len(recovered) == 2
+    assert recovered.load(digest=results[1].digest).data == results[1].response.data
+    with pytest.raises(KeyError):
+        recovered.load(digest=results[2].digest)
+
+    # The torn record was truncated, so new appends are readable.
+    recovered.store(digest=results[2].digest, response=results[2].response)
+    assert recovered.load(digest=results[2].digest).ok is True
+    recovered.close()
+
+
+def test_corrupt_index_falls_back_to_full_scan(tmp_path: Path) -> None:
+    results = fulfilled(4)
+    with SegmentPayloadStore(str(tmp_path), codec="zlib") as store:
+        for result in results:
+            store.store(digest=result.digest, response=result.response)
+
+    (tmp_path / "index.bin").write_bytes(b"garbage")
+    with SegmentPayloadStore(str(tmp_path)) as store:
+        assert len(store) == 4
+        assert store.recover() == 4
+        assert store.load(digest=results[3].digest).data == results[3].response.data
+
+
+def _flip_bit(path: Path, offset: int) -> None:
+    with path.open("r+b") as f:
+        f.seek(offset)
+        byte = f.read(1)[0]
+        f.seek(offset)
+        f.write(bytes([byte ^ 0x01]))
+
+
+@pytest.mark.parametrize("max_segment_bytes", [2048, 64 * 1024 * 1024])
+def test_damaged_record_is_skipped_not_truncated(
+    tmp_path: Path, max_segment_bytes: int
+) -> None:
+    # With 2048 bytes the damage is in a sealed segment, otherwise in the
+    # active one; either way the records after it must survive.
+    results = fulfilled(10)
+    with SegmentPayloadStore(
+        str(tmp_path), max_segment_bytes=max_segment_bytes, fsync=False
+    ) as store:
+        for result in results:
+            store.store(digest=result.digest, response=result.response)
+        first = store.locate(results[0].digest)
+    assert first is not None
+    path = tmp_path / f"segment-{first.segment:06d}.seg"
+    size = path.stat().st_size
+    _flip_bit(path, first.offset + 10)
+
+    with SegmentPayloadStore(str(tmp_path)) as store:
+        assert store.recover() == 9
+        assert path.stat().st_size == size
+        damaged = store.damaged_ranges()
+        assert [(d.segment, d.offset) for d in damaged] == [(first.segment, 0)]
+        assert damaged[0].length > first.length
+        with pytest.raises(KeyError):
+            store.load(digest=results[0].digest)
+        for result in results[1:]:
+            assert store.load(digest=result.digest).data == result.response.data
@@ -0,0 +1,64 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import cast
+
+import pytest
+
+from rrpf import run_and_store
+from rrpf.examples import InMemoryEngine
+from rrpf.schemas.common import Digest, RequestID
+from rrpf.storage import SQLitePayloadStore, replay_from_store
+from tests.helpers import create_request, fulfilled
+
+
+def test_roundtrip_and_wal(tmp_path: Path) -> None:
+    with SQLitePayloadStore(str(tmp_path / "payloads.db"), codec="zlib") as store:
+        result = run_and_store(request=create_request(), engine=InMemoryEngine(), store=store)
+        replayed = replay_from_store(digest=result.digest, store=store)
+
+        assert replayed.data == result.response.data
+        assert replayed.provenance == result.response.provenance
+        (mode,) = store._connection().execute("PRAGMA journal_mode").fetchone()
+        assert mode == "wal"
+        with pytest.raises(KeyError):
+            store.load(digest=fulfilled(2)[1].digest)
+
+
+def test_store_many_and_load_many(tmp_path: Path) -> None:
+    results = fulfilled(12)
+    with SQLitePayloadStore(str(tmp_path / "payloads.db"), batch_size=5) as store:
+        store.store_many(items=((r.digest, r.response) for r in results))
+        assert len(store) == 12
+
+        digests = [r.digest for r in reversed(results)] + [results[0].digest]
+        loaded = store.load_many(digests=digests)
+        assert [r.request_id for r in loaded] == [
+            f"req-{i}" for i in [*range(11, -1, -1), 0]
+        ]
+        with pytest.raises(KeyError):
+            store.load_many(digests=[results[0].digest, Digest("missing")])
+
+
+def test_metadata_queries(tmp_path: Path) -> None:
+    results = fulfilled(3)
+    with SQLitePayloadStore(str(tmp_path / "payloads.db")) as store:
+        store.store_many(items=((r.digest, r.response) for r in results))
+
+        [meta] = store.find(request_id=cast(RequestID, "req-1"))
+        assert meta.inputs_digest == results[1].digest
+        assert meta.ok is True and meta.partial is False
+
+        assert len(store.find(fulfilled_from="2000-01-01T00:00:00Z")) == 3
+        assert store.find(fulfilled_until="2000-01-01T00:00:00Z") == []
+        assert len(store.find(limit=2)) == 2
+
+
+def test_concurrent_writers(tmp_path: Path) -> None:
+    results = fulfilled(40)
+    path = str(tmp_path / "payloads.db")
+    with SQLitePayloadStore(path) as store, ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda r: store.store(digest=r.digest, response=r.response), results))
+
+    with SQLitePayloadStore(path) as reopened:
+        assert len(reopened) == 40
+        assert reopened.load(digest=results[-1].digest).ok is True
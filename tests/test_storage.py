@@ -105,7 +105,7 @@ def test_replay_immutability() -> None:
     # though Mapping is read-only.
     # We can try to hack it or just rely on "load returns deepcopy".
 
-    # In MemoryPayloadStore, we explicitly do deepcopy.
+    # In MemoryPayloadStore, load returns a new response over deeply frozen data.
     # In FilesystemPayloadStore, we deserialize from disk every time (new object).
 
     replayed_2 = replay_from_store(digest=digest, store=store)
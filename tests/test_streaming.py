@@ -0,0 +1,137 @@
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+from datetime import UTC, datetime
+from typing import Any, cast
+
+import rrpf
+from rrpf.examples import InMemoryEngine
+from rrpf.fulfillment import run_fulfillment_streaming, run_fulfillment_streaming_async
+from rrpf.schemas.as_of import AsOf, AsOfMode
+from rrpf.schemas.common import CorrelationID, RequestID
+from rrpf.schemas.constraints import Constraints
+from rrpf.schemas.data_requests import DataRequests, EventRequest, TableRequest
+from rrpf.schemas.intent import Intent, IntentMode
+from rrpf.schemas.request import RRPRequest
+
+
+class EndlessEngine:
+    """Streams rows forever and records how many were pulled."""
+
+    def __init__(self) -> None:
+        self.pulled = 0
+        self.closed: list[str] = []
+        self.opened: list[str] = []
+
+    def stream_table(self, request: RRPRequest, table: TableRequest) -> Iterator[dict[str, Any]]:
+        self.opened.append(table.table)
+        try:
+            i = 0
+            while True:
+                self.pulled += 1
+                yield {"id": i}
+                i += 1
+        finally:
+            self.closed.append(table.table)
+
+    def stream_event(self, request: RRPRequest, event: EventRequest) -> None:
+        return None
+
+
+class AsyncEndlessEngine:
+    def __init__(self) -> None:
+        self.pulled = 0
+
+    async def stream_table(
+        self, request: RRPRequest, table: TableRequest
+    ) -> AsyncIterator[dict[str, Any]]:
+        i = 0
+        while True:
+            self.pulled += 1
+            yield {"id": i}
+            i += 1
+
+    def stream_event(self, request: RRPRequest, event: EventRequest) -> None:
+        return None
+
+
+def _create_request(
+    *, max_total_rows: int = 10, fail_on_partial: bool = True, limits: tuple[int, ...] = (1000,)
+) -> RRPRequest:
+    return RRPRequest(
+        rrp_version="1.0",
+        request_id=cast(RequestID, "req-stream"),
+        correlation_id=cast(CorrelationID, "corr-stream"),
+        requested_at=datetime(2023, 1, 1, 12, 0, 0, tzinfo=UTC),
+        intent=Intent(name="test_stream", mode=IntentMode.SNAPSHOT),
+        as_of=AsOf(mode=AsOfMode.LATEST, timestamp=None),
+        constraints=Constraints(
+            max_total_rows=max_total_rows, max_groups=10, fail_on_partial=fail_on_partial
+        ),
+        data=DataRequests(
+            tables=[
+                TableRequest(table=f"t{i}", fields=["id"], limit=limit, derived=None)
+                for i, limit in enumerate(limits)
+            ],
+            events=[],
+        ),
+    )
+
+
+def test_section_limit_stops_stream() -> None:
+    engine = EndlessEngine()
+    result = run_fulfillment_streaming(_create_request(max_total_rows=100, limits=(5,)), engine)
+
+    assert result.response.ok is True
+    assert result.response.partial is False
+    assert len(result.response.data["table:t0"]["rows"]) == 5
+    assert engine.pulled == 5
+    assert engine.closed == ["t0"]
+
+
+def test_row_budget_cutoff_fails_hard() -> None:
+    engine = EndlessEngine()
+    result = run_fulfillment_streaming(_create_request(max_total_rows=10), engine)
+
+    assert result.response.ok is False
+    assert result.response.data == {}
+    assert [e.code for e in result.response.errors] == ["max_total_rows_exceeded"]
+    # Budget plus the single overflow probe.
+    assert engine.pulled == 11
+
+
+def test_row_budget_cutoff_partial() -> None:
+    engine = EndlessEngine()
+    req = _create_request(max_total_rows=8, fail_on_partial=False, limits=(5, 5, 5))
+    result = run_fulfillment_streaming(req, engine)
+
+    assert result.response.ok is True
+    assert result.response.partial is True
+    assert len(result.response.data["table:t0"]["rows"]) == 5
+    assert len(result.response.data["table:t1"]["rows"]) == 3
+    # The third section is never opened once the budget is spent.
+    assert engine.opened == ["t0", "t1"]
+    codes = [e.code for e in result.response.errors]
+    assert codes == ["max_total_rows_exceeded", "missing_section"]
+
+
+def test_streaming_matches_buffered_engine() -> None:
+    req = _create_request(max_total_rows=100, limits=(5, 2))
+    streamed = run_fulfillment_streaming(req, InMemoryEngine())
+    buffered = rrpf.run_fulfillment(req, InMemoryEngine())
+
+    assert streamed.digest == buffered.digest
+    assert streamed.response.data == buffered.response.data
+    assert streamed.response.provenance.query_stats == buffered.response.provenance.query_stats
+
+
+def test_async_streaming_cutoff() -> None:
+    engine = AsyncEndlessEngine()
+    result = asyncio.run(
+        run_fulfillment_streaming_async(
+            _create_request(max_total_rows=4, fail_on_partial=False), engine
+        )
+    )
+
+    assert result.response.partial is True
+    assert len(result.response.data["table:t0"]["rows"]) == 4
+    assert engine.pulled == 5
@@ -0,0 +1,134 @@
+import threading
+
+import pytest
+
+from rrpf.schemas.common import Digest
+from rrpf.schemas.response import RRPResponse
+from rrpf.storage import MemoryPayloadStore, TieredPayloadStore
+from tests.helpers import fulfilled
+
+
+class CountingStore(MemoryPayloadStore):
+    def __init__(self) -> None:
+        super().__init__()
+        self.loads = 0
+        self.stores = 0
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def store(self, *, digest: Digest, response: RRPResponse) -> None:
+        self.gate.wait()
+        self.stores += 1
+        super().store(digest=digest, response=response)
+
+    def load(self, *, digest: Digest) -> RRPResponse:
+        self.loads += 1
+        return super().load(digest=digest)
+
+
+class FailingStore(MemoryPayloadStore):
+    def store(self, *, digest: Digest, response: RRPResponse) -> None:
+        raise OSError("disk full")
+
+
+def test_hot_hits_never_touch_cold_tier() -> None:
+    [result] = fulfilled(1)
+    cold = CountingStore()
+    store = TieredPayloadStore(hot=MemoryPayloadStore(), cold=cold)
+    store.store(digest=result.digest, response=result.response)
+
+    for _ in range(3):
+        assert store.load(digest=result.digest).data == result.response.data
+    assert (cold.stores, cold.loads) == (1, 0)
+    assert store.stats().hot.hits == 3
+
+
+def test_cold_hit_is_promoted() -> None:
+    results = fulfilled(3)
+    cold = CountingStore()
+    for result in results:
+        cold.store(digest=result.digest, response=result.response)
+    store = TieredPayloadStore(hot=MemoryPayloadStore(max_entries=2), cold=cold)
+
+    store.load(digest=results[0].digest)
+    store.load(digest=results[0].digest)
+    assert cold.loads == 1
+
+    with pytest.raises(KeyError):
+        store.load(digest=Digest("missing"))
+
+    stats = store.stats()
+    assert (stats.hot.hits, stats.hot.misses) == (1, 2)
+    assert (stats.cold.hits, stats.cold.misses) == (1, 1)
+    assert stats.cold.hit_rate == 0.5
+
+
+def test_write_behind_serves_pending_and_flushes() -> None:
+    results = fulfilled(3)
+    cold = CountingStore()
+    cold.gate.clear()
+    store = TieredPayloadStore(hot=MemoryPayloadStore(max_entries=1), cold=cold, write_behind=True)
+    for result in results:
+        store.store(digest=result.digest, response=result.response)
+
+    # The hot tier only kept the last one; the others are still queued.
+    assert store.load(digest=results[0].digest).ok is True
+    assert store.stats().pending_writes == 3
+    assert cold.stores == 0
+
+    cold.gate.set()
+    store.close()
+    assert cold.stores == 3
+    assert store.stats().pending_writes == 0
+
+
+def test_write_behind_errors_surface_on_flush() -> None:
+    [result] = fulfilled(1)
+    store = TieredPayloadStore(hot=MemoryPayloadStore(), cold=FailingStore(), write_behind=True)
+    store.store(digest=result.digest, response=result.response)
+
+    with pytest.raises(OSError, match="disk full"):
+        store.flush()
+    assert store.stats().write_errors == 1
+    store.close()
+
+
+def test_write_through_writes_cold_first() -> None:
+    [result] = fulfilled(1)
+    hot = MemoryPayloadStore()
+    store = TieredPayloadStore(hot=hot, cold=FailingStore())
+
+    with pytest.raises(OSError):
+        store.store(digest=result.digest, response=result.response)
+    assert len(hot) == 0
+
+
+@pytest.mark.parametrize("write_behind", [False, True])
+def test_writes_after_close_raise(write_behind: bool) -> None:
+    [result] = fulfilled(1)
+    store = TieredPayloadStore(
+        hot=MemoryPayloadStore(), cold=MemoryPayloadStore(), write_behind=write_behind
+    )
+    store.close()
+
+    with pytest.raises(ValueError, match="closed"):
+        store.store(digest=result.digest, response=result.response)
+    with pytest.raises(ValueError, match="closed"):
+        store.store_many(items=[(result.digest, result.response)])
+
+    # Nothing is left to drain, so flush (and a second close) return at once.
+    flusher = threading.Thread(target=store.flush, daemon=True)
+    flusher.start()
+    flusher.join(timeout=5)
+    assert not flusher.is_alive()
+    store.close()
+
+
+def test_stats_report_hot_evictions() -> None:
+    results = fulfilled(3)
+    store = TieredPayloadStore(hot=MemoryPayloadStore(max_entries=1), cold=MemoryPayloadStore())
+    for result in results:
+        store.store(digest=result.digest, response=result.response)
+
+    assert store.stats().hot.evictions == 2
+    assert TieredPayloadStore(hot=store, cold=MemoryPayloadStore()).stats().hot.evictions == 0